@@ -242,6 +242,8 @@ const EXPECTED_BUNDLED_DOCKER_ASSETS: readonly string[] = [
   'incremental.py',
   'cocoindex_flow.py',
   'ast_chunker.py',
+  'syntax_tree.py',
+  'parse_cache.py',
   'migrate.py',
   'schema.sql',
   'requirements.txt',
@@ -281,6 +283,13 @@ describe('BUNDLED_DOCKER_ASSETS — cleanup/ensure parity', () => {
     expect(tsupConfig).toContain("'api_auth.py'")
   })
 
+  it('keeps tsup Docker asset copy list in sync for the shared tree-sitter modules', () => {
+    const tsupConfig = readFileSync(new URL('../../../tsup.config.ts', import.meta.url), 'utf-8')
+
+    expect(tsupConfig).toContain("'syntax_tree.py'")
+    expect(tsupConfig).toContain("'parse_cache.py'")
+  })
+
   it('does not include the generated .env file (that is added only on cleanup)', () => {
     expect(BUNDLED_DOCKER_ASSETS).not.toContain('.env')
   })
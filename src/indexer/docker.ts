@@ -88,6 +88,8 @@ export const BUNDLED_DOCKER_ASSETS: readonly string[] = [
   'incremental.py',
   'cocoindex_flow.py',
   'ast_chunker.py',
+  'syntax_tree.py',
+  'parse_cache.py',
   'migrate.py',
   'schema.sql',
   'requirements.txt',
@@ -14,35 +14,66 @@ Key features:
 
 from __future__ import annotations
 
+import bisect
+import functools
+import heapq
+import importlib
+import logging
 import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Generator
+from typing import Callable, Generator, Iterable
+
+import numpy as np
 
 # Config file detection
 from config_parser import is_config_file, chunk_config_file, ConfigChunk
 
-# Tree-sitter imports
-import tree_sitter_python
-import tree_sitter_javascript
-import tree_sitter_typescript
-import tree_sitter_go
-import tree_sitter_rust
-import tree_sitter_java
-import tree_sitter_c
-import tree_sitter_cpp
-import tree_sitter_ruby
-import tree_sitter_php
-import tree_sitter_c_sharp
-from tree_sitter import Language, Parser, Node
+# Tree-sitter imports (grammar packages are imported lazily, see _LANGUAGE_LOADERS)
+from tree_sitter import Language, Node, Query, Tree
+
+import parse_cache
+from syntax_tree import borrow_parser, build_capture_query, capture_nodes, create_parser, walk
+
+logger = logging.getLogger(__name__)
+
+# Filenames already warned about, so retries of the same file don't repeat the warning
+_WARN_SEEN: set[str] = set()
 
 # Configuration
 NESTED_FUNCTION_SIZE_THRESHOLD = int(os.environ.get("NESTED_FUNCTION_THRESHOLD", "50"))
 FALLBACK_MAX_LINES = int(os.environ.get("FALLBACK_MAX_LINES", "500"))
 FALLBACK_OVERLAP_LINES = int(os.environ.get("FALLBACK_OVERLAP_LINES", "50"))
-
-
-@dataclass
+PARALLEL_CHUNKSIZE = int(os.environ.get("PARALLEL_CHUNKSIZE", "8"))
+SMALL_FILE_THRESHOLD = int(os.environ.get("SMALL_FILE_THRESHOLD", "80"))
+# Path to a SQLite file caching chunk results across runs; empty disables the cache
+AST_CHUNK_CACHE_PATH = os.environ.get("AST_CHUNK_CACHE_PATH", "")
+
+# Bump when CodeChunk or the chunking logic changes shape so old entries are ignored
+_CHUNK_CACHE_FORMAT = 3
+
+# Import/export parsing patterns
+_RE_JS_FROM = re.compile(r'from\s+[\'"]([^\'"]+)[\'"]')
+_RE_JS_IMPORT_BARE = re.compile(r'import\s+[\'"]([^\'"]+)[\'"]')
+_RE_PY_IMPORT = re.compile(r'import\s+([^\n]+)')
+_RE_PY_FROM = re.compile(r'from\s+([\w.]+)')
+_RE_QUOTED = re.compile(r'[\'"]([^\'"]+)[\'"]')
+_RE_RUST_USE = re.compile(r'use\s+([^;{]+)')
+_RE_JAVA_IMPORT = re.compile(r'import\s+(?:static\s+)?([^;\s]+)')
+_RE_C_INCLUDE = re.compile(r'#include\s*[<"]([^>"]+)[>"]')
+_RE_PHP_USE = re.compile(r'use\s+([^;,\s]+)')
+_RE_CS_USING = re.compile(r'using\s+(?:static\s+)?([^;=\s]+)')
+_RE_RUBY_REQUIRE = re.compile(r'require(?:_relative)?\s*[\(]?\s*[\'"]([^\'"]+)[\'"]')
+_RE_EXPORT_DEFAULT = re.compile(r'export\s+default\s+(?:class|function)?\s*(\w+)')
+_RE_EXPORT_LIST = re.compile(r'export\s*\{([^}]+)\}')
+_RE_EXPORT_DECL = re.compile(r'export\s+(?:async\s+)?(?:function|class|const|let|var|interface|type|enum)\s+(\w+)')
+_RE_PY_ALL = re.compile(rb'__all__\s*=\s*\[([^\]]+)\]')
+
+
+@dataclass(slots=True)
 class CodeChunk:
     """A chunk of code with metadata."""
     filename: str
@@ -57,7 +88,7 @@ class CodeChunk:
     exports: list[str] = field(default_factory=list)  # Exported symbol names
 
 
-@dataclass
+@dataclass(slots=True)
 class ASTNode:
     """Represents a parsed AST node with relevant metadata."""
     node_type: str
@@ -66,22 +97,85 @@ class ASTNode:
     end_line: int
     start_byte: int
     end_byte: int
-    content: str
+    source: bytes = field(repr=False, compare=False)  # Whole-file source, shared by every node
     children: list[ASTNode] = field(default_factory=list)
     leading_comments: str = ""
+    line_count: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Computed once; read for every nested unit when deciding what to split out
+        self.line_count = self.end_line - self.start_line + 1
 
     @property
-    def line_count(self) -> int:
-        return self.end_line - self.start_line + 1
+    def content(self) -> str:
+        """Leading comments plus the node's source text, decoded on demand."""
+        # Small methods that stay inside their class chunk are never decoded
+        body = str(memoryview(self.source)[self.start_byte:self.end_byte], "utf-8", "ignore")
+        return self.leading_comments + body
+
+
+@dataclass(slots=True)
+class TreeEdit:
+    """
+    Describes a single text edit for incremental re-parsing.
 
+    Byte offsets and (row, column) points follow tree-sitter's Tree.edit()
+    conventions: all values are 0-indexed and refer to the UTF-8 source.
+    """
+    start_byte: int
+    old_end_byte: int
+    new_end_byte: int
+    start_point: tuple[int, int]
+    old_end_point: tuple[int, int]
+    new_end_point: tuple[int, int]
 
-# Language configuration: maps file extensions to tree-sitter languages and node types
+
+# Grammar package and entry point for each extension. Grammars are only imported
+# and wrapped the first time a file of that language is chunked.
 # Note: In tree-sitter 0.21+, language bindings return PyCapsule objects that must be
 # wrapped with Language() for use with Parser
+_LANGUAGE_LOADERS: dict[str, tuple[str, str]] = {
+    ".py": ("tree_sitter_python", "language"),
+    ".js": ("tree_sitter_javascript", "language"),
+    ".jsx": ("tree_sitter_javascript", "language"),
+    ".ts": ("tree_sitter_typescript", "language_typescript"),
+    ".tsx": ("tree_sitter_typescript", "language_tsx"),
+    ".go": ("tree_sitter_go", "language"),
+    ".rs": ("tree_sitter_rust", "language"),
+    ".java": ("tree_sitter_java", "language"),
+    ".c": ("tree_sitter_c", "language"),
+    ".h": ("tree_sitter_c", "language"),
+    ".cpp": ("tree_sitter_cpp", "language"),
+    ".hpp": ("tree_sitter_cpp", "language"),
+    ".rb": ("tree_sitter_ruby", "language"),
+    ".php": ("tree_sitter_php", "language_php"),
+    ".cs": ("tree_sitter_c_sharp", "language"),
+}
+_LANGUAGES: dict[tuple[str, str], Language] = {}
+_LANGUAGES_LOCK = threading.Lock()
+
+
+def _load_language(ext: str) -> Language:
+    """Import and wrap the grammar for an extension, sharing it between extensions."""
+    key = _LANGUAGE_LOADERS[ext]
+    language = _LANGUAGES.get(key)
+    if language is None:
+        with _LANGUAGES_LOCK:
+            language = _LANGUAGES.get(key)
+            if language is None:
+                module_name, entry_point = key
+                module = importlib.import_module(module_name)
+                language = _LANGUAGES[key] = Language(getattr(module, entry_point)())
+    return language
+
+
+# Language configuration: maps file extensions to node types. The "language"
+# entry is filled in by get_language_config on first use. "keyword_hints" are
+# substrings at least one of which appears in any file that has a semantic
+# unit, import or export; small files containing none of them skip parsing.
 LANGUAGE_CONFIG: dict[str, dict] = {
     # Python
     ".py": {
-        "language": Language(tree_sitter_python.language()),
         "function_types": ["function_definition"],
         "class_types": ["class_definition"],
         "method_types": ["function_definition"],  # Python methods are just functions inside classes
@@ -90,10 +184,10 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "name",
         "import_types": ["import_statement", "import_from_statement"],
         "export_types": [],  # Python uses __all__ for exports, handled specially
+        "keyword_hints": ("def", "class", "import", "__all__"),
     },
     # JavaScript/TypeScript
     ".js": {
-        "language": Language(tree_sitter_javascript.language()),
         "function_types": ["function_declaration", "arrow_function", "function_expression", "generator_function_declaration"],
         "class_types": ["class_declaration", "class"],
         "method_types": ["method_definition"],
@@ -102,9 +196,9 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "name",
         "import_types": ["import_statement"],
         "export_types": ["export_statement"],
+        "keyword_hints": ("function", "class", "=>", "import", "export"),
     },
     ".jsx": {
-        "language": Language(tree_sitter_javascript.language()),
         "function_types": ["function_declaration", "arrow_function", "function_expression", "generator_function_declaration"],
         "class_types": ["class_declaration", "class"],
         "method_types": ["method_definition"],
@@ -113,9 +207,9 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "name",
         "import_types": ["import_statement"],
         "export_types": ["export_statement"],
+        "keyword_hints": ("function", "class", "=>", "import", "export"),
     },
     ".ts": {
-        "language": Language(tree_sitter_typescript.language_typescript()),
         "function_types": ["function_declaration", "arrow_function", "function_expression", "generator_function_declaration"],
         "class_types": ["class_declaration"],
         "method_types": ["method_definition", "public_field_definition"],
@@ -125,9 +219,9 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "name",
         "import_types": ["import_statement"],
         "export_types": ["export_statement"],
+        "keyword_hints": ("function", "class", "=>", "interface", "type", "import", "export"),
     },
     ".tsx": {
-        "language": Language(tree_sitter_typescript.language_tsx()),
         "function_types": ["function_declaration", "arrow_function", "function_expression", "generator_function_declaration"],
         "class_types": ["class_declaration"],
         "method_types": ["method_definition", "public_field_definition"],
@@ -137,10 +231,10 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "name",
         "import_types": ["import_statement"],
         "export_types": ["export_statement"],
+        "keyword_hints": ("function", "class", "=>", "interface", "type", "import", "export"),
     },
     # Go
     ".go": {
-        "language": Language(tree_sitter_go.language()),
         "function_types": ["function_declaration"],
         "class_types": ["type_declaration"],  # Go uses type declarations for structs
         "method_types": ["method_declaration"],
@@ -149,10 +243,10 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "name",
         "import_types": ["import_declaration"],
         "export_types": [],  # Go exports via capitalization
+        "keyword_hints": ("func", "type", "import"),
     },
     # Rust
     ".rs": {
-        "language": Language(tree_sitter_rust.language()),
         "function_types": ["function_item"],
         "class_types": ["struct_item", "enum_item", "impl_item", "trait_item"],
         "method_types": ["function_item"],  # Methods in Rust are functions inside impl blocks
@@ -161,10 +255,10 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "name",
         "import_types": ["use_declaration"],
         "export_types": [],  # Rust uses pub keyword, detected differently
+        "keyword_hints": ("fn", "struct", "enum", "impl", "trait", "use"),
     },
     # Java
     ".java": {
-        "language": Language(tree_sitter_java.language()),
         "function_types": [],  # Java doesn't have standalone functions
         "class_types": ["class_declaration", "interface_declaration", "enum_declaration"],
         "method_types": ["method_declaration", "constructor_declaration"],
@@ -173,10 +267,10 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "name",
         "import_types": ["import_declaration"],
         "export_types": [],  # Java uses public keyword
+        "keyword_hints": ("class", "interface", "enum", "import"),
     },
     # C/C++
     ".c": {
-        "language": Language(tree_sitter_c.language()),
         "function_types": ["function_definition"],
         "class_types": ["struct_specifier", "union_specifier", "enum_specifier"],
         "method_types": [],
@@ -185,9 +279,9 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "declarator",
         "import_types": ["preproc_include"],
         "export_types": [],  # C uses header files
+        "keyword_hints": ("(", "struct", "union", "enum", "#include"),
     },
     ".h": {
-        "language": Language(tree_sitter_c.language()),
         "function_types": ["function_definition", "declaration"],
         "class_types": ["struct_specifier", "union_specifier", "enum_specifier"],
         "method_types": [],
@@ -196,9 +290,9 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "declarator",
         "import_types": ["preproc_include"],
         "export_types": [],  # C uses header files
+        "keyword_hints": ("(", ";", "struct", "union", "enum", "#include"),
     },
     ".cpp": {
-        "language": Language(tree_sitter_cpp.language()),
         "function_types": ["function_definition"],
         "class_types": ["class_specifier", "struct_specifier", "enum_specifier"],
         "method_types": ["function_definition"],
@@ -207,9 +301,9 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "declarator",
         "import_types": ["preproc_include"],
         "export_types": [],  # C++ uses header files
+        "keyword_hints": ("(", "class", "struct", "enum", "#include"),
     },
     ".hpp": {
-        "language": Language(tree_sitter_cpp.language()),
         "function_types": ["function_definition", "declaration"],
         "class_types": ["class_specifier", "struct_specifier", "enum_specifier"],
         "method_types": ["function_definition"],
@@ -218,10 +312,10 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "declarator",
         "import_types": ["preproc_include"],
         "export_types": [],  # C++ uses header files
+        "keyword_hints": ("(", ";", "class", "struct", "enum", "#include"),
     },
     # Ruby
     ".rb": {
-        "language": Language(tree_sitter_ruby.language()),
         "function_types": ["method", "singleton_method"],
         "class_types": ["class", "module"],
         "method_types": ["method", "singleton_method"],
@@ -230,10 +324,10 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "name",
         "import_types": ["call"],  # require/require_relative are method calls
         "export_types": [],  # Ruby uses module_function or public
+        "keyword_hints": ("def", "class", "module", "require"),
     },
     # PHP
     ".php": {
-        "language": Language(tree_sitter_php.language_php()),
         "function_types": ["function_definition"],
         "class_types": ["class_declaration", "interface_declaration", "trait_declaration"],
         "method_types": ["method_declaration"],
@@ -242,10 +336,10 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "name",
         "import_types": ["namespace_use_declaration"],
         "export_types": [],  # PHP uses namespaces
+        "keyword_hints": ("function", "class", "interface", "trait", "use"),
     },
     # C#
     ".cs": {
-        "language": Language(tree_sitter_c_sharp.language()),
         "function_types": [],  # C# doesn't have standalone functions
         "class_types": ["class_declaration", "interface_declaration", "struct_declaration", "enum_declaration"],
         "method_types": ["method_declaration", "constructor_declaration"],
@@ -254,25 +348,159 @@ LANGUAGE_CONFIG: dict[str, dict] = {
         "name_field": "name",
         "import_types": ["using_directive"],
         "export_types": [],  # C# uses public keyword
+        "keyword_hints": ("class", "interface", "struct", "enum", "using"),
     },
 }
 
 
-def get_language_config(filename: str) -> dict | None:
-    """Get the language configuration for a file based on its extension."""
-    ext = Path(filename).suffix.lower()
-    return LANGUAGE_CONFIG.get(ext)
+# Freeze node type lists so per-node membership tests are O(1) set lookups
+_NODE_TYPE_KEYS = (
+    "function_types",
+    "class_types",
+    "method_types",
+    "interface_types",
+    "comment_types",
+    "docstring_types",
+    "import_types",
+    "export_types",
+)
+
+for _config in LANGUAGE_CONFIG.values():
+    for _key in _NODE_TYPE_KEYS:
+        _config[_key] = frozenset(_config.get(_key, ()))
+
+
+# Node categories for the single-pass tree scan. A node type may fall into
+# several categories (e.g. Python function_definition is both function and method).
+_IMPORT = 1
+_EXPORT = 2
+_FUNCTION = 4
+_CLASS = 8
+_METHOD = 16
+_INTERFACE = 32
+_COMMENT = 64
+
+
+def _build_dispatch(config: dict) -> dict[str, int]:
+    """Map each interesting node type of a language to its category bit flags."""
+    dispatch: dict[str, int] = {}
+    for key, flag in (
+        ("import_types", _IMPORT),
+        ("export_types", _EXPORT),
+        ("function_types", _FUNCTION),
+        ("class_types", _CLASS),
+        ("method_types", _METHOD),
+        ("interface_types", _INTERFACE),
+        ("comment_types", _COMMENT),
+        ("docstring_types", _COMMENT),
+    ):
+        for node_type in config.get(key, []):
+            dispatch[node_type] = dispatch.get(node_type, 0) | flag
+    return dispatch
+
+
+def _build_kind_dispatch(dispatch: dict[str, int], language: Language) -> dict[int, int]:
+    """
+    Re-key a dispatch table by the grammar's integer node kind ids.
+
+    node.kind_id avoids building a Python string for node.type on every visit,
+    and integer keys hash faster. Every id whose kind name matches is included
+    (grammars can expose several symbols with the same name), so lookups agree
+    with the string-keyed table.
+    """
+    kind_dispatch: dict[int, int] = {}
+    for kind_id in range(language.node_kind_count):
+        flags = dispatch.get(language.node_kind_for_id(kind_id))
+        if flags:
+            kind_dispatch[kind_id] = flags
+    return kind_dispatch
+
+
+for _config in LANGUAGE_CONFIG.values():
+    _config["dispatch"] = _build_dispatch(_config)
+
+
+@dataclass(frozen=True, slots=True)
+class LanguageSpec:
+    """
+    Compiled, read-only view of a language's configuration.
+
+    Built once when a grammar is first loaded so hot paths read typed slot
+    attributes and integer kind-id sets instead of string-keyed dict lookups.
+    """
+    language: Language
+    name_field: str
+    dispatch: dict[str, int]
+    kind_dispatch: dict[int, int]
+    symbol_types: frozenset[str]
+    symbol_kind_ids: frozenset[int]
+    unit_query: Query | None = None
+
+
+def _build_unit_query(dispatch: dict[str, int], language: Language) -> Query | None:
+    """
+    Compile one query capturing every import, export and semantic-unit candidate.
+
+    Only node types the grammar actually defines as named nodes are included.
+    Returns None if the query can't be built, in which case callers fall back to
+    the Python stack walk.
+    """
+    wanted = _IMPORT | _EXPORT | _FUNCTION | _CLASS | _METHOD | _INTERFACE
+    return build_capture_query(
+        language, (node_type for node_type, flags in dispatch.items() if flags & wanted)
+    )
+
+
+def _build_language_spec(config: dict, language: Language) -> LanguageSpec:
+    """Compile a LANGUAGE_CONFIG entry and its loaded grammar into a LanguageSpec."""
+    kind_dispatch = _build_kind_dispatch(config["dispatch"], language)
+    symbol_flags = _FUNCTION | _CLASS | _METHOD | _INTERFACE
+    return LanguageSpec(
+        language=language,
+        name_field=config.get("name_field", "name"),
+        dispatch=config["dispatch"],
+        kind_dispatch=kind_dispatch,
+        symbol_types=(
+            config["function_types"]
+            | config["class_types"]
+            | config["method_types"]
+            | config["interface_types"]
+        ),
+        symbol_kind_ids=frozenset(k for k, flags in kind_dispatch.items() if flags & symbol_flags),
+        unit_query=_build_unit_query(config["dispatch"], language),
+    )
+
+
+def _file_suffix(filename: str) -> str:
+    """Lowercased extension, matching Path(filename).suffix.lower() without building a Path."""
+    name = filename[max(filename.rfind("/"), filename.rfind("\\")) + 1:]
+    dot = name.rfind(".")
+    # Dotfiles like ".bashrc" and names ending in "." have no suffix
+    if dot <= 0 or dot == len(name) - 1:
+        return ""
+    return name[dot:].lower()
 
 
-def create_parser(language: Language) -> Parser:
-    """Create a tree-sitter parser for the given language."""
-    parser = Parser(language)
-    return parser
+@functools.lru_cache(maxsize=64)
+def _config_for_ext(ext: str) -> dict | None:
+    """Language configuration for an extension, loading its grammar on first use."""
+    config = LANGUAGE_CONFIG.get(ext)
+    if config is not None and "language" not in config:
+        language = _load_language(ext)
+        config["spec"] = _build_language_spec(config, language)
+        config["language"] = language
+    return config
+
+
+def get_language_config(filename: str) -> dict | None:
+    """Get the language configuration for a file based on its extension."""
+    return _config_for_ext(_file_suffix(filename))
 
 
 def get_node_name(node: Node, config: dict) -> str | None:
     """Extract the name from a node based on language configuration."""
-    name_field = config.get("name_field", "name")
+    spec = config.get("spec")
+    name_field = spec.name_field if spec is not None else config.get("name_field", "name")
 
     # Try to get name from the named field
     name_node = node.child_by_field_name(name_field)
@@ -295,39 +523,71 @@ def get_node_name(node: Node, config: dict) -> str | None:
 
 def get_leading_comments(node: Node, source_bytes: bytes, config: dict) -> str:
     """Extract comments that immediately precede a node (docstrings/documentation)."""
-    comment_types = config.get("comment_types", [])
-    docstring_types = config.get("docstring_types", [])
+    comment_types: frozenset[str] = config.get("comment_types", frozenset())
+    docstring_types: frozenset[str] = config.get("docstring_types", frozenset())
 
-    comments = []
+    comments: list[Node] = []
+    # The closest comment is measured against the node; earlier ones against
+    # that closest comment's start line
+    anchor_line: int = node.start_point[0]
     current = node.prev_named_sibling
 
-    while current:
-        if current.type in comment_types or current.type in docstring_types:
-            # Check if this comment is on the line immediately before or same line as previous comment
-            comment_end_line = current.end_point[0]
-            next_start_line = node.start_point[0] if not comments else comments[-1].start_point[0]
+    while current is not None:
+        current_type = current.type
+        if current_type not in comment_types and current_type not in docstring_types:
+            break
 
-            # Allow up to 1 blank line between comment and code
-            if next_start_line - comment_end_line <= 2:
-                comments.insert(0, current)
-                current = current.prev_named_sibling
-            else:
-                break
-        else:
+        # Allow up to 1 blank line between comment and code
+        if anchor_line - current.end_point[0] > 2:
             break
 
+        if not comments:
+            anchor_line = current.start_point[0]
+        comments.append(current)
+        current = current.prev_named_sibling
+
+    # Collected nearest-first; append + reverse avoids repeated list.insert(0, ...)
+    comments.reverse()
+    return _format_comments(comments)
+
+
+def _format_comments(comments: list[Node]) -> str:
+    """Join comment node texts into a leading-comment block."""
     if not comments:
         return ""
 
     # Extract comment text
     comment_parts = []
     for c in comments:
-        text = source_bytes[c.start_byte:c.end_byte].decode("utf-8", errors="ignore")
+        text = c.text.decode("utf-8", errors="ignore")
         comment_parts.append(text)
 
     return "\n".join(comment_parts) + "\n"
 
 
+def _attach_comments(node: Node, run: list[Node], count: int) -> list[Node]:
+    """
+    Select the comments preceding node from the first `count` nodes of a comment run.
+
+    Applies the same rules as get_leading_comments, but reads from the run of
+    comment siblings collected while iterating the parent's children instead
+    of walking prev_named_sibling back from every unit.
+    """
+    if not count:
+        return []
+
+    closest = run[count - 1]
+    if node.start_point[0] - closest.end_point[0] > 2:
+        return []
+
+    # Earlier comments are measured against the closest comment's start line
+    anchor = closest.start_point[0]
+    first = count - 1
+    while first > 0 and anchor - run[first - 1].end_point[0] <= 2:
+        first -= 1
+    return run[first:count]
+
+
 def extract_imports(node: Node, source_bytes: bytes, config: dict) -> list[str]:
     """
     Extract import statements from the AST root node.
@@ -341,19 +601,94 @@ def extract_imports(node: Node, source_bytes: bytes, config: dict) -> list[str]:
 
     imports: list[str] = []
 
-    def traverse_for_imports(n: Node) -> None:
+    # Import statements are not descended into
+    for n in walk(node, lambda n: n.type not in import_types):
         if n.type in import_types:
             # Extract the import path based on language
-            import_text = source_bytes[n.start_byte:n.end_byte].decode("utf-8", errors="ignore")
+            import_text = n.text.decode("utf-8", errors="ignore")
             import_path = _parse_import_path(n, import_text, config)
             if import_path:
                 imports.extend(import_path if isinstance(import_path, list) else [import_path])
-        else:
-            for child in n.children:
-                traverse_for_imports(child)
 
-    traverse_for_imports(node)
-    return list(set(imports))  # Deduplicate
+    return list(dict.fromkeys(imports))  # Deduplicate while preserving order
+
+
+def _node_text(node: Node | None) -> str | None:
+    """Decode a node's source text, or None if the node is missing."""
+    if node is None or not node.text:
+        return None
+    return node.text.decode("utf-8", errors="ignore")
+
+
+def _import_from_statement_path(node: Node) -> str | None:
+    """Python: from foo.bar import baz -> 'foo.bar' (relative imports keep their dots)."""
+    return _node_text(node.child_by_field_name("module_name"))
+
+
+def _import_statement_path(node: Node) -> list[str] | str | None:
+    """JavaScript/TypeScript import source, or Python `import a, b as c` module names."""
+    source = _node_text(node.child_by_field_name("source"))
+    if source:
+        return source.strip("'\"")
+
+    modules = []
+    for name_node in node.children_by_field_name("name"):
+        if name_node.type == "aliased_import":
+            name_node = name_node.child_by_field_name("name")
+        name = _node_text(name_node)
+        if name:
+            modules.append(name)
+    return modules or None
+
+
+def _import_declaration_path(node: Node) -> list[str] | str | None:
+    """Go import specs (single or grouped), or a Java import declaration."""
+    paths = []
+    for child in node.named_children:
+        specs = child.named_children if child.type == "import_spec_list" else [child]
+        for spec in specs:
+            if spec.type == "import_spec":
+                path = _node_text(spec.child_by_field_name("path"))
+                if path:
+                    paths.append(path.strip('"`'))
+    if paths:
+        return paths
+
+    # Java: import [static] com.example.Class[.*];
+    for child in node.named_children:
+        if child.type in ("scoped_identifier", "identifier"):
+            path = _node_text(child)
+            if path and any(c.type == "asterisk" for c in node.children):
+                path += ".*"
+            return path
+    return None
+
+
+def _use_declaration_path(node: Node) -> str | None:
+    """Rust: use crate::foo::{a, b} -> 'crate::foo'; use a::b as c -> 'a::b'."""
+    argument = node.child_by_field_name("argument")
+    if argument is None:
+        return None
+    if argument.type in ("scoped_use_list", "use_as_clause"):
+        return _node_text(argument.child_by_field_name("path"))
+    return _node_text(argument)
+
+
+def _preproc_include_path(node: Node) -> str | None:
+    """C/C++: #include <stdio.h> / #include "header.h" -> the bare header path."""
+    path = _node_text(node.child_by_field_name("path"))
+    return path.strip('<>"') if path else None
+
+
+# Structured import extraction via tree-sitter fields, keyed by node type.
+# An extractor returning None falls back to the regex parsing below.
+_IMPORT_EXTRACTORS: dict[str, Callable[[Node], list[str] | str | None]] = {
+    "import_from_statement": _import_from_statement_path,
+    "import_statement": _import_statement_path,
+    "import_declaration": _import_declaration_path,
+    "use_declaration": _use_declaration_path,
+    "preproc_include": _preproc_include_path,
+}
 
 
 def _parse_import_path(node: Node, import_text: str, config: dict) -> list[str] | str | None:
@@ -367,8 +702,15 @@ def _parse_import_path(node: Node, import_text: str, config: dict) -> list[str]
     - Rust: use crate::module
     - Java: import com.package.Class
     - C/C++: #include <header.h> or #include "header.h"
+
+    Structured field lookups (_IMPORT_EXTRACTORS) are tried first; the
+    regexes below only handle nodes the extractors can't resolve.
     """
-    import re
+    extractor = _IMPORT_EXTRACTORS.get(node.type)
+    if extractor is not None:
+        import_path = extractor(node)
+        if import_path:
+            return import_path
 
     # JavaScript/TypeScript: import x from 'path' or import 'path'
     # Check this FIRST before Python, because both use "import_statement" type
@@ -381,35 +723,35 @@ def _parse_import_path(node: Node, import_text: str, config: dict) -> list[str]
             return path
 
         # Try regex for JS/TS style: import ... from 'path' or import 'path'
-        match = re.search(r'from\s+[\'"]([^\'"]+)[\'"]', import_text)
+        match = _RE_JS_FROM.search(import_text)
         if match:
             return match.group(1)
-        match = re.search(r'import\s+[\'"]([^\'"]+)[\'"]', import_text)
+        match = _RE_JS_IMPORT_BARE.search(import_text)
         if match:
             return match.group(1)
 
         # Python style: import foo, bar (no quotes, no 'from' keyword with quotes)
         # Only match if there are no quotes in the import text (Python style)
         if "'" not in import_text and '"' not in import_text:
-            match = re.search(r'import\s+([^\n]+)', import_text)
+            match = _RE_PY_IMPORT.search(import_text)
             if match:
                 modules = [m.strip().split(' as ')[0].strip() for m in match.group(1).split(',')]
                 return modules
 
     # Python: from foo import bar
     elif node.type == "import_from_statement":
-        match = re.search(r'from\s+([\w.]+)', import_text)
+        match = _RE_PY_FROM.search(import_text)
         if match:
             return match.group(1)
 
     # Go: import "path" or import ( "path1" "path2" )
     elif node.type == "import_declaration":
-        matches = re.findall(r'[\'"]([^\'"]+)[\'"]', import_text)
+        matches = _RE_QUOTED.findall(import_text)
         return matches if matches else None
 
     # Rust: use crate::foo::bar or use std::collections::HashMap
     elif node.type == "use_declaration":
-        match = re.search(r'use\s+([^;{]+)', import_text)
+        match = _RE_RUST_USE.search(import_text)
         if match:
             path = match.group(1).strip()
             # Handle {a, b} syntax
@@ -420,32 +762,32 @@ def _parse_import_path(node: Node, import_text: str, config: dict) -> list[str]
 
     # Java: import com.example.Class
     elif node.type == "import_declaration":
-        match = re.search(r'import\s+(?:static\s+)?([^;\s]+)', import_text)
+        match = _RE_JAVA_IMPORT.search(import_text)
         if match:
             return match.group(1)
 
     # C/C++: #include <header.h> or #include "header.h"
     elif node.type == "preproc_include":
-        match = re.search(r'#include\s*[<"]([^>"]+)[>"]', import_text)
+        match = _RE_C_INCLUDE.search(import_text)
         if match:
             return match.group(1)
 
     # PHP: use Namespace\Class
     elif node.type == "namespace_use_declaration":
-        match = re.search(r'use\s+([^;,\s]+)', import_text)
+        match = _RE_PHP_USE.search(import_text)
         if match:
             return match.group(1)
 
     # C#: using Namespace
     elif node.type == "using_directive":
-        match = re.search(r'using\s+(?:static\s+)?([^;=\s]+)', import_text)
+        match = _RE_CS_USING.search(import_text)
         if match:
             return match.group(1)
 
     # Ruby: require/require_relative
     elif node.type == "call":
         if 'require' in import_text:
-            match = re.search(r'require(?:_relative)?\s*[\(]?\s*[\'"]([^\'"]+)[\'"]', import_text)
+            match = _RE_RUBY_REQUIRE.search(import_text)
             if match:
                 return match.group(1)
 
@@ -458,29 +800,23 @@ def extract_exports(node: Node, source_bytes: bytes, config: dict, filename: str
 
     Returns a list of symbol names that are exported from this file.
     """
-    export_types = config.get("export_types", [])
+    export_types = config.get("export_types", frozenset())
     exports: list[str] = []
 
-    def traverse_for_exports(n: Node) -> None:
-        if n.type in export_types:
-            export_text = source_bytes[n.start_byte:n.end_byte].decode("utf-8", errors="ignore")
-            exported = _parse_export_symbols(n, export_text, config)
-            if exported:
-                exports.extend(exported if isinstance(exported, list) else [exported])
-        else:
-            for child in n.children:
-                traverse_for_exports(child)
-
     if export_types:
-        traverse_for_exports(node)
+        for n in walk(node, lambda n: n.type not in export_types):
+            if n.type in export_types:
+                export_text = n.text.decode("utf-8", errors="ignore")
+                exported = _parse_export_symbols(n, export_text, config)
+                if exported:
+                    exports.extend(exported if isinstance(exported, list) else [exported])
 
     # Handle Python's __all__ for exports
-    ext = Path(filename).suffix.lower()
-    if ext == ".py":
+    if _file_suffix(filename) == ".py":
         py_exports = _extract_python_all(source_bytes)
         exports.extend(py_exports)
 
-    return list(set(exports))  # Deduplicate
+    return list(dict.fromkeys(exports))  # Deduplicate while preserving order
 
 
 def _parse_export_symbols(node: Node, export_text: str, config: dict) -> list[str] | None:
@@ -490,8 +826,6 @@ def _parse_export_symbols(node: Node, export_text: str, config: dict) -> list[st
     Handles language-specific export syntax:
     - JavaScript/TypeScript: export { a, b }, export default X, export function foo()
     """
-    import re
-
     # JavaScript/TypeScript exports
     if node.type == "export_statement":
         symbols = []
@@ -499,7 +833,7 @@ def _parse_export_symbols(node: Node, export_text: str, config: dict) -> list[st
         # export default X
         if "export default" in export_text:
             # Try to find the identifier after default
-            match = re.search(r'export\s+default\s+(?:class|function)?\s*(\w+)', export_text)
+            match = _RE_EXPORT_DEFAULT.search(export_text)
             if match:
                 symbols.append(match.group(1))
             else:
@@ -507,7 +841,7 @@ def _parse_export_symbols(node: Node, export_text: str, config: dict) -> list[st
             return symbols
 
         # export { a, b, c }
-        match = re.search(r'export\s*\{([^}]+)\}', export_text)
+        match = _RE_EXPORT_LIST.search(export_text)
         if match:
             items = match.group(1).split(',')
             for item in items:
@@ -520,14 +854,14 @@ def _parse_export_symbols(node: Node, export_text: str, config: dict) -> list[st
             return symbols
 
         # export function foo() or export class Bar or export const x
-        match = re.search(r'export\s+(?:async\s+)?(?:function|class|const|let|var|interface|type|enum)\s+(\w+)', export_text)
+        match = _RE_EXPORT_DECL.search(export_text)
         if match:
             symbols.append(match.group(1))
             return symbols
 
         # export * from './module' - re-export (we note it as star export)
         if 'export *' in export_text:
-            match = re.search(r'from\s+[\'"]([^\'"]+)[\'"]', export_text)
+            match = _RE_JS_FROM.search(export_text)
             if match:
                 return [f"* from {match.group(1)}"]
 
@@ -538,15 +872,13 @@ def _extract_python_all(source_bytes: bytes) -> list[str]:
     """
     Extract symbols from Python's __all__ = [...] declaration.
     """
-    import re
-
-    content = source_bytes.decode("utf-8", errors="ignore")
     # Match __all__ = ['a', 'b', 'c'] or __all__ = ["a", "b", "c"]
-    match = re.search(r'__all__\s*=\s*\[([^\]]+)\]', content)
+    # Search the raw bytes so only the matched list is decoded, not the whole file
+    match = _RE_PY_ALL.search(source_bytes)
     if match:
-        items = match.group(1)
+        items = match.group(1).decode("utf-8", errors="ignore")
         # Extract quoted strings
-        symbols = re.findall(r'[\'"]([^\'"]+)[\'"]', items)
+        symbols = _RE_QUOTED.findall(items)
         return symbols
     return []
 
@@ -563,38 +895,97 @@ def extract_all_symbols_from_chunk(
 
     This traverses the AST and collects names of all definitions within the chunk boundaries.
     """
-    function_types = config.get("function_types", [])
-    class_types = config.get("class_types", [])
-    method_types = config.get("method_types", [])
-    interface_types = config.get("interface_types", [])
+    is_symbol = _symbol_test(config)
 
-    symbols: list[str] = []
+    def in_range(n: Node) -> bool:
+        # Convert to 1-indexed; nodes completely outside our range are pruned
+        return n.end_point[0] + 1 >= start_line and n.start_point[0] + 1 <= end_line
 
-    def traverse(n: Node) -> None:
-        node_start = n.start_point[0] + 1  # Convert to 1-indexed
-        node_end = n.end_point[0] + 1
+    symbols: list[str] = []
 
-        # Skip nodes completely outside our range
-        if node_end < start_line or node_start > end_line:
-            return
+    for n in walk(node, in_range):
+        if not in_range(n):
+            continue
 
         # Check if this is a symbol-defining node
-        if n.type in function_types or n.type in class_types or n.type in method_types:
+        if is_symbol(n):
             name = get_node_name(n, config)
             if name:
                 symbols.append(name)
 
-        if interface_types and n.type in interface_types:
+    return list(dict.fromkeys(symbols))  # Deduplicate while preserving order
+
+
+def _symbol_test(config: dict) -> Callable[[Node], bool]:
+    """Build a predicate for symbol-defining nodes (functions, classes, methods, interfaces)."""
+    spec = config.get("spec")
+    if spec is not None:
+        symbol_ids = spec.symbol_kind_ids
+        return lambda n: n.kind_id in symbol_ids
+    symbol_types = (
+        config["function_types"]
+        | config["class_types"]
+        | config["method_types"]
+        | config["interface_types"]
+    )
+    return lambda n: n.type in symbol_types
+
+
+def extract_gap_symbols(
+    node: Node,
+    config: dict,
+    gaps: list[tuple[int, int]],
+) -> list[list[str]]:
+    """
+    Extract the symbol names defined within each of several disjoint line ranges.
+
+    Gives the same result as calling extract_all_symbols_from_chunk once per
+    gap, but walks the tree once: only nodes overlapping some gap are visited,
+    and the symbols found are split between the gaps by a sweep in line order.
+
+    Args:
+        node: Root of the tree to search
+        config: Language configuration from get_language_config()
+        gaps: Sorted, non-overlapping (start_line, end_line) ranges
+
+    Returns:
+        One deduplicated list of names per gap, in gap order
+    """
+    is_symbol = _symbol_test(config)
+    gap_starts = [start for start, _ in gaps]
+    gap_ends = [end for _, end in gaps]
+    gap_count = len(gaps)
+
+    def overlaps_gap(n: Node) -> bool:
+        # The first gap ending at or after the node's start is the only candidate
+        i = bisect.bisect_left(gap_ends, n.start_point[0] + 1)
+        return i < gap_count and gap_starts[i] <= n.end_point[0] + 1
+
+    # (start_line, end_line, name) in pre-order, so start lines never decrease
+    found: list[tuple[int, int, str]] = []
+    for n in walk(node, overlaps_gap):
+        if overlaps_gap(n) and is_symbol(n):
             name = get_node_name(n, config)
             if name:
-                symbols.append(name)
+                found.append((n.start_point[0] + 1, n.end_point[0] + 1, name))
 
-        # Recurse into children
-        for child in n.children:
-            traverse(child)
+    result: list[list[str]] = []
+    # Symbols that started before the current gap and may still reach into it
+    spanning: list[tuple[int, int, str]] = []
+    pos = 0
+    for gap_start, gap_end in gaps:
+        while pos < len(found) and found[pos][0] < gap_start:
+            spanning.append(found[pos])
+            pos += 1
+        spanning = [symbol for symbol in spanning if symbol[1] >= gap_start]
+        end = pos
+        while end < len(found) and found[end][0] <= gap_end:
+            end += 1
+        names = [symbol[2] for symbol in spanning]
+        names.extend(symbol[2] for symbol in found[pos:end])
+        result.append(list(dict.fromkeys(names)))  # Deduplicate while preserving order
 
-    traverse(node)
-    return list(dict.fromkeys(symbols))  # Deduplicate while preserving order
+    return result
 
 
 def is_nested_function(node: Node, config: dict) -> bool:
@@ -615,78 +1006,322 @@ def is_nested_function(node: Node, config: dict) -> bool:
     return False
 
 
-def extract_semantic_units(
+def _leading_comment_map(container: Node, dispatch: dict[int, int]) -> dict[int, list[Node]]:
+    """
+    Map the start byte of each named child of container to its leading comments.
+
+    One left-to-right pass over the container's named children applies the same
+    rules as get_leading_comments to every child at once.
+    """
+    comment_map: dict[int, list[Node]] = {}
+    run: list[Node] = []
+    for child in container.named_children:
+        if dispatch.get(child.kind_id, 0) & _COMMENT:
+            run.append(child)
+        elif run:
+            comments = _attach_comments(child, run, len(run))
+            if comments:
+                comment_map[child.start_byte] = comments
+            run = []
+    return comment_map
+
+
+def _build_ast_node(
     node: Node,
     source_bytes: bytes,
     config: dict,
-    parent_is_class: bool = False
-) -> Generator[ASTNode, None, None]:
+    chunk_type: str,
+    comments: list[Node] | None = None,
+) -> ASTNode:
     """
-    Recursively extract semantic units (functions, classes, methods) from the AST.
+    Create the ASTNode for a semantic unit, including its leading comments.
 
-    This function traverses the tree and yields ASTNode objects for each
-    semantic boundary (function, class, method, interface, etc.).
+    If the preceding comment nodes are already known they can be passed in;
+    otherwise they are found by walking back through the node's siblings.
     """
-    function_types = config.get("function_types", [])
-    class_types = config.get("class_types", [])
-    method_types = config.get("method_types", [])
-    interface_types = config.get("interface_types", [])
+    # Get leading comments/docstrings
+    if comments is None:
+        leading_comments = get_leading_comments(node, source_bytes, config)
+    else:
+        leading_comments = _format_comments(comments)
 
-    # Determine node type
-    is_function = node.type in function_types
-    is_class = node.type in class_types
-    is_method = node.type in method_types and parent_is_class
-    is_interface = node.type in interface_types if interface_types else False
+    # Calculate line range including leading comments
+    if leading_comments:
+        comment_lines = leading_comments.count("\n")
+        start_line = node.start_point[0] + 1 - comment_lines
+    else:
+        start_line = node.start_point[0] + 1  # Convert to 1-indexed
 
-    if is_function or is_class or is_method or is_interface:
-        # Get leading comments/docstrings
-        leading_comments = get_leading_comments(node, source_bytes, config)
+    end_line = node.end_point[0] + 1
 
-        # Calculate line range including leading comments
-        if leading_comments:
-            comment_lines = leading_comments.count("\n")
-            start_line = node.start_point[0] + 1 - comment_lines
-        else:
-            start_line = node.start_point[0] + 1  # Convert to 1-indexed
+    # Create the AST node; its content is decoded from source_bytes only if emitted
+    return ASTNode(
+        node_type=chunk_type,
+        name=get_node_name(node, config),
+        start_line=start_line,
+        end_line=end_line,
+        start_byte=node.start_byte,
+        end_byte=node.end_byte,
+        source=source_bytes,
+        leading_comments=leading_comments,
+    )
 
-        end_line = node.end_point[0] + 1
 
-        # Determine chunk type
-        if is_class:
-            chunk_type = "class"
-        elif is_interface:
-            chunk_type = "interface"
-        elif is_method:
-            chunk_type = "method"
-        else:
-            chunk_type = "function"
-
-        # Create the AST node
-        content = source_bytes[node.start_byte:node.end_byte].decode("utf-8", errors="ignore")
-        full_content = leading_comments + content
-
-        ast_node = ASTNode(
-            node_type=chunk_type,
-            name=get_node_name(node, config),
-            start_line=start_line,
-            end_line=end_line,
-            start_byte=node.start_byte,
-            end_byte=node.end_byte,
-            content=full_content,
-            leading_comments=leading_comments,
-        )
+def scan_tree(
+    root: Node,
+    source_bytes: bytes,
+    config: dict,
+    filename: str,
+) -> tuple[list[str], list[str], list[ASTNode]]:
+    """
+    Collect imports, exports and semantic units in a single pass over the AST.
+
+    Equivalent to calling extract_imports, extract_exports and
+    extract_semantic_units separately, but each node is visited once and
+    classified with one lookup in the language's dispatch table.
+
+    Returns:
+        Tuple of (imports, exports, semantic_units)
+    """
+    imports, exports, units = _scan(
+        root,
+        source_bytes,
+        config,
+        want_imports=bool(config.get("import_types")),
+        want_exports=bool(config.get("export_types")),
+    )
+
+    # Handle Python's __all__ for exports
+    if _file_suffix(filename) == ".py":
+        exports.extend(_extract_python_all(source_bytes))
+
+    # Deduplicate while preserving order
+    return list(dict.fromkeys(imports)), list(dict.fromkeys(exports)), units
 
-        # For classes, we need to also extract nested methods/functions
-        if is_class:
-            for child in node.children:
-                for nested in extract_semantic_units(child, source_bytes, config, parent_is_class=True):
-                    ast_node.children.append(nested)
 
-        yield ast_node
+def _scan(
+    root: Node,
+    source_bytes: bytes,
+    config: dict,
+    want_imports: bool,
+    want_exports: bool,
+    parent_is_class: bool = False,
+) -> tuple[list[str], list[str], list[ASTNode]]:
+    """Explicit-stack walk behind scan_tree and extract_semantic_units."""
+    # Prefer integer kind ids once the grammar is loaded; fall back to type names
+    spec = config.get("spec")
+    if spec is not None and spec.unit_query is not None:
+        return _scan_captures(root, source_bytes, config, spec, want_imports, want_exports, parent_is_class)
+    by_kind = spec is not None
+    if by_kind:
+        dispatch = spec.kind_dispatch
     else:
-        # Not a semantic unit, recurse into children
-        for child in node.children:
-            yield from extract_semantic_units(child, source_bytes, config, parent_is_class=parent_is_class)
+        dispatch = config.get("dispatch") or _build_dispatch(config)
+    imports: list[str] = []
+    exports: list[str] = []
+    units: list[ASTNode] = []
+
+    # Each entry carries what is still being collected below this node:
+    # (node, want_imports, want_exports, unit owner list or None, parent_is_class,
+    #  (comment run, run length) before it). The root's comments are looked up on demand.
+    stack = [(root, want_imports, want_exports, units, parent_is_class, None)]
+
+    while stack:
+        node, want_imports, want_exports, owner, parent_is_class, pending = stack.pop()
+        flags = dispatch.get(node.kind_id if by_kind else node.type, 0)
+
+        if flags:
+            if want_imports and flags & _IMPORT:
+                # Extract the import path based on language; import statements are not descended into
+                import_text = node.text.decode("utf-8", errors="ignore")
+                import_path = _parse_import_path(node, import_text, config)
+                if import_path:
+                    imports.extend(import_path if isinstance(import_path, list) else [import_path])
+                want_imports = False
+
+            if want_exports and flags & _EXPORT:
+                export_text = node.text.decode("utf-8", errors="ignore")
+                exported = _parse_export_symbols(node, export_text, config)
+                if exported:
+                    exports.extend(exported if isinstance(exported, list) else [exported])
+                want_exports = False
+
+            if owner is not None:
+                is_class = flags & _CLASS
+                is_interface = flags & _INTERFACE
+                is_method = flags & _METHOD and parent_is_class
+
+                if is_class or is_interface or is_method or flags & _FUNCTION:
+                    if is_class:
+                        chunk_type = "class"
+                    elif is_interface:
+                        chunk_type = "interface"
+                    elif is_method:
+                        chunk_type = "method"
+                    else:
+                        chunk_type = "function"
+
+                    comments = _attach_comments(node, *pending) if pending is not None else None
+                    ast_node = _build_ast_node(node, source_bytes, config, chunk_type, comments)
+                    owner.append(ast_node)
+
+                    # Classes collect their nested methods/functions; other units are leaves
+                    if is_class:
+                        owner = ast_node.children
+                        parent_is_class = True
+                        # Members live in the body; skip the header (keyword, name, bases)
+                        body = node.child_by_field_name("body")
+                        if body is not None:
+                            stack.append((body, want_imports, want_exports, owner, True, None))
+                            continue
+                    else:
+                        owner = None
+
+        if owner is not None:
+            # One left-to-right pass tracks the run of comment siblings preceding
+            # each child, so units don't walk back through their siblings
+            entries = []
+            run: list[Node] = []
+            for child in node.children:
+                entries.append((child, want_imports, want_exports, owner, parent_is_class, (run, len(run))))
+                if child.is_named:
+                    if dispatch.get(child.kind_id if by_kind else child.type, 0) & _COMMENT:
+                        run.append(child)
+                    elif run:
+                        run = []
+            entries.reverse()
+            stack.extend(entries)
+        elif want_imports or want_exports:
+            stack.extend(
+                (child, want_imports, want_exports, None, parent_is_class, None)
+                for child in reversed(node.children)
+            )
+
+    return imports, exports, units
+
+
+def _scan_captures(
+    root: Node,
+    source_bytes: bytes,
+    config: dict,
+    spec: LanguageSpec,
+    want_imports: bool,
+    want_exports: bool,
+    parent_is_class: bool = False,
+) -> tuple[list[str], list[str], list[ASTNode]]:
+    """
+    Query-driven equivalent of _scan.
+
+    The language's unit query finds every candidate node in one C-side
+    traversal, so Python only touches nodes that matter. The ancestor state
+    that _scan threads through its stack is rebuilt from byte-range
+    containment of the captured nodes.
+    """
+    dispatch = spec.kind_dispatch
+    imports: list[str] = []
+    exports: list[str] = []
+    units: list[ASTNode] = []
+
+    # Captured ancestors still open at the current position, each with the
+    # state its descendants inherit:
+    # (end_byte, want_imports, want_exports, owner, parent_is_class, class body range)
+    open_nodes: list[tuple] = []
+
+    # Leading-comment maps, built once per container (module, class body, ...)
+    comment_maps: dict[int, dict[int, list[Node]]] = {}
+
+    for node in capture_nodes(spec.unit_query, root):
+        start = node.start_byte
+        while open_nodes and open_nodes[-1][0] <= start:
+            open_nodes.pop()
+
+        if open_nodes:
+            _, node_imports, node_exports, owner, in_class, body = open_nodes[-1]
+            if body is not None and not (body[0] <= start and node.end_byte <= body[1]):
+                # Class header (keyword, name, bases): not scanned for members
+                continue
+        else:
+            node_imports, node_exports, owner, in_class = want_imports, want_exports, units, parent_is_class
+
+        flags = dispatch.get(node.kind_id, 0)
+        body = None
+
+        if node_imports and flags & _IMPORT:
+            # Extract the import path based on language; import statements are not descended into
+            import_text = node.text.decode("utf-8", errors="ignore")
+            import_path = _parse_import_path(node, import_text, config)
+            if import_path:
+                imports.extend(import_path if isinstance(import_path, list) else [import_path])
+            node_imports = False
+
+        if node_exports and flags & _EXPORT:
+            export_text = node.text.decode("utf-8", errors="ignore")
+            exported = _parse_export_symbols(node, export_text, config)
+            if exported:
+                exports.extend(exported if isinstance(exported, list) else [exported])
+            node_exports = False
+
+        if owner is not None:
+            is_class = flags & _CLASS
+            is_interface = flags & _INTERFACE
+            is_method = flags & _METHOD and in_class
+
+            if is_class or is_interface or is_method or flags & _FUNCTION:
+                if is_class:
+                    chunk_type = "class"
+                elif is_interface:
+                    chunk_type = "interface"
+                elif is_method:
+                    chunk_type = "method"
+                else:
+                    chunk_type = "function"
+
+                container = node.parent
+                if container is None:
+                    comments = []
+                else:
+                    comment_map = comment_maps.get(container.id)
+                    if comment_map is None:
+                        comment_map = comment_maps[container.id] = _leading_comment_map(container, dispatch)
+                    comments = comment_map.get(node.start_byte, [])
+
+                ast_node = _build_ast_node(node, source_bytes, config, chunk_type, comments)
+                owner.append(ast_node)
+
+                # Classes collect their nested methods/functions; other units are leaves
+                if is_class:
+                    owner = ast_node.children
+                    in_class = True
+                    body_node = node.child_by_field_name("body")
+                    if body_node is not None:
+                        body = (body_node.start_byte, body_node.end_byte)
+                else:
+                    owner = None
+
+        open_nodes.append((node.end_byte, node_imports, node_exports, owner, in_class, body))
+
+    return imports, exports, units
+
+
+def extract_semantic_units(
+    node: Node,
+    source_bytes: bytes,
+    config: dict,
+    parent_is_class: bool = False
+) -> list[ASTNode]:
+    """
+    Extract semantic units (functions, classes, methods) from the AST.
+
+    This function traverses the tree and returns ASTNode objects for each
+    semantic boundary (function, class, method, interface, etc.) in document
+    order. Classes carry their nested methods/functions as children.
+
+    The walk uses an explicit stack rather than recursive generators, and the
+    units are returned as the list it fills, so neither the walk nor the caller
+    pays a generator frame and resume per node.
+    """
+    _, _, units = _scan(node, source_bytes, config, False, False, parent_is_class)
+    return units
 
 
 def should_separate_nested(nested: ASTNode, parent: ASTNode) -> bool:
@@ -699,33 +1334,99 @@ def should_separate_nested(nested: ASTNode, parent: ASTNode) -> bool:
     return nested.line_count >= NESTED_FUNCTION_SIZE_THRESHOLD
 
 
-def chunk_with_ast(content: str, filename: str, config: dict) -> list[CodeChunk]:
+def chunk_with_ast(
+    content: str,
+    filename: str,
+    config: dict,
+    prev_tree: Tree | None = None,
+    edit: TreeEdit | None = None,
+    source_bytes: bytes | None = None,
+) -> Generator[CodeChunk, None, None]:
     """
     Chunk code using AST-based function/class boundary detection.
 
-    Returns a list of CodeChunk objects, each representing a semantic unit.
-    Now includes symbol_names, imports, and exports for each chunk.
+    Yields CodeChunk objects in document order, each representing a semantic unit
+    or the module-level code between units. Now includes symbol_names, imports,
+    and exports for each chunk. Chunks are produced as they are built, so callers
+    can embed or store them without holding the whole file's chunks at once.
+
+    See chunk_with_ast_incremental for the prev_tree/edit arguments. Callers that
+    already hold the UTF-8 encoding of content can pass it as source_bytes.
+    """
+    if source_bytes is None:
+        source_bytes = content.encode("utf-8")
+    tree = _parse_source(source_bytes, config, prev_tree, edit)
+    yield from _iter_chunks(content, source_bytes, filename, config, tree)
+
+
+def chunk_with_ast_incremental(
+    content: str,
+    filename: str,
+    config: dict,
+    prev_tree: Tree | None = None,
+    edit: TreeEdit | None = None,
+) -> tuple[list[CodeChunk], Tree]:
+    """
+    Chunk code with AST boundaries, returning the parse tree alongside the chunks.
+
+    When the previous tree for this file and the edit that produced the new
+    content are supplied, tree-sitter re-parses only the changed subtrees.
+    Callers should keep the returned tree and pass it back with the next edit.
+
+    Args:
+        content: The new source code content
+        filename: The filename (used for export detection)
+        config: Language configuration from get_language_config()
+        prev_tree: Tree returned by the previous call for this file
+        edit: The edit that transformed the previous content into `content`
+
+    Returns:
+        Tuple of (chunks, tree)
     """
     source_bytes = content.encode("utf-8")
-    language = config["language"]
+    tree = _parse_source(source_bytes, config, prev_tree, edit)
+    return list(_iter_chunks(content, source_bytes, filename, config, tree)), tree
+
+
+def _parse_source(
+    source_bytes: bytes,
+    config: dict,
+    prev_tree: Tree | None = None,
+    edit: TreeEdit | None = None,
+) -> Tree:
+    """Parse source bytes, reusing prev_tree when an edit describes the change."""
+    with borrow_parser(config["language"]) as parser:
+        if prev_tree is not None and edit is not None:
+            # The old tree is only valid as a base once it knows about the edit
+            prev_tree.edit(
+                start_byte=edit.start_byte,
+                old_end_byte=edit.old_end_byte,
+                new_end_byte=edit.new_end_byte,
+                start_point=edit.start_point,
+                old_end_point=edit.old_end_point,
+                new_end_point=edit.new_end_point,
+            )
+            return parser.parse(source_bytes, prev_tree)
+        return parser.parse(source_bytes)
 
-    parser = create_parser(language)
-    tree = parser.parse(source_bytes)
 
+def _iter_chunks(
+    content: str,
+    source_bytes: bytes,
+    filename: str,
+    config: dict,
+    tree: Tree,
+) -> Generator[CodeChunk, None, None]:
+    """Yield the chunks for a parsed file in document order."""
     if tree.root_node.has_error:
         # Tree has parsing errors, but we can still try to extract what we can
         pass
 
-    chunks: list[CodeChunk] = []
-    lines = content.split("\n")
-    total_lines = len(lines)
+    # Same count as len(content.split("\n")) without materializing every line
+    total_lines = content.count("\n") + 1
 
-    # Extract file-level imports and exports once
-    file_imports = extract_imports(tree.root_node, source_bytes, config)
-    file_exports = extract_exports(tree.root_node, source_bytes, config, filename)
-
-    # Extract all top-level semantic units
-    semantic_units = list(extract_semantic_units(tree.root_node, source_bytes, config))
+    # Extract file-level imports, exports and all top-level semantic units in one pass
+    file_imports, file_exports, semantic_units = scan_tree(tree.root_node, source_bytes, config, filename)
 
     if not semantic_units:
         # No semantic units found, return the whole file as a single chunk
@@ -733,7 +1434,7 @@ def chunk_with_ast(content: str, filename: str, config: dict) -> list[CodeChunk]
         all_symbols = extract_all_symbols_from_chunk(
             tree.root_node, source_bytes, config, 1, total_lines
         )
-        return [CodeChunk(
+        yield CodeChunk(
             filename=filename,
             location=f"1-{total_lines}",
             code=content,
@@ -744,18 +1445,41 @@ def chunk_with_ast(content: str, filename: str, config: dict) -> list[CodeChunk]
             symbol_names=all_symbols,
             imports=file_imports,
             exports=file_exports,
-        )]
+        )
+        return
+
+    # Units are found in document order, but attaching leading comments (e.g.
+    # Rust /// docs on an impl) can move a start_line back past an earlier
+    # unit's; only sort when that happens. The merge below needs sorted units.
+    if any(a.start_line > b.start_line for a, b in zip(semantic_units, semantic_units[1:])):
+        semantic_units.sort(key=lambda x: x.start_line)
+
+    # Find gaps (module-level code, imports, etc.) between the units
+    covered_ranges = [(unit.start_line, unit.end_line) for unit in semantic_units]
+    gaps = find_uncovered_ranges(covered_ranges, total_lines)
 
-    # Sort units by start line
-    semantic_units.sort(key=lambda x: x.start_line)
+    # Both streams are in start_line order; on ties unit chunks come first
+    yield from heapq.merge(
+        _unit_chunks(semantic_units, filename, file_exports),
+        _gap_chunks(gaps, content, filename, tree, source_bytes, config, file_imports),
+        key=lambda c: c.start_line,
+    )
 
-    # Track which lines are covered by semantic units
-    covered_ranges: list[tuple[int, int]] = []
+
+def _unit_chunks(
+    semantic_units: list[ASTNode],
+    filename: str,
+    file_exports: list[str],
+) -> Generator[CodeChunk, None, None]:
+    """Yield chunks for semantic units and their large nested units, in start_line order."""
+    threshold = NESTED_FUNCTION_SIZE_THRESHOLD
 
     for unit in semantic_units:
-        # Handle nested functions/methods
+        unit_chunks: list[CodeChunk] = []
+
+        # Handle nested functions/methods (same rule as should_separate_nested, inlined)
         if unit.children:
-            large_nested = [c for c in unit.children if should_separate_nested(c, unit)]
+            large_nested = [c for c in unit.children if c.line_count >= threshold]
 
             if large_nested:
                 # Extract large nested functions separately
@@ -767,7 +1491,7 @@ def chunk_with_ast(content: str, filename: str, config: dict) -> list[CodeChunk]
                         if child.name:
                             nested_symbols.append(child.name)
 
-                    chunks.append(CodeChunk(
+                    unit_chunks.append(CodeChunk(
                         filename=filename,
                         location=f"{nested.start_line}-{nested.end_line}",
                         code=nested.content,
@@ -790,7 +1514,7 @@ def chunk_with_ast(content: str, filename: str, config: dict) -> list[CodeChunk]
                     unit_symbols.append(child.name)
 
         # Add the main unit
-        chunks.append(CodeChunk(
+        unit_chunks.append(CodeChunk(
             filename=filename,
             location=f"{unit.start_line}-{unit.end_line}",
             code=unit.content,
@@ -803,60 +1527,115 @@ def chunk_with_ast(content: str, filename: str, config: dict) -> list[CodeChunk]
             exports=[unit.name] if unit.name and unit.name in file_exports else [],
         ))
 
-        covered_ranges.append((unit.start_line, unit.end_line))
+        # Nested units sit inside their parent, so only this unit's chunks need ordering
+        if len(unit_chunks) > 1:
+            unit_chunks.sort(key=lambda c: c.start_line)
+        yield from unit_chunks
 
-    # Find gaps (module-level code, imports, etc.) and chunk them
-    covered_ranges.sort()
-    gaps = find_uncovered_ranges(covered_ranges, total_lines)
 
+def _gap_chunks(
+    gaps: list[tuple[int, int]],
+    content: str,
+    filename: str,
+    tree: Tree,
+    source_bytes: bytes,
+    config: dict,
+    file_imports: list[str],
+) -> Generator[CodeChunk, None, None]:
+    """Yield chunks for non-empty module-level gaps between semantic units."""
+    if not gaps:
+        return
+    offsets = _compute_line_offsets(content, source_bytes)
+
+    # Only include non-empty gaps
+    filled: list[tuple[int, int, str]] = []
     for gap_start, gap_end in gaps:
-        gap_lines = lines[gap_start - 1:gap_end]  # Convert to 0-indexed for slicing
-        gap_content = "\n".join(gap_lines)
-
-        # Only include non-empty gaps
+        gap_content = content[offsets[gap_start - 1]:offsets[gap_end] - 1]
         if gap_content.strip():
-            # Extract symbols defined in this gap (e.g., module-level constants)
-            gap_symbols = extract_all_symbols_from_chunk(
-                tree.root_node, source_bytes, config, gap_start, gap_end
-            )
+            filled.append((gap_start, gap_end, gap_content))
+    if not filled:
+        return
 
-            chunks.append(CodeChunk(
-                filename=filename,
-                location=f"{gap_start}-{gap_end}",
-                code=gap_content,
-                start_line=gap_start,
-                end_line=gap_end,
-                chunk_type="other",
-                symbol_name=None,
-                symbol_names=gap_symbols,
-                imports=file_imports,  # Module-level code often contains imports
-                exports=[],  # Gap code doesn't typically have explicit exports
-            ))
-
-    # Sort chunks by start line for consistent output
-    chunks.sort(key=lambda c: c.start_line)
+    # Extract symbols defined in each gap (e.g., module-level constants) in one walk
+    symbols_per_gap = extract_gap_symbols(
+        tree.root_node, config, [(gap_start, gap_end) for gap_start, gap_end, _ in filled]
+    )
 
-    return chunks
+    for (gap_start, gap_end, gap_content), gap_symbols in zip(filled, symbols_per_gap):
+        yield CodeChunk(
+            filename=filename,
+            location=f"{gap_start}-{gap_end}",
+            code=gap_content,
+            start_line=gap_start,
+            end_line=gap_end,
+            chunk_type="other",
+            symbol_name=None,
+            symbol_names=gap_symbols,
+            imports=file_imports,  # Module-level code often contains imports
+            exports=[],  # Gap code doesn't typically have explicit exports
+        )
+
+
+def _compute_line_offsets(content: str, source_bytes: bytes | None = None) -> np.ndarray:
+    """
+    Build the start offset of every line, plus a sentinel of len(content) + 1.
+
+    Lines are "\n"-separated as in content.split("\n"), so the text of
+    1-indexed lines a..b (inclusive) is content[offsets[a - 1]:offsets[b] - 1].
+    Newlines are located with one vectorized NumPy pass over the UTF-8 bytes
+    (source_bytes, when the caller already has content encoded).
+    """
+    if source_bytes is None:
+        source_bytes = content.encode("utf-8", "surrogatepass")
+    codes = np.frombuffer(source_bytes, dtype=np.uint8)
+    if len(source_bytes) != len(content):
+        # Keep one byte per character by dropping UTF-8 continuation bytes
+        # (0b10xxxxxx), so indices line up with str offsets; 0x0A only ever
+        # occurs as a character of its own
+        codes = codes[(codes & 0xC0) != 0x80]
+    newlines = np.flatnonzero(codes == 0x0A)
+
+    offsets = np.empty(len(newlines) + 2, dtype=np.int64)
+    offsets[0] = 0
+    offsets[1:-1] = newlines + 1
+    offsets[-1] = len(content) + 1
+    return offsets
 
 
 def find_uncovered_ranges(
     covered: list[tuple[int, int]],
     total_lines: int
 ) -> list[tuple[int, int]]:
-    """Find line ranges not covered by any semantic unit."""
+    """
+    Find line ranges not covered by any semantic unit.
+
+    Covered lines are marked in a bytearray bitmap and gaps are read back as
+    runs of zero bytes with bytearray.find, so the ranges don't need sorting
+    and the scan runs in C.
+    """
     if not covered:
         return [(1, total_lines)]
 
-    gaps = []
-    current_pos = 1
-
+    # Index = 1-based line number; index 0 is unused
+    covered_lines = bytearray(total_lines + 1)
     for start, end in covered:
-        if current_pos < start:
-            gaps.append((current_pos, start - 1))
-        current_pos = max(current_pos, end + 1)
-
-    if current_pos <= total_lines:
-        gaps.append((current_pos, total_lines))
+        start = max(start, 1)
+        end = min(end, total_lines)
+        if start <= end:
+            covered_lines[start:end + 1] = b"\x01" * (end - start + 1)
+
+    gaps: list[tuple[int, int]] = []
+    limit = total_lines + 1
+    pos = 1
+    while pos <= total_lines:
+        gap_start = covered_lines.find(0, pos, limit)
+        if gap_start == -1:
+            break
+        gap_end = covered_lines.find(1, gap_start, limit)
+        if gap_end == -1:
+            gap_end = limit
+        gaps.append((gap_start, gap_end - 1))
+        pos = gap_end
 
     return gaps
 
@@ -872,8 +1651,8 @@ def chunk_with_fallback(
 
     Uses a maximum of 500 lines per chunk with overlap for context.
     """
-    lines = content.split("\n")
-    total_lines = len(lines)
+    # Same count as len(content.split("\n")) without materializing every line
+    total_lines = content.count("\n") + 1
 
     if total_lines <= max_lines:
         return [CodeChunk(
@@ -888,15 +1667,15 @@ def chunk_with_fallback(
 
     chunks = []
     start = 0
+    offsets = _compute_line_offsets(content)
 
     while start < total_lines:
         end = min(start + max_lines, total_lines)
-        chunk_lines = lines[start:end]
 
         chunks.append(CodeChunk(
             filename=filename,
             location=f"{start + 1}-{end}",  # 1-indexed
-            code="\n".join(chunk_lines),
+            code=content[offsets[start]:offsets[end] - 1],  # Lines start..end-1, 0-indexed
             start_line=start + 1,
             end_line=end,
             chunk_type="other",
@@ -909,6 +1688,67 @@ def chunk_with_fallback(
     return chunks
 
 
+def chunk_code_ast_bytes(data: bytes, filename: str, content_hash: str | None = None) -> list[CodeChunk]:
+    """
+    Chunk raw file bytes, as read with open(..., "rb").
+
+    Valid UTF-8 is handed to tree-sitter as-is rather than being decoded and
+    re-encoded; other input is decoded with errors ignored, as text reads do.
+
+    Args:
+        data: The raw file contents
+        filename: The filename (used for extension detection)
+        content_hash: parse_cache.content_hash(data), if the caller already computed it
+
+    Returns:
+        List of CodeChunk objects
+    """
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError:
+        # Byte offsets only line up with content once invalid sequences are dropped
+        return _chunk_code_ast(data.decode("utf-8", errors="ignore"), filename, None, content_hash)
+    return _chunk_code_ast(content, filename, data, content_hash)
+
+
+def chunk_file(path: str | Path, filename: str | None = None) -> list[CodeChunk]:
+    """
+    Read and chunk a file, reusing cached chunks when it hasn't changed.
+
+    With the chunk cache enabled, the file's (mtime, size) is remembered
+    alongside its content hash, so a file that hasn't been touched since the
+    last run is neither read nor hashed. Otherwise this is equivalent to
+    chunk_code_ast_bytes(path.read_bytes(), filename).
+
+    Args:
+        path: The file to chunk
+        filename: Name reported on the chunks (defaults to str(path))
+
+    Returns:
+        List of CodeChunk objects
+    """
+    path = Path(path)
+    if filename is None:
+        filename = str(path)
+    if not AST_CHUNK_CACHE_PATH:
+        return chunk_code_ast_bytes(path.read_bytes(), filename)
+
+    stat_key = str(path.absolute())
+    st = path.stat()
+    content_hash = parse_cache.stat_lookup(AST_CHUNK_CACHE_PATH, stat_key, st)
+    if content_hash is not None:
+        cached = _cache_lookup(content_hash, _file_suffix(filename))
+        if cached is not None:
+            for chunk in cached:
+                chunk.filename = filename
+            return cached
+
+    data = path.read_bytes()
+    content_hash = parse_cache.content_hash(data)
+    parse_cache.stat_store(AST_CHUNK_CACHE_PATH, stat_key, st, content_hash)
+    return chunk_code_ast_bytes(data, filename, content_hash)
+
+
 def chunk_code_ast(content: str, filename: str) -> list[CodeChunk]:
     """
     Main entry point for AST-based code chunking.
@@ -926,7 +1766,18 @@ def chunk_code_ast(content: str, filename: str) -> list[CodeChunk]:
     Returns:
         List of CodeChunk objects
     """
-    if not content.strip():
+    return _chunk_code_ast(content, filename, None)
+
+
+def _chunk_code_ast(
+    content: str,
+    filename: str,
+    source_bytes: bytes | None,
+    content_hash: str | None = None,
+) -> list[CodeChunk]:
+    """Chunk content whose UTF-8 encoding is source_bytes, encoding it only if parsed or hashed."""
+    # isspace() answers the same question as strip() without copying the file
+    if not content or content.isspace():
         return []
 
     # Check if this is a config file first
@@ -955,18 +1806,172 @@ def chunk_code_ast(content: str, filename: str) -> list[CodeChunk]:
         # Language not supported, use fallback
         return chunk_with_fallback(content, filename)
 
+    # A small file with none of the language's keywords has no units, imports or
+    # exports, so parsing would only produce this same whole-file chunk
+    total_lines = content.count("\n") + 1
+    if total_lines < SMALL_FILE_THRESHOLD and not any(
+        hint in content for hint in config["keyword_hints"]
+    ):
+        return [CodeChunk(
+            filename=filename,
+            location=f"1-{total_lines}",
+            code=content,
+            start_line=1,
+            end_line=total_lines,
+            chunk_type="module",
+            symbol_name=None,
+        )]
+
+    # Chunk output is a pure function of content, extension and grammar versions,
+    # so unchanged files can skip parsing entirely
+    ext = _file_suffix(filename)
     try:
-        chunks = chunk_with_ast(content, filename, config)
+        # Inside the try: text with lone surrogates can't be encoded, and gets
+        # the same line-based fallback as a failed parse
+        if source_bytes is None:
+            source_bytes = content.encode("utf-8")
+        if not AST_CHUNK_CACHE_PATH:
+            content_hash = None
+        elif content_hash is None:
+            content_hash = parse_cache.content_hash(source_bytes)
+        if content_hash is not None:
+            cached = _cache_lookup(content_hash, ext)
+            if cached is not None:
+                for chunk in cached:
+                    chunk.filename = filename
+                return cached
+
+        chunks = list(chunk_with_ast(content, filename, config, source_bytes=source_bytes))
         if chunks:
+            if content_hash is not None:
+                _cache_store(content_hash, ext, chunks)
             return chunks
         # AST parsing succeeded but no chunks found, use fallback
         return chunk_with_fallback(content, filename)
     except Exception as e:
         # AST parsing failed, use fallback
-        print(f"  Warning: AST parsing failed for {filename}: {e}, using line-based fallback")
+        if filename not in _WARN_SEEN:
+            _WARN_SEEN.add(filename)
+            logger.warning("AST parsing failed for %s: %s, using line-based fallback", filename, e)
         return chunk_with_fallback(content, filename)
 
 
+def _init_chunk_worker(extensions: frozenset[str]) -> None:
+    """Process pool initializer: load grammars and build parsers for the given extensions."""
+    for ext in extensions:
+        config = get_language_config(f"file{ext}")
+        if config is not None:
+            create_parser(config["language"])
+
+
+def _chunk_file_worker(item: tuple[str, str]) -> list[CodeChunk]:
+    """Chunk a single (filename, path) pair inside a worker process."""
+    filename, path = item
+    try:
+        return chunk_file(path, filename)
+    except Exception as e:
+        # One bad file must not take down the whole batch
+        logger.warning("Could not process %s: %s", filename, e)
+        return []
+
+
+def chunk_files_parallel(
+    paths: Iterable[str | Path],
+    root: str | Path | None = None,
+    max_workers: int | None = None,
+    chunksize: int = PARALLEL_CHUNKSIZE,
+) -> list[list[CodeChunk]]:
+    """
+    Chunk many files across a pool of worker processes.
+
+    Tree-sitter parsing is CPU-bound, so files are fanned out to separate
+    processes rather than threads. Each worker builds its parsers once in the
+    pool initializer and reuses them for every file it receives.
+
+    Args:
+        paths: Files to chunk
+        root: If given, chunk filenames are reported relative to this directory
+        max_workers: Number of worker processes (defaults to os.cpu_count())
+        chunksize: Files sent to a worker per IPC round trip
+
+    Returns:
+        One list of CodeChunk objects per input path, in input order
+    """
+    # Workers read the files themselves, so unchanged files can be served from
+    # the chunk cache without crossing the pipe
+    items: list[tuple[str, str]] = []
+    for path in paths:
+        path = Path(path)
+        filename = str(path.relative_to(root)) if root is not None else str(path)
+        items.append((filename, str(path)))
+
+    if not items:
+        return []
+
+    extensions = frozenset(_file_suffix(filename) for filename, _ in items)
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_chunk_worker,
+        initargs=(extensions,),
+    ) as executor:
+        return list(executor.map(_chunk_file_worker, items, chunksize=max(chunksize, 1)))
+
+
+def chunk_files(
+    paths: Iterable[str | Path],
+    root: str | Path | None = None,
+    max_workers: int | None = None,
+) -> dict[str, list[CodeChunk]]:
+    """
+    Chunk many files in parallel, keyed by filename.
+
+    Files that can't be read are skipped with a warning. The result keeps the
+    filenames in sorted order so downstream embedding batches are stable
+    between runs.
+
+    Args:
+        paths: Files to chunk
+        root: If given, filenames are reported relative to this directory
+        max_workers: Number of worker processes (defaults to os.cpu_count())
+
+    Returns:
+        Dict mapping each filename to its chunks
+    """
+    readable: list[Path] = []
+    for path in paths:
+        path = Path(path)
+        if os.access(path, os.R_OK):
+            readable.append(path)
+        else:
+            logger.warning("Could not read %s, skipping", path)
+
+    filenames = [str(p.relative_to(root)) if root is not None else str(p) for p in readable]
+    results = chunk_files_parallel(readable, root=root, max_workers=max_workers)
+    return dict(sorted(zip(filenames, results), key=lambda item: item[0]))
+
+
+def _chunk_cache_namespace() -> str:
+    """
+    Cache namespace for chunks under the current settings.
+
+    Includes every setting that shapes cached AST chunks, so changing one
+    misses instead of returning chunks built under the old value. Fallback
+    and small-file chunks aren't cached, so their settings aren't included.
+    """
+    return f"chunks/{_CHUNK_CACHE_FORMAT}/nested={NESTED_FUNCTION_SIZE_THRESHOLD}"
+
+
+def _cache_lookup(content_hash: str, ext: str) -> list[CodeChunk] | None:
+    """Return cached chunks for this content hash and extension, or None on a miss."""
+    key = (content_hash, ext)
+    return parse_cache.cache_lookup(AST_CHUNK_CACHE_PATH, _chunk_cache_namespace(), [key]).get(key)
+
+
+def _cache_store(content_hash: str, ext: str, chunks: list[CodeChunk]) -> None:
+    """Store chunks for this content hash and extension. Failures are ignored."""
+    parse_cache.cache_store(AST_CHUNK_CACHE_PATH, _chunk_cache_namespace(), {(content_hash, ext): chunks})
+
+
 # Export the main function with an alias matching the existing interface
 def chunk_code(content: str, filename: str, chunk_size: int = 1000, overlap: int = 300) -> list[CodeChunk]:
     """
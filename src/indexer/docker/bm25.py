@@ -15,12 +15,12 @@ Key features:
 - Uses PostgreSQL full-text search with custom ranking
 """
 
-import re
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class KeywordMatch:
     """A code chunk matched by keyword search."""
     chunk_id: str
@@ -37,43 +37,86 @@ class KeywordMatch:
     branch: str
 
 
-def normalize_identifier(identifier: str) -> list[str]:
+def split_identifier(identifier: str) -> list[str]:
+    """
+    Split an identifier into lowercase words in a single pass.
+
+    Word boundaries are underscores and whitespace, lower-to-upper case
+    transitions (getUser), the end of an uppercase run (HTTPServer), and
+    letter/digit transitions (VP9Codec, utf8Decode).
+
+    Args:
+        identifier: The identifier to split (e.g., 'getUserName', 'get_user_name')
+
+    Returns:
+        List of lowercase words, e.g. ['get', 'user', 'name']
+    """
+    parts: list[str] = []
+    length = len(identifier)
+    word_start = -1
+    prev = ""
+
+    for i, ch in enumerate(identifier):
+        if ch == "_" or ch.isspace():
+            if word_start >= 0:
+                parts.append(identifier[word_start:i].lower())
+                word_start = -1
+            prev = ""
+            continue
+
+        if word_start < 0:
+            word_start = i
+        elif (
+            (ch.isupper() and (
+                prev.islower()
+                or (prev.isupper() and i + 1 < length and identifier[i + 1].islower())
+            ))
+            or (ch.isdigit() and prev.isalpha())
+            or (ch.isalpha() and prev.isdigit())
+        ):
+            parts.append(identifier[word_start:i].lower())
+            word_start = i
+        prev = ch
+
+    if word_start >= 0:
+        parts.append(identifier[word_start:].lower())
+    return parts
+
+
+@lru_cache(maxsize=1 << 16)
+def normalize_identifier(identifier: str) -> tuple[str, ...]:
     """
     Normalize an identifier to handle camelCase and snake_case variations.
 
+    Results are memoized: the same symbol names recur across many chunks and
+    every search re-normalizes them when boosting exact matches.
+
     Args:
         identifier: The identifier to normalize (e.g., 'getUserName', 'get_user_name')
 
     Returns:
-        List of normalized variations for matching
+        Tuple of normalized variations for matching: the lowercased identifier,
+        then (if it splits) its words, snake_case form and joined form
     """
-    variations = [identifier.lower()]
-
-    # Split camelCase: getUserName -> ['get', 'user', 'name']
-    camel_split = re.sub(r'([a-z])([A-Z])', r'\1 \2', identifier)
-    camel_parts = camel_split.lower().split()
-    if len(camel_parts) > 1:
-        variations.extend(camel_parts)
-        # Also add snake_case version
-        variations.append('_'.join(camel_parts))
-
-    # Split snake_case: get_user_name -> ['get', 'user', 'name']
-    snake_parts = identifier.lower().split('_')
-    if len(snake_parts) > 1:
-        variations.extend(snake_parts)
-        # Also add camelCase version
-        camel_version = snake_parts[0] + ''.join(p.capitalize() for p in snake_parts[1:])
-        variations.append(camel_version.lower())
-
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_variations = []
-    for v in variations:
-        if v not in seen and v:
-            seen.add(v)
-            unique_variations.append(v)
-
-    return unique_variations
+    lowered = identifier.lower()
+    variations = [lowered]
+
+    parts = split_identifier(identifier)
+    if parts != variations:
+        variations.extend(parts)
+        variations.append('_'.join(parts))
+        variations.append(''.join(parts))
+
+    # Remove duplicates and empty strings while preserving order
+    return tuple(filter(None, dict.fromkeys(variations)))
+
+
+def _term_group(token: str) -> str:
+    """tsquery term for one token: an OR group of its identifier variations."""
+    variations = normalize_identifier(token)
+    if len(variations) > 1:
+        return '(' + ' | '.join(variations) + ')'
+    return variations[0] if variations else token.lower()
 
 
 def build_tsquery(query: str) -> str:
@@ -92,28 +135,16 @@ def build_tsquery(query: str) -> str:
         PostgreSQL tsquery string
     """
     # Split query into tokens
-    tokens = re.split(r'\s+', query.strip())
-
-    # Normalize each token and build query terms
-    all_terms = []
-    for token in tokens:
-        if not token:
-            continue
-
-        # Get all variations of this token
-        variations = normalize_identifier(token)
-
-        # Create OR group for variations
-        if len(variations) > 1:
-            term_group = '(' + ' | '.join(variations) + ')'
-        else:
-            term_group = variations[0] if variations else token.lower()
+    # str.split() drops leading/trailing whitespace and never yields empty tokens
+    tokens = query.split()
 
-        all_terms.append(term_group)
+    # Most searches are a single identifier, which needs no joining
+    if len(tokens) == 1:
+        return _term_group(tokens[0])
 
     # Join terms with OR (any term match is relevant)
     # Use & for AND if you want stricter matching
-    return ' | '.join(all_terms) if all_terms else query.lower()
+    return ' | '.join(map(_term_group, tokens)) if tokens else query.lower()
 
 
 def calculate_exact_match_boost(
@@ -140,28 +171,63 @@ def calculate_exact_match_boost(
 
     # Normalize query for comparison
     query_normalized = query.lower().strip()
-    query_variations = set(normalize_identifier(query))
 
-    for symbol in symbol_names:
-        symbol_lower = symbol.lower()
-        symbol_variations = set(normalize_identifier(symbol))
-
-        # Check for exact match
-        if query_normalized == symbol_lower:
-            return exact_match_multiplier
+    # An exact match anywhere in the chunk wins over a partial match earlier on
+    if any(symbol.lower() == query_normalized for symbol in symbol_names):
+        return exact_match_multiplier
 
-        # Check if any variation matches
-        if query_variations & symbol_variations:
+    query_variations = frozenset(normalize_identifier(query))
+    for symbol in symbol_names:
+        # Check if any variation matches; isdisjoint stops at the first shared one
+        if not query_variations.isdisjoint(normalize_identifier(symbol)):
             # Partial match gets a smaller boost
             return exact_match_multiplier * 0.7
 
     return 1.0
 
 
+# SQL counterpart of calculate_exact_match_boost, evaluated against the
+# generated lower_symbols/symbol_variations columns of a chunks row aliased "c".
+# Parameters are supplied by exact_match_boost_params.
+EXACT_MATCH_BOOST_SQL = """CASE
+    WHEN %s = ANY(c.lower_symbols) THEN %s
+    WHEN c.symbol_variations && %s::text[] THEN %s * 0.7
+    ELSE 1.0
+END"""
+
+
+def exact_match_boost_params(
+    query: str,
+    exact_match_multiplier: float = 3.0
+) -> tuple:
+    """
+    Build the parameters for EXACT_MATCH_BOOST_SQL.
+
+    Args:
+        query: The search query
+        exact_match_multiplier: Multiplier for exact matches (default: 3.0)
+
+    Returns:
+        Parameter tuple, in placeholder order
+    """
+    return (
+        query.lower().strip(),
+        exact_match_multiplier,
+        list(normalize_identifier(query)),
+        exact_match_multiplier,
+    )
+
+
 # BM25 parameters (can be tuned)
 BM25_K1 = 1.2  # Term frequency saturation parameter
 BM25_B = 0.75  # Document length normalization parameter
 
+# ts_rank_cd normalization flags: 1 divides by 1 + log(doc length), which
+# approximates BM25's length normalization; 32 maps the rank to rank / (rank + 1),
+# bounding scores to [0, 1) so they're comparable across queries and with
+# vector similarities
+TS_RANK_NORMALIZATION = 1 | 32
+
 
 def bm25_score_sql(
     query_terms: list[str],
@@ -172,7 +238,13 @@ def bm25_score_sql(
     Generate SQL for BM25-style scoring using PostgreSQL ts_rank.
 
     PostgreSQL's ts_rank_cd (cover density) is similar to BM25 in that it
-    considers term proximity. We use it with normalization for document length.
+    considers term proximity. We use it with normalization for document length,
+    scaled into [0, 1) (see TS_RANK_NORMALIZATION).
+
+    Ranking is only evaluated for rows the GIN index on the tsvector column
+    already matched. Index-backed BM25 (e.g. the vchord_bm25 extension) would
+    avoid re-reading each matched tsvector, but isn't part of the pgvector
+    image the indexer database runs on.
 
     Args:
         query_terms: List of search terms
@@ -182,6 +254,48 @@ def bm25_score_sql(
     Returns:
         SQL expression for BM25-style scoring
     """
-    # Use ts_rank_cd with normalization option 1 (divide by 1 + log(doc length))
-    # This approximates BM25's document length normalization
-    return f"ts_rank_cd({tsv_column}, query, 1)"
+    return f"ts_rank_cd({tsv_column}, query, {TS_RANK_NORMALIZATION})"
+
+
+def bm25_score_batch(
+    conn: Any,
+    query: str,
+    chunk_ids: list[str],
+    limit: int = 100,
+) -> list[tuple[str, float]]:
+    """
+    Score a batch of candidate chunks against a query in one round-trip.
+
+    Rather than issuing one ranking query per candidate, all chunk ids are
+    passed as a single array parameter. The statement is server-side prepared
+    so its plan is reused across calls on the same connection.
+
+    Args:
+        conn: An open psycopg connection
+        query: The search query (normalized with build_tsquery)
+        chunk_ids: Ids of the candidate chunks to score
+        limit: Maximum number of scored chunks to return
+
+    Returns:
+        List of (chunk_id, bm25_score) for candidates matching the query,
+        best first. Candidates that don't match are omitted.
+    """
+    if not chunk_ids:
+        return []
+
+    cur = conn.execute(
+        f"""
+        WITH query AS (
+            SELECT to_tsquery('simple', %s) AS q
+        )
+        SELECT c.id, ts_rank_cd(c.content_tsv, query.q, {TS_RANK_NORMALIZATION}) AS bm25_score
+        FROM chunks c, query
+        WHERE c.id = ANY(%s::uuid[])
+          AND c.content_tsv @@ query.q
+        ORDER BY bm25_score DESC
+        LIMIT %s
+        """,
+        (build_tsquery(query), chunk_ids, limit),
+        prepare=True,
+    )
+    return [(str(chunk_id), float(score or 0.0)) for chunk_id, score in cur.fetchall()]
@@ -21,20 +21,30 @@ Language-specific handling:
 
 from __future__ import annotations
 
+import contextlib
+import functools
 import hashlib
+import os
 import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Generator
+from typing import Callable, Iterator
 
 import psycopg
+from psycopg.rows import kwargs_row
 import tree_sitter_go
 import tree_sitter_java
 import tree_sitter_javascript
 import tree_sitter_python
 import tree_sitter_rust
 import tree_sitter_typescript
-from tree_sitter import Language, Parser, Node
+from tree_sitter import Language, Node, Query
+
+import parse_cache
+from syntax_tree import build_capture_query, capture_nodes, create_parser, walk
 
 
 def generate_repo_id(repo_url: str) -> str:
@@ -47,7 +57,7 @@ def generate_repo_id(repo_url: str) -> str:
 # =============================================================================
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FunctionCall:
     """Represents a function or method call extracted from the AST."""
 
@@ -67,7 +77,7 @@ class FunctionCall:
     is_dynamic: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FunctionDefinition:
     """Represents a function or method definition in a chunk."""
 
@@ -87,7 +97,7 @@ class FunctionDefinition:
     file_path: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class CallEdge:
     """An edge in the call graph from caller to callee."""
 
@@ -112,11 +122,38 @@ class CallEdge:
 # =============================================================================
 
 
+# Grammar bindings return raw PyCapsule pointers, which are wrapped with
+# Language() once here for use by Parser and Query.
+#
+# JavaScript and TypeScript configs, each shared by several extensions so they
+# also share one grammar, parser and set of compiled queries
+_JS_CALL_CONFIG = {
+    "language": Language(tree_sitter_javascript.language()),
+    "call_types": ["call_expression"],
+    "member_expression_type": "member_expression",
+    "identifier_type": "identifier",
+    "function_types": ["function_declaration", "arrow_function", "function_expression"],
+    "class_types": ["class_declaration", "class"],
+    "method_types": ["method_definition"],
+    "this_keywords": ["this"],
+}
+
+_TS_CALL_CONFIG = {
+    "language": Language(tree_sitter_typescript.language_typescript()),
+    "call_types": ["call_expression"],
+    "member_expression_type": "member_expression",
+    "identifier_type": "identifier",
+    "function_types": ["function_declaration", "arrow_function", "function_expression"],
+    "class_types": ["class_declaration"],
+    "method_types": ["method_definition", "public_field_definition"],
+    "this_keywords": ["this"],
+}
+
 # Node types for function calls by language
 CALL_CONFIG: dict[str, dict] = {
     # Python
     ".py": {
-        "language": tree_sitter_python.language(),
+        "language": Language(tree_sitter_python.language()),
         "call_types": ["call"],
         "member_expression_type": "attribute",  # Python uses "attribute" for obj.attr
         "identifier_type": "identifier",
@@ -127,69 +164,16 @@ CALL_CONFIG: dict[str, dict] = {
         "super_keyword": "super",  # Python's super() for MRO calls
     },
     # JavaScript
-    ".js": {
-        "language": tree_sitter_javascript.language(),
-        "call_types": ["call_expression"],
-        "member_expression_type": "member_expression",
-        "identifier_type": "identifier",
-        "function_types": ["function_declaration", "arrow_function", "function_expression"],
-        "class_types": ["class_declaration", "class"],
-        "method_types": ["method_definition"],
-        "this_keywords": ["this"],
-    },
-    ".jsx": {
-        "language": tree_sitter_javascript.language(),
-        "call_types": ["call_expression"],
-        "member_expression_type": "member_expression",
-        "identifier_type": "identifier",
-        "function_types": ["function_declaration", "arrow_function", "function_expression"],
-        "class_types": ["class_declaration", "class"],
-        "method_types": ["method_definition"],
-        "this_keywords": ["this"],
-    },
-    ".ts": {
-        "language": tree_sitter_typescript.language_typescript(),
-        "call_types": ["call_expression"],
-        "member_expression_type": "member_expression",
-        "identifier_type": "identifier",
-        "function_types": ["function_declaration", "arrow_function", "function_expression"],
-        "class_types": ["class_declaration"],
-        "method_types": ["method_definition", "public_field_definition"],
-        "this_keywords": ["this"],
-    },
-    ".tsx": {
-        "language": tree_sitter_typescript.language_tsx(),
-        "call_types": ["call_expression"],
-        "member_expression_type": "member_expression",
-        "identifier_type": "identifier",
-        "function_types": ["function_declaration", "arrow_function", "function_expression"],
-        "class_types": ["class_declaration"],
-        "method_types": ["method_definition", "public_field_definition"],
-        "this_keywords": ["this"],
-    },
-    ".mjs": {
-        "language": tree_sitter_javascript.language(),
-        "call_types": ["call_expression"],
-        "member_expression_type": "member_expression",
-        "identifier_type": "identifier",
-        "function_types": ["function_declaration", "arrow_function", "function_expression"],
-        "class_types": ["class_declaration", "class"],
-        "method_types": ["method_definition"],
-        "this_keywords": ["this"],
-    },
-    ".mts": {
-        "language": tree_sitter_typescript.language_typescript(),
-        "call_types": ["call_expression"],
-        "member_expression_type": "member_expression",
-        "identifier_type": "identifier",
-        "function_types": ["function_declaration", "arrow_function", "function_expression"],
-        "class_types": ["class_declaration"],
-        "method_types": ["method_definition", "public_field_definition"],
-        "this_keywords": ["this"],
-    },
+    ".js": _JS_CALL_CONFIG,
+    ".jsx": _JS_CALL_CONFIG,
+    ".mjs": _JS_CALL_CONFIG,
+    # TypeScript; TSX differs only in its grammar
+    ".ts": _TS_CALL_CONFIG,
+    ".mts": _TS_CALL_CONFIG,
+    ".tsx": {**_TS_CALL_CONFIG, "language": Language(tree_sitter_typescript.language_tsx())},
     # Go
     ".go": {
-        "language": tree_sitter_go.language(),
+        "language": Language(tree_sitter_go.language()),
         "call_types": ["call_expression"],
         "member_expression_type": "selector_expression",  # Go uses selector_expression for obj.method
         "identifier_type": "identifier",
@@ -201,7 +185,7 @@ CALL_CONFIG: dict[str, dict] = {
     },
     # Java
     ".java": {
-        "language": tree_sitter_java.language(),
+        "language": Language(tree_sitter_java.language()),
         "call_types": ["method_invocation"],  # Java uses method_invocation
         "member_expression_type": "field_access",  # Java field access
         "identifier_type": "identifier",
@@ -213,7 +197,7 @@ CALL_CONFIG: dict[str, dict] = {
     },
     # Rust
     ".rs": {
-        "language": tree_sitter_rust.language(),
+        "language": Language(tree_sitter_rust.language()),
         "call_types": ["call_expression"],
         "member_expression_type": "field_expression",  # Rust uses field_expression for obj.method
         "identifier_type": "identifier",
@@ -226,16 +210,63 @@ CALL_CONFIG: dict[str, dict] = {
     },
 }
 
+# Node-type lists are only ever tested for membership, so freeze them once at
+# import. The sorted tuples are the precomputed capture query keys.
+_NODE_TYPE_KEYS = (
+    "call_types", "function_types", "class_types", "method_types",
+    "this_keywords", "interface_types", "trait_types", "impl_types",
+)
+
+for _config in CALL_CONFIG.values():
+    for _key in _NODE_TYPE_KEYS:
+        if _key in _config:
+            _config[_key] = frozenset(_config[_key])
+    # Receivers are checked against the keywords as raw node bytes, so only
+    # receivers that are kept get decoded
+    _config["this_bytes"] = frozenset(kw.encode() for kw in _config["this_keywords"])
+    _config["call_query_types"] = tuple(sorted(_config["call_types"]))
+    _config["definition_query_types"] = tuple(sorted(
+        _config["class_types"] | _config["method_types"] | _config["function_types"]
+    ))
+
+
+@functools.lru_cache(maxsize=4096)
+def _file_suffix(filename: str) -> str:
+    """Lowercased extension of a file, memoized since every chunk of a file asks again."""
+    return Path(filename).suffix.lower()
+
 
 def get_call_config(filename: str) -> dict | None:
     """Get the call extraction configuration for a file based on its extension."""
-    ext = Path(filename).suffix.lower()
-    return CALL_CONFIG.get(ext)
+    return CALL_CONFIG.get(_file_suffix(filename))
 
 
 def is_supported_language(filename: str) -> bool:
     """Check if a file is a supported language for call graph extraction."""
-    return get_call_config(filename) is not None
+    return _file_suffix(filename) in CALL_CONFIG
+
+
+# =============================================================================
+# Tree-sitter Parsers and Queries
+# =============================================================================
+
+
+# Compiled capture queries, keyed by (id of the grammar, node types captured)
+_CAPTURE_QUERIES: dict[tuple[int, tuple[str, ...]], Query | None] = {}
+
+
+def _capture_query(language: Language, node_types: tuple[str, ...]) -> Query | None:
+    """
+    Get the compiled query capturing every node of the given types, building it on first use.
+
+    The query engine walks the tree in C and hands back only the matching nodes,
+    instead of the extractors visiting every node from Python. Returns None if
+    the query can't be built, in which case callers fall back to a Python walk.
+    """
+    key = (id(language), node_types)
+    if key not in _CAPTURE_QUERIES:
+        _CAPTURE_QUERIES[key] = build_capture_query(language, node_types)
+    return _CAPTURE_QUERIES[key]
 
 
 # =============================================================================
@@ -243,24 +274,45 @@ def is_supported_language(filename: str) -> bool:
 # =============================================================================
 
 
+# Decoded identifier text, pooled so the names that recur across a repository
+# (log, get, push, setState, ...) share one string object. Cleared when full to
+# bound memory in long-running processes.
+_STR_POOL: dict[str, str] = {}
+_STR_POOL_MAX = 1 << 18
+
+
+def _node_text(node: Node) -> str:
+    """Decode a node's text, returning the pooled copy of the string."""
+    text = node.text
+    if not text:
+        return ""
+    value = text.decode("utf-8")
+    pooled = _STR_POOL.get(value)
+    if pooled is None:
+        if len(_STR_POOL) >= _STR_POOL_MAX:
+            _STR_POOL.clear()
+        _STR_POOL[value] = pooled = value
+    return pooled
+
+
 def _is_python_file(filename: str) -> bool:
     """Check if a file is a Python file."""
-    return Path(filename).suffix.lower() == ".py"
+    return _file_suffix(filename) == ".py"
 
 
 def _is_go_file(filename: str) -> bool:
     """Check if a file is a Go file."""
-    return Path(filename).suffix.lower() == ".go"
+    return _file_suffix(filename) == ".go"
 
 
 def _is_java_file(filename: str) -> bool:
     """Check if a file is a Java file."""
-    return Path(filename).suffix.lower() == ".java"
+    return _file_suffix(filename) == ".java"
 
 
 def _is_rust_file(filename: str) -> bool:
     """Check if a file is a Rust file."""
-    return Path(filename).suffix.lower() == ".rs"
+    return _file_suffix(filename) == ".rs"
 
 
 def _extract_python_callee_info(call_node: Node, config: dict) -> FunctionCall | None:
@@ -289,7 +341,7 @@ def _extract_python_callee_info(call_node: Node, config: dict) -> FunctionCall |
 
     # Case 1: Direct function call - func()
     if function_node.type == "identifier":
-        callee_name = function_node.text.decode("utf-8") if function_node.text else ""
+        callee_name = _node_text(function_node)
         if callee_name:
             # Check for super() call - it's a special dynamic pattern
             if callee_name == "super":
@@ -323,21 +375,19 @@ def _extract_python_callee_info(call_node: Node, config: dict) -> FunctionCall |
                 attribute_node = children[-1]
 
         if attribute_node is not None:
-            callee_name = attribute_node.text.decode("utf-8") if attribute_node.text else ""
+            callee_name = _node_text(attribute_node)
             receiver = None
             is_dynamic = False
 
             if object_node is not None:
-                receiver_text = object_node.text.decode("utf-8") if object_node.text else ""
-
                 # Check for self/cls keywords (Python's equivalent of "this")
-                if receiver_text in config.get("this_keywords", ["self", "cls"]):
+                if object_node.text in config["this_bytes"]:
                     receiver = "self"  # Normalize to "self" for storage
                 # Check for super() result
                 elif object_node.type == "call":
                     # Check if it's super() call
                     super_func = object_node.child_by_field_name("function")
-                    if super_func and super_func.text and super_func.text.decode("utf-8") == "super":
+                    if super_func and super_func.text == b"super":
                         receiver = "super"
                         is_dynamic = True  # super().method() resolution depends on MRO
                     else:
@@ -345,7 +395,7 @@ def _extract_python_callee_info(call_node: Node, config: dict) -> FunctionCall |
                         is_dynamic = True
                 # Check for identifier (variable or class name)
                 elif object_node.type == "identifier":
-                    receiver = receiver_text
+                    receiver = _node_text(object_node)
                 # Check for nested attribute access like obj.prop.method()
                 elif object_node.type == "attribute":
                     # Get the root object
@@ -366,12 +416,11 @@ def _extract_python_callee_info(call_node: Node, config: dict) -> FunctionCall |
                         root_obj = list(root_obj.children)[0]
 
                     if root_obj:
-                        root_text = root_obj.text.decode("utf-8") if root_obj.text else None
                         # Check if root is self/cls
-                        if root_text in config.get("this_keywords", ["self", "cls"]):
+                        if root_obj.text in config["this_bytes"]:
                             receiver = "self"
                         else:
-                            receiver = root_text
+                            receiver = _node_text(root_obj) or None
                 else:
                     # Dynamic receiver we can't resolve
                     receiver = "<dynamic>"
@@ -428,7 +477,7 @@ def _extract_go_callee_info(call_node: Node, config: dict) -> FunctionCall | Non
 
     # Case 1: Direct function call - funcName()
     if function_node.type == config["identifier_type"]:
-        callee_name = function_node.text.decode("utf-8") if function_node.text else ""
+        callee_name = _node_text(function_node)
         if callee_name:
             return FunctionCall(
                 callee_name=callee_name,
@@ -451,16 +500,14 @@ def _extract_go_callee_info(call_node: Node, config: dict) -> FunctionCall | Non
                 field_node = children[-1]
 
         if field_node is not None:
-            callee_name = field_node.text.decode("utf-8") if field_node.text else ""
+            callee_name = _node_text(field_node)
             receiver = None
             is_dynamic = False
 
             if operand_node is not None:
-                receiver_text = operand_node.text.decode("utf-8") if operand_node.text else ""
-
                 # Check for identifier (variable, package, or type name)
                 if operand_node.type == config["identifier_type"]:
-                    receiver = receiver_text
+                    receiver = _node_text(operand_node)
                 # Check for chained calls like obj.GetService().Method()
                 elif operand_node.type == "call_expression":
                     receiver = "<call_result>"
@@ -485,7 +532,7 @@ def _extract_go_callee_info(call_node: Node, config: dict) -> FunctionCall | Non
                         root_obj = list(root_obj.children)[0]
 
                     if root_obj:
-                        receiver = root_obj.text.decode("utf-8") if root_obj.text else None
+                        receiver = _node_text(root_obj) or None
                 # Type assertion or conversion: obj.(Type).Method()
                 elif operand_node.type == "type_assertion_expression":
                     receiver = "<type_assertion>"
@@ -544,7 +591,7 @@ def _extract_java_callee_info(call_node: Node, config: dict) -> FunctionCall | N
     if name_node is None:
         return None
 
-    callee_name = name_node.text.decode("utf-8") if name_node.text else ""
+    callee_name = _node_text(name_node)
     if not callee_name:
         return None
 
@@ -561,8 +608,6 @@ def _extract_java_callee_info(call_node: Node, config: dict) -> FunctionCall | N
     receiver = None
     is_dynamic = False
 
-    receiver_text = object_node.text.decode("utf-8") if object_node.text else ""
-
     # Check for "this" keyword
     if object_node.type == "this":
         receiver = "this"
@@ -572,7 +617,7 @@ def _extract_java_callee_info(call_node: Node, config: dict) -> FunctionCall | N
         is_dynamic = True  # super.method() resolution depends on inheritance hierarchy
     # Check for identifier (variable or class name)
     elif object_node.type == "identifier":
-        receiver = receiver_text
+        receiver = _node_text(object_node)
     # Check for chained method calls like obj.getService().method()
     elif object_node.type == "method_invocation":
         receiver = "<call_result>"
@@ -592,7 +637,7 @@ def _extract_java_callee_info(call_node: Node, config: dict) -> FunctionCall | N
             root_obj = child_obj
 
         if root_obj:
-            root_text = root_obj.text.decode("utf-8") if root_obj.text else None
+            root_text = _node_text(root_obj) or None
             if root_obj.type == "this":
                 receiver = "this"
             elif root_obj.type == "identifier":
@@ -649,7 +694,7 @@ def _extract_rust_callee_info(call_node: Node, config: dict) -> FunctionCall | N
 
     # Case 1: Direct function call - func_name()
     if function_node.type == config["identifier_type"]:
-        callee_name = function_node.text.decode("utf-8") if function_node.text else ""
+        callee_name = _node_text(function_node)
         if callee_name:
             return FunctionCall(
                 callee_name=callee_name,
@@ -671,11 +716,11 @@ def _extract_rust_callee_info(call_node: Node, config: dict) -> FunctionCall | N
                 name_node = children[-1]
 
         if name_node is not None:
-            callee_name = name_node.text.decode("utf-8") if name_node.text else ""
+            callee_name = _node_text(name_node)
             receiver = None
 
             if path_node is not None:
-                receiver = path_node.text.decode("utf-8") if path_node.text else None
+                receiver = _node_text(path_node) or None
 
             if callee_name:
                 return FunctionCall(
@@ -699,19 +744,17 @@ def _extract_rust_callee_info(call_node: Node, config: dict) -> FunctionCall | N
                 field_node = children[-1]
 
         if field_node is not None:
-            callee_name = field_node.text.decode("utf-8") if field_node.text else ""
+            callee_name = _node_text(field_node)
             receiver = None
             is_dynamic = False
 
             if value_node is not None:
-                receiver_text = value_node.text.decode("utf-8") if value_node.text else ""
-
                 # Check for "self" keyword (Rust's equivalent of this)
-                if value_node.type == "self" or receiver_text == "self":
+                if value_node.type == "self" or value_node.text == b"self":
                     receiver = "self"
                 # Check for identifier (variable or type)
                 elif value_node.type == config["identifier_type"]:
-                    receiver = receiver_text
+                    receiver = _node_text(value_node)
                 # Check for chained calls like obj.get_service().method()
                 elif value_node.type == "call_expression":
                     receiver = "<call_result>"
@@ -736,11 +779,10 @@ def _extract_rust_callee_info(call_node: Node, config: dict) -> FunctionCall | N
                         root_obj = list(root_obj.children)[0]
 
                     if root_obj:
-                        root_text = root_obj.text.decode("utf-8") if root_obj.text else None
-                        if root_obj.type == "self" or root_text == "self":
+                        if root_obj.type == "self" or root_obj.text == b"self":
                             receiver = "self"
                         else:
-                            receiver = root_text
+                            receiver = _node_text(root_obj) or None
                 # Reference or dereference: &obj or *obj
                 elif value_node.type in ["reference_expression", "dereference_expression"]:
                     # Extract inner value
@@ -748,7 +790,7 @@ def _extract_rust_callee_info(call_node: Node, config: dict) -> FunctionCall | N
                     if inner and inner.type == "self":
                         receiver = "self"
                     elif inner:
-                        receiver = inner.text.decode("utf-8") if inner.text else "<dynamic>"
+                        receiver = _node_text(inner) or "<dynamic>"
                     else:
                         receiver = "<dynamic>"
                         is_dynamic = True
@@ -792,7 +834,7 @@ def _extract_rust_callee_info(call_node: Node, config: dict) -> FunctionCall | N
         if func_name_node is not None:
             # Recursively extract from the inner function reference
             if func_name_node.type == "identifier":
-                callee_name = func_name_node.text.decode("utf-8") if func_name_node.text else ""
+                callee_name = _node_text(func_name_node)
                 if callee_name:
                     return FunctionCall(
                         callee_name=callee_name,
@@ -804,8 +846,8 @@ def _extract_rust_callee_info(call_node: Node, config: dict) -> FunctionCall | N
                 name_node = func_name_node.child_by_field_name("name")
                 path_node = func_name_node.child_by_field_name("path")
                 if name_node:
-                    callee_name = name_node.text.decode("utf-8") if name_node.text else ""
-                    receiver = path_node.text.decode("utf-8") if path_node and path_node.text else None
+                    callee_name = _node_text(name_node)
+                    receiver = (_node_text(path_node) or None) if path_node else None
                     if callee_name:
                         return FunctionCall(
                             callee_name=callee_name,
@@ -837,7 +879,7 @@ def _extract_js_ts_callee_info(call_node: Node, config: dict) -> FunctionCall |
 
     # Case 1: Direct function call - func()
     if function_node.type == config["identifier_type"]:
-        callee_name = function_node.text.decode("utf-8") if function_node.text else ""
+        callee_name = _node_text(function_node)
         if callee_name:
             return FunctionCall(
                 callee_name=callee_name,
@@ -861,19 +903,17 @@ def _extract_js_ts_callee_info(call_node: Node, config: dict) -> FunctionCall |
                 property_node = children[-1]
 
         if property_node is not None:
-            callee_name = property_node.text.decode("utf-8") if property_node.text else ""
+            callee_name = _node_text(property_node)
             receiver = None
             is_dynamic = False
 
             if object_node is not None:
-                receiver_text = object_node.text.decode("utf-8") if object_node.text else ""
-
                 # Check for "this" keyword
-                if receiver_text in config.get("this_keywords", ["this"]):
+                if object_node.text in config["this_bytes"]:
                     receiver = "this"
                 # Check for identifier (variable or class name)
                 elif object_node.type == config["identifier_type"]:
-                    receiver = receiver_text
+                    receiver = _node_text(object_node)
                 # Check for chained calls like obj.getService().method()
                 elif object_node.type == "call_expression":
                     receiver = "<call_result>"
@@ -898,7 +938,7 @@ def _extract_js_ts_callee_info(call_node: Node, config: dict) -> FunctionCall |
                         root_obj = list(root_obj.children)[0]
 
                     if root_obj:
-                        receiver = root_obj.text.decode("utf-8") if root_obj.text else None
+                        receiver = _node_text(root_obj) or None
                 else:
                     # Dynamic receiver we can't resolve
                     receiver = "<dynamic>"
@@ -952,8 +992,7 @@ def extract_calls_from_code(
     source_bytes = content.encode("utf-8")
     language = config["language"]
 
-    parser = Parser(language)
-    tree = parser.parse(source_bytes)
+    tree = create_parser(language).parse(source_bytes)
 
     calls: list[FunctionCall] = []
 
@@ -976,17 +1015,21 @@ def extract_calls_from_code(
         else:
             return _extract_js_ts_callee_info(call_node, config)
 
-    def traverse(node: Node) -> None:
-        """Recursively traverse the AST and collect calls."""
-        if node.type in config["call_types"]:
+    query = _capture_query(language, config["call_query_types"])
+    if query is not None:
+        for node in capture_nodes(query, tree.root_node):
             call_info = extract_callee_info(node)
             if call_info:
                 calls.append(call_info)
+        return calls
 
-        for child in node.children:
-            traverse(child)
+    call_types = config["call_types"]
+    for node in walk(tree.root_node):
+        if node.type in call_types:
+            call_info = extract_callee_info(node)
+            if call_info:
+                calls.append(call_info)
 
-    traverse(tree.root_node)
     return calls
 
 
@@ -1015,8 +1058,7 @@ def extract_definitions_from_code(
     source_bytes = content.encode("utf-8")
     language = config["language"]
 
-    parser = Parser(language)
-    tree = parser.parse(source_bytes)
+    tree = create_parser(language).parse(source_bytes)
 
     definitions: list[FunctionDefinition] = []
 
@@ -1024,20 +1066,11 @@ def extract_definitions_from_code(
         """Extract the name from a function/method node."""
         name_node = node.child_by_field_name("name")
         if name_node:
-            return name_node.text.decode("utf-8") if name_node.text else None
+            return _node_text(name_node) or None
         return None
 
-    def traverse(node: Node, current_class: str | None = None) -> None:
-        """Recursively traverse the AST and collect definitions."""
-        # Check for class definitions
-        if node.type in config["class_types"]:
-            class_name = get_name(node)
-            # Traverse class body with class context
-            for child in node.children:
-                traverse(child, current_class=class_name)
-            return
-
-        # Check for method definitions (inside a class)
+    def add_definition(node: Node, current_class: str | None) -> None:
+        """Record node as a method (inside a named class) or standalone function."""
         if node.type in config["method_types"] and current_class:
             name = get_name(node)
             if name:
@@ -1047,8 +1080,6 @@ def extract_definitions_from_code(
                     is_method=True,
                     file_path=filename,
                 ))
-
-        # Check for standalone function definitions
         elif node.type in config["function_types"]:
             name = get_name(node)
             if name:
@@ -1059,31 +1090,294 @@ def extract_definitions_from_code(
                     file_path=filename,
                 ))
 
-        # Continue traversal
-        for child in node.children:
-            traverse(child, current_class=current_class)
+    query = _capture_query(language, config["definition_query_types"])
+    if query is not None:
+        nodes = capture_nodes(query, tree.root_node)
+    else:
+        node_types = frozenset(config["definition_query_types"])
+        nodes = [node for node in walk(tree.root_node) if node.type in node_types]
+
+    # The class context falls out of node nesting: (end_byte, name) of each
+    # enclosing class, innermost last
+    classes: list[tuple[int, str | None]] = []
+    for node in nodes:
+        while classes and node.start_byte >= classes[-1][0]:
+            classes.pop()
+        if node.type in config["class_types"]:
+            classes.append((node.end_byte, get_name(node)))
+        else:
+            add_definition(node, classes[-1][1] if classes else None)
 
-    traverse(tree.root_node)
     return definitions
 
 
+# Chunks sent to a worker per IPC round trip when extracting calls in parallel
+CALL_EXTRACTION_CHUNKSIZE = 32
+
+# Below this many chunks, starting worker processes costs more than it saves
+_PARALLEL_MIN_ITEMS = 2 * CALL_EXTRACTION_CHUNKSIZE
+
+
+# Path to a SQLite file caching extracted calls across runs; empty disables the cache
+CALL_GRAPH_CACHE_PATH = os.environ.get("CALL_GRAPH_CACHE_PATH", "")
+
+# Bump when FunctionCall or the extraction logic changes shape so old entries are ignored
+_CALL_CACHE_FORMAT = 1
+_CALL_CACHE_NAMESPACE = f"calls/{_CALL_CACHE_FORMAT}"
+
+
+def _cache_key(content: str, filename: str) -> tuple[str, str]:
+    """(content hash, extension) cache key; calls don't depend on the rest of the path."""
+    return parse_cache.content_hash(content.encode("utf-8")), _file_suffix(filename)
+
+
+def _extract_calls_worker(item: tuple[str, str]) -> list[FunctionCall]:
+    """Extract calls from a single (content, filename) pair inside a worker process."""
+    content, filename = item
+    return extract_calls_from_code(content, filename)
+
+
+@contextlib.contextmanager
+def _extracting_calls(
+    items: list[tuple[str, str]],
+    max_workers: int | None = None,
+    chunksize: int = CALL_EXTRACTION_CHUNKSIZE,
+) -> Iterator[Callable[[], list[list[FunctionCall]]]]:
+    """
+    Start extracting calls for extract_calls_batch, yielding a function that waits for the results.
+
+    Large batches are submitted to a process pool before the block runs, so the
+    caller can do other work while the workers parse. The pool is started from
+    the calling thread and no helper thread is involved: on Linux workers are
+    forked, and forking a multi-threaded parent can leave a child waiting on a
+    lock another thread held. Small batches are extracted inline when the
+    results are asked for.
+    """
+    keys = [_cache_key(content, filename) for content, filename in items]
+    results = parse_cache.cache_lookup(CALL_GRAPH_CACHE_PATH, _CALL_CACHE_NAMESPACE, keys)
+
+    # Each distinct missing chunk is extracted once, even if it repeats in the batch
+    missing = {key: item for key, item in zip(keys, items) if key not in results}
+    missing_items = list(missing.values())
+
+    with contextlib.ExitStack() as stack:
+        pending: Iterator[list[FunctionCall]] | None = None
+        if len(missing_items) >= _PARALLEL_MIN_ITEMS and max_workers != 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=max_workers))
+            # map() submits every item up front; results are read in order later
+            pending = executor.map(_extract_calls_worker, missing_items, chunksize=max(chunksize, 1))
+
+        def collect() -> list[list[FunctionCall]]:
+            if pending is None:
+                extracted_calls = [_extract_calls_worker(item) for item in missing_items]
+            else:
+                extracted_calls = list(pending)
+            extracted = dict(zip(missing, extracted_calls))
+            parse_cache.cache_store(CALL_GRAPH_CACHE_PATH, _CALL_CACHE_NAMESPACE, extracted)
+            results.update(extracted)
+            return [results[key] for key in keys]
+
+        yield collect
+
+
+def extract_calls_batch(
+    items: list[tuple[str, str]],
+    max_workers: int | None = None,
+    chunksize: int = CALL_EXTRACTION_CHUNKSIZE,
+) -> list[list[FunctionCall]]:
+    """
+    Extract calls from many chunks, fanning out to worker processes.
+
+    Extraction is a pure function of (content, filename) and CPU-bound, so
+    large batches are spread over a process pool; each worker reuses its
+    cached parsers and queries for every chunk it receives. Small batches
+    are processed inline.
+
+    Chunks with the same content and extension (vendored copies, license
+    headers, generated code) are extracted once and share a result list.
+    When CALL_GRAPH_CACHE_PATH is set, results are also cached on disk by
+    content hash and extension, so chunks unchanged since an earlier run
+    aren't parsed again.
+
+    Args:
+        items: (content, filename) pairs
+        max_workers: Number of worker processes (defaults to os.cpu_count())
+        chunksize: Items sent to a worker per IPC round trip
+
+    Returns:
+        One list of FunctionCall objects per item, in input order
+    """
+    with _extracting_calls(items, max_workers, chunksize) as collect:
+        return collect()
+
+
 # =============================================================================
 # Call Graph Builder
 # =============================================================================
 
 
-@dataclass
+# Very common built-in functions and methods that aren't defined in user code.
+# Calls to these are never resolved to a chunk.
+
+# JavaScript/TypeScript builtins
+_JS_BUILTINS = frozenset({
+    "console", "log", "error", "warn", "info", "debug",  # console methods
+    "require", "import", "export",  # module system
+    "setTimeout", "setInterval", "clearTimeout", "clearInterval",
+    "fetch", "JSON", "parse", "stringify",
+    "Array", "Object", "String", "Number", "Boolean", "Map", "Set",
+    "Promise", "resolve", "reject", "then", "catch", "finally",
+    "parseInt", "parseFloat", "isNaN", "isFinite",
+    "encodeURIComponent", "decodeURIComponent", "encodeURI", "decodeURI",
+    "Math", "Date", "RegExp", "Error",
+    "document", "window", "navigator", "location", "history",
+    "addEventListener", "removeEventListener", "querySelector", "querySelectorAll",
+    "createElement", "getElementById", "getElementsByClassName",
+})
+
+# Python builtins
+_PYTHON_BUILTINS = frozenset({
+    # Built-in functions
+    "print", "len", "range", "str", "int", "float", "bool", "list", "dict",
+    "tuple", "set", "frozenset", "bytes", "bytearray", "memoryview",
+    "type", "isinstance", "issubclass", "callable", "hasattr", "getattr",
+    "setattr", "delattr", "property", "classmethod", "staticmethod",
+    "super", "object", "id", "hash", "repr", "ascii", "bin", "hex", "oct",
+    "chr", "ord", "format", "vars", "dir", "help", "input",
+    "open", "file", "read", "write", "close", "readline", "readlines",
+    "abs", "divmod", "pow", "round", "min", "max", "sum", "sorted", "reversed",
+    "enumerate", "zip", "map", "filter", "reduce", "any", "all", "next", "iter",
+    "slice", "complex", "eval", "exec", "compile", "globals", "locals",
+    "breakpoint", "exit", "quit",
+    # Common methods on built-in types
+    "append", "extend", "insert", "remove", "pop", "clear", "index", "count",
+    "sort", "copy", "keys", "values", "items", "get", "update", "setdefault",
+    "split", "join", "strip", "lstrip", "rstrip", "replace", "find", "rfind",
+    "startswith", "endswith", "upper", "lower", "title", "capitalize",
+    "format", "encode", "decode",
+    # Exception handling
+    "raise", "Exception", "BaseException", "ValueError", "TypeError",
+    "KeyError", "IndexError", "AttributeError", "ImportError", "RuntimeError",
+    # Common stdlib functions (often called without module prefix)
+    "sleep", "time", "datetime", "path", "exists", "join", "makedirs",
+})
+
+# Go builtins
+_GO_BUILTINS = frozenset({
+    # Built-in functions
+    "append", "cap", "close", "complex", "copy", "delete", "imag", "len",
+    "make", "new", "panic", "print", "println", "real", "recover",
+    # Common fmt package functions (often used with package prefix)
+    "Println", "Printf", "Print", "Sprintf", "Fprintf", "Errorf",
+    "Scan", "Scanf", "Scanln", "Sscan", "Sscanf",
+    # Common io methods
+    "Read", "Write", "Close", "Seek", "ReadAll", "WriteString",
+    # Error handling
+    "Error", "Unwrap", "Is", "As",
+    # Context methods
+    "Background", "TODO", "WithCancel", "WithTimeout", "WithDeadline", "WithValue",
+    # Common string/bytes methods
+    "String", "Bytes", "Len", "Cap",
+    # Type conversions (often appear as function calls)
+    "int", "int8", "int16", "int32", "int64",
+    "uint", "uint8", "uint16", "uint32", "uint64",
+    "float32", "float64", "complex64", "complex128",
+    "string", "bool", "byte", "rune",
+})
+
+# Java builtins
+_JAVA_BUILTINS = frozenset({
+    # Object methods (inherited by all classes)
+    "toString", "equals", "hashCode", "getClass", "clone", "finalize",
+    "notify", "notifyAll", "wait",
+    # System methods
+    "println", "print", "printf", "format", "exit", "gc",
+    "currentTimeMillis", "nanoTime", "arraycopy",
+    # String methods
+    "length", "charAt", "substring", "indexOf", "lastIndexOf",
+    "startsWith", "endsWith", "contains", "replace", "replaceAll",
+    "split", "trim", "toLowerCase", "toUpperCase", "isEmpty", "isBlank",
+    "valueOf", "compareTo", "concat", "matches",
+    # Collection methods
+    "add", "remove", "get", "set", "size", "isEmpty", "contains",
+    "clear", "iterator", "toArray", "addAll", "removeAll", "retainAll",
+    "put", "containsKey", "containsValue", "keySet", "values", "entrySet",
+    # Stream methods
+    "stream", "filter", "map", "flatMap", "reduce", "collect",
+    "forEach", "findFirst", "findAny", "anyMatch", "allMatch", "noneMatch",
+    "sorted", "distinct", "limit", "skip", "count",
+    # Optional methods
+    "of", "ofNullable", "empty", "isPresent", "ifPresent", "orElse", "orElseGet",
+    # Common utility methods
+    "parseInt", "parseDouble", "parseFloat", "parseLong",
+    "intValue", "doubleValue", "floatValue", "longValue",
+    # Exception/error methods
+    "getMessage", "printStackTrace", "getCause", "initCause",
+})
+
+# Rust builtins
+_RUST_BUILTINS = frozenset({
+    # Macros (often captured as function calls)
+    "println", "print", "eprintln", "eprint", "format", "panic",
+    "assert", "assert_eq", "assert_ne", "debug_assert",
+    "vec", "format_args", "write", "writeln",
+    # Option methods
+    "Some", "None", "unwrap", "unwrap_or", "unwrap_or_else", "unwrap_or_default",
+    "expect", "is_some", "is_none", "map", "map_or", "map_or_else",
+    "and_then", "or_else", "ok_or", "ok_or_else", "take", "replace",
+    # Result methods
+    "Ok", "Err", "is_ok", "is_err", "ok", "err",
+    # Iterator methods
+    "iter", "iter_mut", "into_iter", "next", "collect", "filter", "map",
+    "fold", "reduce", "for_each", "enumerate", "zip", "chain",
+    "take", "skip", "peekable", "flatten", "flat_map",
+    "any", "all", "find", "position", "count", "sum", "product",
+    "min", "max", "min_by", "max_by", "cloned", "copied",
+    # Vec methods
+    "push", "pop", "len", "is_empty", "capacity", "reserve",
+    "clear", "insert", "remove", "swap_remove", "retain",
+    "first", "last", "get", "get_mut",
+    # String methods
+    "to_string", "to_owned", "as_str", "as_bytes", "chars", "bytes",
+    "trim", "trim_start", "trim_end", "split", "split_whitespace",
+    "contains", "starts_with", "ends_with", "replace", "to_lowercase", "to_uppercase",
+    # Common trait methods
+    "clone", "default", "from", "into", "try_from", "try_into",
+    "as_ref", "as_mut", "borrow", "borrow_mut",
+    "deref", "deref_mut", "drop",
+    # Smart pointer methods
+    "new", "lock", "read", "write", "try_lock", "try_read", "try_write",
+    # Async methods
+    "await", "poll",
+})
+
+_BUILTIN_NAMES = _JS_BUILTINS | _PYTHON_BUILTINS | _GO_BUILTINS | _JAVA_BUILTINS | _RUST_BUILTINS
+
+
+@dataclass(slots=True, frozen=True)
 class ChunkInfo:
     """Information about a code chunk from the database."""
     chunk_id: str
     file_path: str
     content: str
-    symbol_names: list[str]
+    symbol_names: tuple[str, ...]
     line_start: int
     line_end: int
     chunk_type: str | None
 
 
+def _chunk_info_row(**row) -> ChunkInfo:
+    """
+    Build a ChunkInfo from a chunks row.
+
+    Each row arrives with its own copies of common names (constructor,
+    __init__, get, ...); they're interned so every chunk shares one object
+    and membership tests against symbol_names hit the identity check.
+    """
+    row["symbol_names"] = tuple(map(sys.intern, row["symbol_names"]))
+    return ChunkInfo(**row)
+
+
 class CallGraphBuilder:
     """
     Builds and stores the call graph for a repository.
@@ -1100,59 +1394,91 @@ class CallGraphBuilder:
         self.repo_id = repo_id
         self.branch = branch
         self._chunks: list[ChunkInfo] | None = None
+        self._chunk_by_id: dict[str, ChunkInfo] = {}
+        self._chunks_by_file: dict[str, list[ChunkInfo]] = {}
         self._symbol_to_chunks: dict[str, list[str]] | None = None
+        self._sym_file_index: dict[tuple[str, str], list[str]] = {}
+        self._pair_index: dict[tuple[str, str], list[str]] = {}
 
     def _load_chunks(self) -> list[ChunkInfo]:
-        """Load all chunks for this repo/branch from the database."""
+        """Load all chunks for this repo/branch from the database, indexed by id and file."""
         if self._chunks is not None:
             return self._chunks
 
-        with self.conn.cursor() as cur:
+        chunks: list[ChunkInfo] = []
+        # Server-side cursor streaming rows straight into ChunkInfo, so the
+        # result set is never held as tuples alongside the dataclasses
+        with self.conn.cursor(name="call_graph_chunks", row_factory=kwargs_row(_chunk_info_row)) as cur:
+            cur.itersize = 2000
             cur.execute(
                 """
-                SELECT id, file_path, content, symbol_names, line_start, line_end, chunk_type
+                SELECT id::text AS chunk_id, file_path, content,
+                       COALESCE(symbol_names, '{}') AS symbol_names,
+                       line_start, line_end, chunk_type
                 FROM chunks
                 WHERE repo_id = %s AND branch = %s
                 """,
                 (self.repo_id, self.branch)
             )
-            rows = cur.fetchall()
-
-        self._chunks = []
-        for row in rows:
-            self._chunks.append(ChunkInfo(
-                chunk_id=str(row[0]),
-                file_path=row[1],
-                content=row[2],
-                symbol_names=row[3] or [],
-                line_start=row[4],
-                line_end=row[5],
-                chunk_type=row[6],
-            ))
-
-        return self._chunks
+            for chunk in cur:
+                chunks.append(chunk)
+                self._chunk_by_id[chunk.chunk_id] = chunk
+                self._chunks_by_file.setdefault(chunk.file_path, []).append(chunk)
+
+        self._chunks = chunks
+        return chunks
 
     def _build_symbol_index(self) -> dict[str, list[str]]:
-        """Build an index of symbol names to chunk IDs."""
+        """
+        Build an index of symbol names to chunk IDs.
+
+        Also fills self._sym_file_index, the same mapping keyed by
+        (symbol, file_path), used to prefer same-file targets.
+        """
         if self._symbol_to_chunks is not None:
             return self._symbol_to_chunks
 
         chunks = self._load_chunks()
-        self._symbol_to_chunks = {}
+        symbol_to_chunks: defaultdict[str, list[str]] = defaultdict(list)
+        sym_file_index: defaultdict[tuple[str, str], list[str]] = defaultdict(list)
 
         for chunk in chunks:
             for symbol in chunk.symbol_names:
-                if symbol not in self._symbol_to_chunks:
-                    self._symbol_to_chunks[symbol] = []
-                self._symbol_to_chunks[symbol].append(chunk.chunk_id)
+                symbol_to_chunks[symbol].append(chunk.chunk_id)
+                sym_file_index[(symbol, chunk.file_path)].append(chunk.chunk_id)
 
+        # Plain dicts, so lookups of unknown symbols can't insert empty lists
+        self._sym_file_index = dict(sym_file_index)
+        self._symbol_to_chunks = dict(symbol_to_chunks)
         return self._symbol_to_chunks
 
+    def _chunks_defining_both(
+        self,
+        receiver: str,
+        callee_name: str,
+        symbol_index: dict[str, list[str]]
+    ) -> list[str]:
+        """
+        IDs of chunks (in load order) defining both the receiver and callee symbols.
+
+        Memoized per (receiver, callee) pair: OO code repeats the same
+        receiver.method() pairs across many call sites. Only pairs that are
+        actually called are indexed, rather than every symbol pair of every chunk.
+        """
+        key = (receiver, callee_name)
+        chunk_ids = self._pair_index.get(key)
+        if chunk_ids is None:
+            chunk_ids = [
+                cid for cid in dict.fromkeys(symbol_index.get(receiver, ()))
+                if callee_name in self._chunk_by_id[cid].symbol_names
+            ]
+            self._pair_index[key] = chunk_ids
+        return chunk_ids
+
     def _resolve_call_target(
         self,
         call: FunctionCall,
         source_chunk: ChunkInfo,
-        chunks: list[ChunkInfo],
         symbol_index: dict[str, list[str]]
     ) -> str | None:
         """
@@ -1172,169 +1498,33 @@ class CallGraphBuilder:
         callee_name = call.callee_name
 
         # Skip very common built-in functions that aren't defined in user code
-        # JavaScript/TypeScript builtins
-        js_builtins = {
-            "console", "log", "error", "warn", "info", "debug",  # console methods
-            "require", "import", "export",  # module system
-            "setTimeout", "setInterval", "clearTimeout", "clearInterval",
-            "fetch", "JSON", "parse", "stringify",
-            "Array", "Object", "String", "Number", "Boolean", "Map", "Set",
-            "Promise", "resolve", "reject", "then", "catch", "finally",
-            "parseInt", "parseFloat", "isNaN", "isFinite",
-            "encodeURIComponent", "decodeURIComponent", "encodeURI", "decodeURI",
-            "Math", "Date", "RegExp", "Error",
-            "document", "window", "navigator", "location", "history",
-            "addEventListener", "removeEventListener", "querySelector", "querySelectorAll",
-            "createElement", "getElementById", "getElementsByClassName",
-        }
-
-        # Python builtins
-        python_builtins = {
-            # Built-in functions
-            "print", "len", "range", "str", "int", "float", "bool", "list", "dict",
-            "tuple", "set", "frozenset", "bytes", "bytearray", "memoryview",
-            "type", "isinstance", "issubclass", "callable", "hasattr", "getattr",
-            "setattr", "delattr", "property", "classmethod", "staticmethod",
-            "super", "object", "id", "hash", "repr", "ascii", "bin", "hex", "oct",
-            "chr", "ord", "format", "vars", "dir", "help", "input",
-            "open", "file", "read", "write", "close", "readline", "readlines",
-            "abs", "divmod", "pow", "round", "min", "max", "sum", "sorted", "reversed",
-            "enumerate", "zip", "map", "filter", "reduce", "any", "all", "next", "iter",
-            "slice", "complex", "eval", "exec", "compile", "globals", "locals",
-            "breakpoint", "exit", "quit",
-            # Common methods on built-in types
-            "append", "extend", "insert", "remove", "pop", "clear", "index", "count",
-            "sort", "copy", "keys", "values", "items", "get", "update", "setdefault",
-            "split", "join", "strip", "lstrip", "rstrip", "replace", "find", "rfind",
-            "startswith", "endswith", "upper", "lower", "title", "capitalize",
-            "format", "encode", "decode",
-            # Exception handling
-            "raise", "Exception", "BaseException", "ValueError", "TypeError",
-            "KeyError", "IndexError", "AttributeError", "ImportError", "RuntimeError",
-            # Common stdlib functions (often called without module prefix)
-            "sleep", "time", "datetime", "path", "exists", "join", "makedirs",
-        }
-
-        # Go builtins
-        go_builtins = {
-            # Built-in functions
-            "append", "cap", "close", "complex", "copy", "delete", "imag", "len",
-            "make", "new", "panic", "print", "println", "real", "recover",
-            # Common fmt package functions (often used with package prefix)
-            "Println", "Printf", "Print", "Sprintf", "Fprintf", "Errorf",
-            "Scan", "Scanf", "Scanln", "Sscan", "Sscanf",
-            # Common io methods
-            "Read", "Write", "Close", "Seek", "ReadAll", "WriteString",
-            # Error handling
-            "Error", "Unwrap", "Is", "As",
-            # Context methods
-            "Background", "TODO", "WithCancel", "WithTimeout", "WithDeadline", "WithValue",
-            # Common string/bytes methods
-            "String", "Bytes", "Len", "Cap",
-            # Type conversions (often appear as function calls)
-            "int", "int8", "int16", "int32", "int64",
-            "uint", "uint8", "uint16", "uint32", "uint64",
-            "float32", "float64", "complex64", "complex128",
-            "string", "bool", "byte", "rune",
-        }
-
-        # Java builtins
-        java_builtins = {
-            # Object methods (inherited by all classes)
-            "toString", "equals", "hashCode", "getClass", "clone", "finalize",
-            "notify", "notifyAll", "wait",
-            # System methods
-            "println", "print", "printf", "format", "exit", "gc",
-            "currentTimeMillis", "nanoTime", "arraycopy",
-            # String methods
-            "length", "charAt", "substring", "indexOf", "lastIndexOf",
-            "startsWith", "endsWith", "contains", "replace", "replaceAll",
-            "split", "trim", "toLowerCase", "toUpperCase", "isEmpty", "isBlank",
-            "valueOf", "compareTo", "concat", "matches",
-            # Collection methods
-            "add", "remove", "get", "set", "size", "isEmpty", "contains",
-            "clear", "iterator", "toArray", "addAll", "removeAll", "retainAll",
-            "put", "containsKey", "containsValue", "keySet", "values", "entrySet",
-            # Stream methods
-            "stream", "filter", "map", "flatMap", "reduce", "collect",
-            "forEach", "findFirst", "findAny", "anyMatch", "allMatch", "noneMatch",
-            "sorted", "distinct", "limit", "skip", "count",
-            # Optional methods
-            "of", "ofNullable", "empty", "isPresent", "ifPresent", "orElse", "orElseGet",
-            # Common utility methods
-            "parseInt", "parseDouble", "parseFloat", "parseLong",
-            "intValue", "doubleValue", "floatValue", "longValue",
-            # Exception/error methods
-            "getMessage", "printStackTrace", "getCause", "initCause",
-        }
-
-        # Rust builtins
-        rust_builtins = {
-            # Macros (often captured as function calls)
-            "println", "print", "eprintln", "eprint", "format", "panic",
-            "assert", "assert_eq", "assert_ne", "debug_assert",
-            "vec", "format_args", "write", "writeln",
-            # Option methods
-            "Some", "None", "unwrap", "unwrap_or", "unwrap_or_else", "unwrap_or_default",
-            "expect", "is_some", "is_none", "map", "map_or", "map_or_else",
-            "and_then", "or_else", "ok_or", "ok_or_else", "take", "replace",
-            # Result methods
-            "Ok", "Err", "is_ok", "is_err", "ok", "err",
-            # Iterator methods
-            "iter", "iter_mut", "into_iter", "next", "collect", "filter", "map",
-            "fold", "reduce", "for_each", "enumerate", "zip", "chain",
-            "take", "skip", "peekable", "flatten", "flat_map",
-            "any", "all", "find", "position", "count", "sum", "product",
-            "min", "max", "min_by", "max_by", "cloned", "copied",
-            # Vec methods
-            "push", "pop", "len", "is_empty", "capacity", "reserve",
-            "clear", "insert", "remove", "swap_remove", "retain",
-            "first", "last", "get", "get_mut",
-            # String methods
-            "to_string", "to_owned", "as_str", "as_bytes", "chars", "bytes",
-            "trim", "trim_start", "trim_end", "split", "split_whitespace",
-            "contains", "starts_with", "ends_with", "replace", "to_lowercase", "to_uppercase",
-            # Common trait methods
-            "clone", "default", "from", "into", "try_from", "try_into",
-            "as_ref", "as_mut", "borrow", "borrow_mut",
-            "deref", "deref_mut", "drop",
-            # Smart pointer methods
-            "new", "lock", "read", "write", "try_lock", "try_read", "try_write",
-            # Async methods
-            "await", "poll",
-        }
-
-        builtin_names = js_builtins | python_builtins | go_builtins | java_builtins | rust_builtins
-
-        if callee_name in builtin_names:
+        if callee_name in _BUILTIN_NAMES:
+            return None
+
+        # Every case below needs some chunk to define the callee, so names no
+        # chunk defines (library APIs, framework helpers) fail in one lookup.
+        # Keying a memo on the source file instead wouldn't be sound: the
+        # result depends on which chunk is calling, as it never resolves to itself
+        if callee_name not in symbol_index:
             return None
 
         # Case 1: Direct function call
         if not call.is_method_call:
-            target_chunks = symbol_index.get(callee_name, [])
-
-            # Prefer chunks in the same file
-            same_file_chunks = [
-                cid for cid in target_chunks
-                if any(c.chunk_id == cid and c.file_path == source_chunk.file_path for c in chunks)
-            ]
-
-            if same_file_chunks:
-                # Return the first match in the same file
-                for cid in same_file_chunks:
-                    if cid != source_chunk.chunk_id:
-                        return cid
+            # Prefer the first match in the same file
+            for cid in self._sym_file_index.get((callee_name, source_chunk.file_path), ()):
+                if cid != source_chunk.chunk_id:
+                    return cid
 
             # Fall back to any chunk with that symbol
-            for cid in target_chunks:
+            for cid in symbol_index.get(callee_name, ()):
                 if cid != source_chunk.chunk_id:
                     return cid
 
         # Case 2: Method call with "this" (JS/TS) or "self" (Python)
         elif call.receiver in ("this", "self"):
             # Look for the method in chunks of the same file with chunk_type 'class' or 'method'
-            for chunk in chunks:
-                if chunk.file_path == source_chunk.file_path and chunk.chunk_id != source_chunk.chunk_id:
+            for chunk in self._chunks_by_file.get(source_chunk.file_path, ()):
+                if chunk.chunk_id != source_chunk.chunk_id:
                     if callee_name in chunk.symbol_names:
                         return chunk.chunk_id
 
@@ -1345,12 +1535,13 @@ class CallGraphBuilder:
             # First, check if receiver is a class name and look for the method
             # Pattern: ClassName.staticMethod() or instance.method() where instance is typed
 
-            # Look for method in classes with matching name
-            for chunk in chunks:
-                # Check if this chunk defines both the class and the method
-                if receiver in chunk.symbol_names and callee_name in chunk.symbol_names:
-                    if chunk.chunk_id != source_chunk.chunk_id:
-                        return chunk.chunk_id
+            # Look for method in classes with matching name. Most receivers are
+            # local variables that no chunk defines; skip those with one failed
+            # lookup instead of memoizing an empty pair for each of them
+            if receiver in symbol_index:
+                for cid in self._chunks_defining_both(receiver, callee_name, symbol_index):
+                    if cid != source_chunk.chunk_id:
+                        return cid
 
             # Also try just the method name as a fallback
             target_chunks = symbol_index.get(callee_name, [])
@@ -1369,28 +1560,37 @@ class CallGraphBuilder:
         Returns a list of CallEdge objects representing the call relationships.
         """
         chunks = self._load_chunks()
-        symbol_index = self._build_symbol_index()
 
         edges: list[CallEdge] = []
-        seen_edges: set[tuple[str, str, str]] = set()
-
-        for chunk in chunks:
-            # Only process supported languages
-            if not is_supported_language(chunk.file_path):
-                continue
-
-            # Extract calls from this chunk
-            calls = extract_calls_from_code(chunk.content, chunk.file_path)
 
+        # Only process supported languages, checked once per file rather than
+        # once per chunk. Extraction fans out to worker processes, and the
+        # symbol index is built here while the workers parse
+        supported_files = {path for path in self._chunks_by_file if is_supported_language(path)}
+        supported = [chunk for chunk in chunks if chunk.file_path in supported_files]
+        with _extracting_calls([(chunk.content, chunk.file_path) for chunk in supported]) as collect:
+            symbol_index = self._build_symbol_index()
+            all_calls = collect()
+
+        for chunk, calls in zip(supported, all_calls):
+            # Resolution only depends on these fields, so repeated call sites
+            # in a chunk resolve once; the first site supplies the edge's line
+            resolved: set[tuple[str, str | None, bool, bool]] = set()
+            # Chunk ids are unique and each chunk is visited once, so edges only
+            # need deduplicating within the chunk, without the source id in the key
+            seen_edges: set[tuple[str, str]] = set()
             for call in calls:
+                call_key = (call.callee_name, call.receiver, call.is_method_call, call.is_dynamic)
+                if call_key in resolved:
+                    continue
+                resolved.add(call_key)
+
                 # Try to resolve the call target
-                target_chunk_id = self._resolve_call_target(
-                    call, chunk, chunks, symbol_index
-                )
+                target_chunk_id = self._resolve_call_target(call, chunk, symbol_index)
 
                 if target_chunk_id:
                     # Create edge if not already seen
-                    edge_key = (chunk.chunk_id, target_chunk_id, call.callee_name)
+                    edge_key = (target_chunk_id, call.callee_name)
                     if edge_key not in seen_edges:
                         seen_edges.add(edge_key)
                         edges.append(CallEdge(
@@ -1430,44 +1630,67 @@ class CallGraphBuilder:
             if deleted > 0:
                 print(f"  Deleted {deleted} existing 'calls' relationships")
 
-        # Insert new edges
+        # Validate edges in memory against this repo/branch's chunk ids, rather
+        # than with a query per edge
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT id FROM chunks WHERE repo_id = %s AND branch = %s",
+                (self.repo_id, self.branch)
+            )
+            valid_ids = {str(row[0]) for row in cur.fetchall()}
+
+        # Keyed by primary key: edges for different callees between the same
+        # two chunks share a row, and the last one's metadata wins
+        rows: dict[tuple[str, str], psycopg.types.json.Json] = {}
+        for edge in edges:
+            if (
+                edge.source_chunk_id == edge.target_chunk_id
+                or edge.source_chunk_id not in valid_ids
+                or edge.target_chunk_id not in valid_ids
+            ):
+                continue
+
+            metadata = {
+                "callee_name": edge.callee_name,
+                "line_number": edge.line_number,
+            }
+            if edge.receiver:
+                metadata["receiver"] = edge.receiver
+
+            rows[(edge.source_chunk_id, edge.target_chunk_id)] = psycopg.types.json.Json(metadata)
+
+        # Stream edges into a staging table with COPY, then merge them with a
+        # single INSERT ... SELECT instead of planning one INSERT per edge
         inserted = 0
         with self.conn.cursor() as cur:
-            for edge in edges:
-                try:
-                    # Validate that both chunk IDs exist
-                    cur.execute(
-                        "SELECT COUNT(*) FROM chunks WHERE id = %s OR id = %s",
-                        (edge.source_chunk_id, edge.target_chunk_id)
-                    )
-                    count = cur.fetchone()[0]
-                    if count < 2:
-                        continue
-
-                    metadata = {
-                        "callee_name": edge.callee_name,
-                        "line_number": edge.line_number,
-                    }
-                    if edge.receiver:
-                        metadata["receiver"] = edge.receiver
-
-                    cur.execute(
-                        """
-                        INSERT INTO relationships
-                        (source_chunk_id, target_chunk_id, relationship_type, metadata)
-                        VALUES (%s, %s, 'calls', %s)
-                        ON CONFLICT (source_chunk_id, target_chunk_id, relationship_type)
-                        DO UPDATE SET metadata = EXCLUDED.metadata
-                        """,
-                        (
-                            edge.source_chunk_id,
-                            edge.target_chunk_id,
-                            psycopg.types.json.Json(metadata),
-                        )
-                    )
-                    inserted += 1
-                except Exception as e:
-                    print(f"  Warning: Failed to insert call edge: {e}")
+            try:
+                cur.execute(
+                    """
+                    CREATE TEMP TABLE call_edges_staging (
+                        source_chunk_id UUID NOT NULL,
+                        target_chunk_id UUID NOT NULL,
+                        metadata JSONB
+                    ) ON COMMIT DROP
+                    """
+                )
+                with cur.copy(
+                    "COPY call_edges_staging (source_chunk_id, target_chunk_id, metadata) FROM STDIN"
+                ) as copy:
+                    for (source_chunk_id, target_chunk_id), metadata in rows.items():
+                        copy.write_row((source_chunk_id, target_chunk_id, metadata))
+                cur.execute(
+                    """
+                    INSERT INTO relationships
+                    (source_chunk_id, target_chunk_id, relationship_type, metadata)
+                    SELECT source_chunk_id, target_chunk_id, 'calls', metadata
+                    FROM call_edges_staging
+                    ON CONFLICT (source_chunk_id, target_chunk_id, relationship_type)
+                    DO UPDATE SET metadata = EXCLUDED.metadata
+                    """
+                )
+                inserted = cur.rowcount
+            except Exception as e:
+                print(f"  Warning: Failed to insert call edges: {e}")
 
             self.conn.commit()
 
@@ -1557,7 +1780,10 @@ def get_callers(
               AND r.metadata->>'callee_name' = %s
             ORDER BY c.file_path, c.line_start
             """,
-            (repo_id, branch, function_name)
+            (repo_id, branch, function_name),
+            # Looked up repeatedly over a connection's lifetime; prepare on
+            # first use rather than after psycopg's default five executions
+            prepare=True,
         )
 
         for row in cur.fetchall():
@@ -1607,7 +1833,8 @@ def get_callees(
               AND r.source_chunk_id = %s
             ORDER BY t.file_path, t.line_start
             """,
-            (chunk_id,)
+            (chunk_id,),
+            prepare=True,
         )
 
         for row in cur.fetchall():
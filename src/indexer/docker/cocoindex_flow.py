@@ -33,9 +33,14 @@ Usage:
 
 from __future__ import annotations
 
+import atexit
+import functools
 import os
 import hashlib
+import re
+import threading
 import uuid
+from collections import Counter
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -43,7 +48,9 @@ import cocoindex
 import numpy as np
 import psycopg
 from numpy.typing import NDArray
+from pgvector import HalfVector
 from pgvector.psycopg import register_vector
+from psycopg_pool import ConnectionPool
 
 # Import AST-based chunking
 from ast_chunker import chunk_code_ast, CodeChunk
@@ -86,102 +93,253 @@ def reset_cache_stats() -> None:
     _cache_stats = CacheStats()
 
 
+# Contents longer than this are encoded and hashed a slice at a time so the
+# full UTF-8 copy never exists alongside the str
+_HASH_SLICE_CHARS = 1 << 20
+
+
+def compute_content_hash_bytes(content: str) -> bytes:
+    """
+    Compute the raw SHA-256 digest of content.
+
+    Use this for in-process keys; compute_content_hash is the hex form
+    stored in the embedding_cache table.
+
+    Args:
+        content: The text content to hash
+
+    Returns:
+        32-byte SHA-256 digest
+    """
+    if len(content) <= _HASH_SLICE_CHARS:
+        return hashlib.sha256(content.encode("utf-8")).digest()
+    # UTF-8 encodes each code point independently, so slicing the str
+    # yields the same byte stream as encoding it whole
+    h = hashlib.sha256()
+    for start in range(0, len(content), _HASH_SLICE_CHARS):
+        h.update(content[start:start + _HASH_SLICE_CHARS].encode("utf-8"))
+    return h.digest()
+
+
 def compute_content_hash(content: str) -> str:
     """
     Compute SHA-256 hash of content for cache lookup.
 
+    The hash is the embedding_cache key shared with indexer.py and
+    incremental.py, so all three must agree on it: switching algorithm here
+    alone would turn every entry the other indexers wrote into a miss, and
+    switching everywhere would orphan the whole cache. Hashing is not the
+    bottleneck either; each hash guards a model forward pass.
+
     Args:
         content: The text content to hash
 
     Returns:
         Hexadecimal SHA-256 hash string
     """
-    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return compute_content_hash_bytes(content).hex()
+
+
+# Embedding cache connection pools, keyed by database URL
+_cache_pools: dict[str, ConnectionPool] = {}
+_cache_pools_lock = threading.Lock()
+
+
+def _get_cache_pool(database_url: str) -> ConnectionPool:
+    """Get or create the connection pool used for embedding cache operations."""
+    with _cache_pools_lock:
+        pool = _cache_pools.get(database_url)
+        if pool is None:
+            # register_vector runs once per new pooled connection, not per cache call
+            pool = _cache_pools[database_url] = ConnectionPool(
+                database_url, configure=register_vector, min_size=2, max_size=8, open=True
+            )
+        return pool
+
+
+# Cache hits whose last_used_at/hit_count update is deferred, keyed by
+# database URL. Touching rows one lookup at a time costs a round-trip per
+# chunk, so hits are buffered and applied in one UPDATE by flush_cache_touches.
+_pending_touches: dict[str, list[tuple[str, str]]] = {}
+_pending_touches_lock = threading.Lock()
+_TOUCH_FLUSH_SIZE = 500
+
+
+def _record_cache_touches(database_url: str, content_hashes: list[str], model_name: str) -> None:
+    """Buffer cache hits, flushing once the buffer for this database is full."""
+    with _pending_touches_lock:
+        touches = _pending_touches.setdefault(database_url, [])
+        touches.extend((content_hash, model_name) for content_hash in content_hashes)
+        full = len(touches) >= _TOUCH_FLUSH_SIZE
+    if full:
+        flush_cache_touches(database_url)
+
+
+def flush_cache_touches(database_url: str | None = None) -> int:
+    """
+    Apply buffered cache hits to the embedding cache table.
 
+    Each database's pending hits are written with a single UPDATE; repeated
+    hits on the same entry increment hit_count by the number of lookups.
+
+    Args:
+        database_url: Only flush hits for this database (default: all)
 
-def lookup_cached_embedding(
+    Returns:
+        Number of cache entries touched
+    """
+    with _pending_touches_lock:
+        if database_url is None:
+            batches = list(_pending_touches.items())
+            _pending_touches.clear()
+        else:
+            batches = [(database_url, _pending_touches.pop(database_url, []))]
+
+    touched = 0
+    for url, touches in batches:
+        if not touches:
+            continue
+        counts = Counter(touches)
+        try:
+            with _get_cache_pool(url).connection() as conn, conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE embedding_cache AS c
+                    SET last_used_at = NOW(), hit_count = c.hit_count + t.hits
+                    FROM unnest(%s::text[], %s::text[], %s::int[])
+                        AS t(content_hash, model_name, hits)
+                    WHERE c.content_hash = t.content_hash
+                      AND c.model_name = t.model_name
+                    """,
+                    (
+                        [content_hash for content_hash, _ in counts],
+                        [model_name for _, model_name in counts],
+                        list(counts.values()),
+                    )
+                )
+                touched += cur.rowcount
+        except Exception:
+            # Usage bookkeeping is best-effort, like the lookups themselves
+            continue
+    return touched
+
+
+def close_cache_pools() -> None:
+    """Flush buffered cache hits, then close every embedding cache connection pool."""
+    flush_cache_touches()
+    with _cache_pools_lock:
+        pools = list(_cache_pools.values())
+        _cache_pools.clear()
+    for pool in pools:
+        try:
+            pool.close()
+        except Exception:
+            continue
+
+
+atexit.register(close_cache_pools)
+
+
+def _vector_to_array(value: Any) -> NDArray[np.float32]:
+    """Convert a loaded pgvector value (Vector, HalfVector or ndarray) to float32."""
+    to_numpy = getattr(value, "to_numpy", None)
+    if to_numpy is not None:
+        value = to_numpy()
+    return np.asarray(value, dtype=np.float32)
+
+
+def lookup_cached_embeddings(
     database_url: str,
-    content_hash: str,
+    content_hashes: list[str],
     model_name: str
-) -> list[float] | None:
+) -> dict[str, NDArray[np.float32]]:
     """
-    Look up a single cached embedding by content hash.
+    Look up cached embeddings by content hash, in one query.
+
+    The cache stores half precision (halfvec) embeddings, fetched in binary
+    format, so each hit moves 2 bytes per dimension and pgvector decodes it
+    with a single buffer copy instead of parsing 1536 floats from text. Hits are
+    recorded for a later batched usage update; call flush_cache_touches()
+    once a batch of lookups is done.
 
     Args:
         database_url: PostgreSQL connection string
-        content_hash: SHA-256 content hash
+        content_hashes: SHA-256 content hashes
         model_name: The embedding model name
 
     Returns:
-        Embedding as list of floats, or None if not cached
+        Dictionary mapping content_hash -> embedding (float32 numpy array,
+        widened from the stored fp16); empty if the lookup fails
     """
-    try:
-        conn = psycopg.connect(database_url)
-        register_vector(conn)
+    if not content_hashes:
+        return {}
 
-        with conn.cursor() as cur:
+    try:
+        with _get_cache_pool(database_url).connection() as conn, conn.cursor(binary=True) as cur:
             cur.execute(
                 """
-                UPDATE embedding_cache
-                SET last_used_at = NOW(), hit_count = hit_count + 1
-                WHERE content_hash = %s AND model_name = %s
-                RETURNING embedding
+                SELECT content_hash, embedding
+                FROM embedding_cache
+                WHERE content_hash = ANY(%s) AND model_name = %s
                 """,
-                (content_hash, model_name)
+                (content_hashes, model_name)
             )
-            row = cur.fetchone()
-            conn.commit()
-
-        conn.close()
-
-        if row and row[0] is not None:
-            return list(row[0])
-        return None
+            rows = cur.fetchall()
     except Exception:
-        return None
+        return {}
 
+    result = {
+        content_hash: _vector_to_array(embedding)
+        for content_hash, embedding in rows
+        if embedding is not None
+    }
+    # One touch per requested hash that hit, repeats included, as separate
+    # lookups would have counted them
+    _record_cache_touches(
+        database_url, [content_hash for content_hash in content_hashes if content_hash in result], model_name
+    )
+    return result
 
-def store_cached_embedding(
+
+def store_cached_embeddings(
     database_url: str,
-    content_hash: str,
-    embedding: list[float],
-    original_dim: int,
+    embeddings_to_cache: list[tuple[str, NDArray[np.float32], int]],
     model_name: str
-) -> bool:
+) -> int:
     """
-    Store an embedding in the cache.
+    Store embeddings in the cache, in one pipelined batch.
 
     Args:
         database_url: PostgreSQL connection string
-        content_hash: SHA-256 content hash
-        embedding: The embedding to cache (padded to 1536 dims)
-        original_dim: Original embedding dimension before padding
+        embeddings_to_cache: List of (content_hash, embedding, original_dim) tuples;
+            embeddings are numpy arrays padded to 1536 dims, sent to pgvector
+            in binary format as half precision
         model_name: The embedding model name
 
     Returns:
-        True if cached successfully, False otherwise
+        Number of embeddings stored (0 if the batch failed)
     """
-    try:
-        conn = psycopg.connect(database_url)
-        register_vector(conn)
+    if not embeddings_to_cache:
+        return 0
 
-        with conn.cursor() as cur:
-            cur.execute(
+    try:
+        with _get_cache_pool(database_url).connection() as conn, conn.cursor() as cur:
+            cur.executemany(
                 """
                 INSERT INTO embedding_cache (content_hash, model_name, embedding, embedding_dim)
-                VALUES (%s, %s, %s, %s)
+                VALUES (%s, %s, %b, %s)
                 ON CONFLICT (content_hash, model_name) DO UPDATE SET
                     last_used_at = NOW(),
                     hit_count = embedding_cache.hit_count + 1
                 """,
-                (content_hash, model_name, embedding, original_dim)
+                [
+                    (content_hash, model_name, HalfVector(embedding), original_dim)
+                    for content_hash, embedding, original_dim in embeddings_to_cache
+                ]
             )
-            conn.commit()
-
-        conn.close()
-        return True
+        return len(embeddings_to_cache)
     except Exception:
-        return False
+        return 0
 
 
 # Configuration from environment
@@ -198,12 +356,39 @@ def generate_repo_id(repo_url: str) -> str:
     return hashlib.sha256(repo_url.encode()).hexdigest()[:16]
 
 
+@functools.lru_cache(maxsize=64)
+def _chunk_id_prefix_hasher(repo_id: str, branch: str) -> Any:
+    """SHA-1 state after the uuid5 namespace and the constant "repo_id:branch:" prefix."""
+    hasher = hashlib.sha1(uuid.NAMESPACE_DNS.bytes)
+    hasher.update(f"{repo_id}:{branch}:".encode("utf-8"))
+    return hasher
+
+
+def _chunk_id_file_hasher(repo_id: str, branch: str, filename: str) -> Any:
+    """SHA-1 state covering everything in a chunk's identity except its location."""
+    hasher = _chunk_id_prefix_hasher(repo_id, branch).copy()
+    hasher.update(f"{filename}:".encode("utf-8"))
+    return hasher
+
+
+def _chunk_id_from_hasher(file_hasher: Any, location: str) -> str:
+    """Finish a chunk id from a file's hasher; the same UUID uuid.uuid5 would give."""
+    hasher = file_hasher.copy()
+    hasher.update(location.encode("utf-8"))
+    return str(uuid.UUID(bytes=hasher.digest()[:16], version=5))
+
+
 def generate_chunk_id(
     repo_id: str, branch: str, filename: str, location: str
 ) -> str:
-    """Generate a deterministic UUID for a chunk based on its identity."""
-    identity = f"{repo_id}:{branch}:{filename}:{location}"
-    return str(uuid.uuid5(uuid.NAMESPACE_DNS, identity))
+    """
+    Generate a deterministic UUID for a chunk based on its identity.
+
+    Equal to uuid5(NAMESPACE_DNS, "repo_id:branch:filename:location"), but
+    the namespace and repo/branch prefix are hashed once and the SHA-1 state
+    is copied per chunk.
+    """
+    return _chunk_id_from_hasher(_chunk_id_file_hasher(repo_id, branch, filename), location)
 
 
 # File extensions to include for indexing
@@ -445,20 +630,23 @@ class ASTChunkCodeExecutor:
         Returns:
             List of ChunkInfo objects representing code chunks
         """
-        if not content or not content.strip():
+        if not content or content.isspace():
             return []
 
         # Use AST-based chunking
         chunks = chunk_code_ast(content, filename)
 
         result: list[ChunkInfo] = []
+        # Every chunk of the file shares the hash state up to its location
+        file_hasher = None
+        hasher_filename = None
         for chunk in chunks:
-            chunk_id = generate_chunk_id(
-                self.spec.repo_id,
-                self.spec.branch,
-                chunk.filename,
-                chunk.location,
-            )
+            if chunk.filename != hasher_filename:
+                hasher_filename = chunk.filename
+                file_hasher = _chunk_id_file_hasher(
+                    self.spec.repo_id, self.spec.branch, hasher_filename
+                )
+            chunk_id = _chunk_id_from_hasher(file_hasher, chunk.location)
 
             result.append(
                 ChunkInfo(
@@ -497,6 +685,33 @@ class RelationshipInfo:
     metadata: dict[str, Any]
 
 
+# Identifier tokens, as matched against symbol names when finding references
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# Names too common to say anything about which chunk a reference points at:
+# every class has an __init__/constructor, and builtin and typing names are
+# used everywhere. Short all-lowercase names (get, run, log, ...) are already
+# excluded by _is_reference_symbol.
+_REFERENCE_STOPLIST = frozenset({
+    "__init__", "__call__", "__str__", "__repr__", "__eq__", "__hash__",
+    "constructor", "toString", "valueOf",
+    "self", "this", "super", "None", "True", "False", "null", "undefined",
+    "Any", "Optional", "Union", "List", "Dict", "Tuple", "Set", "Callable",
+    "Object", "Array", "String", "Number", "Boolean", "Promise", "Error",
+    "Map", "Date", "JSON", "Math", "console",
+    "print", "range", "string", "number", "boolean", "object",
+    "value", "values", "items", "index", "length", "result", "default",
+})
+
+
+def _is_reference_symbol(symbol: str) -> bool:
+    """Whether a symbol is distinctive enough to look for references to it."""
+    if len(symbol) < 3 or symbol in _REFERENCE_STOPLIST:
+        return False
+    # Short lowercase words match unrelated code far more often than not
+    return len(symbol) >= 5 or not symbol.islower() or "_" in symbol
+
+
 def extract_relationships(
     chunks: list[ChunkInfo],
 ) -> list[RelationshipInfo]:
@@ -516,6 +731,24 @@ def extract_relationships(
         List of RelationshipInfo objects representing inter-chunk relationships
     """
     relationships: list[RelationshipInfo] = []
+    # (source, target, type) of every relationship added; duplicates are
+    # skipped at insertion, and the imports check is a set lookup
+    seen: set[tuple[str, str, str]] = set()
+
+    def add_relationship(
+        source_chunk_id: str, target_chunk_id: str, relationship_type: str, metadata: dict[str, Any]
+    ) -> None:
+        key = (source_chunk_id, target_chunk_id, relationship_type)
+        if key not in seen:
+            seen.add(key)
+            relationships.append(
+                RelationshipInfo(
+                    source_chunk_id=source_chunk_id,
+                    target_chunk_id=target_chunk_id,
+                    relationship_type=relationship_type,
+                    metadata=metadata,
+                )
+            )
 
     # Build a map of exported symbols to chunk IDs
     # symbol_name -> list of chunk_ids that export it
@@ -549,66 +782,72 @@ def extract_relationships(
             if imported in export_map:
                 for target_chunk_id in export_map[imported]:
                     if target_chunk_id != chunk.chunk_id:
-                        relationships.append(
-                            RelationshipInfo(
-                                source_chunk_id=chunk.chunk_id,
-                                target_chunk_id=target_chunk_id,
-                                relationship_type="imports",
-                                metadata={"imported_symbol": imported},
-                            )
+                        add_relationship(
+                            chunk.chunk_id, target_chunk_id, "imports", {"imported_symbol": imported}
                         )
 
     # Look for call relationships based on symbol usage
     # This is a heuristic: if chunk A's content contains a symbol name
     # that chunk B exports, and A imports from B's file, it's likely a call
+    #
+    # Identifier-shaped symbols are matched as whole identifier tokens through
+    # an inverted index, built by tokenizing each chunk's content once, rather
+    # than substring-scanning every other chunk for every symbol. Only tokens
+    # that are some chunk's symbol are indexed.
+    indexed_symbols = {
+        symbol
+        for chunk in chunks
+        for symbol in chunk.symbol_names
+        if _is_reference_symbol(symbol) and _IDENTIFIER_RE.fullmatch(symbol)
+    }
+    token_to_chunks: dict[str, list[ChunkInfo]] = {}
+    if indexed_symbols:
+        for other_chunk in chunks:
+            for token in indexed_symbols.intersection(_IDENTIFIER_RE.findall(other_chunk.content)):
+                token_to_chunks.setdefault(token, []).append(other_chunk)
+
     for chunk in chunks:
         # Check each exported symbol against other chunks' content
         for symbol in chunk.symbol_names:
-            if not symbol or len(symbol) < 3:  # Skip very short symbols
+            if not _is_reference_symbol(symbol):  # Skip short or common symbols
+                continue
+
+            if symbol in indexed_symbols:
+                for other_chunk in token_to_chunks.get(symbol, ()):
+                    if other_chunk.chunk_id == chunk.chunk_id:
+                        continue
+
+                    # Skip if already have an imports relationship
+                    if (other_chunk.chunk_id, chunk.chunk_id, "imports") not in seen:
+                        add_relationship(
+                            other_chunk.chunk_id, chunk.chunk_id, "references", {"symbol": symbol}
+                        )
                 continue
 
+            # Other symbols (config keys like "package.json", "go:1.21") can't
+            # be tokenized as identifiers, so they're still scanned for, with
+            # one search per chunk that isn't part of a longer identifier.
+            # The lookbehind keeps the regex engine from skipping ahead to the
+            # literal, so a plain substring test screens out the chunks that
+            # don't contain the symbol at all first.
+            pattern = re.compile(
+                rf"(?<![A-Za-z0-9_]){re.escape(symbol)}(?![A-Za-z0-9_])"
+            )
             for other_chunk in chunks:
                 if other_chunk.chunk_id == chunk.chunk_id:
                     continue
 
                 # Skip if already have an imports relationship
-                existing = any(
-                    r.source_chunk_id == other_chunk.chunk_id
-                    and r.target_chunk_id == chunk.chunk_id
-                    and r.relationship_type == "imports"
-                    for r in relationships
-                )
-
-                # Check if the symbol appears in the other chunk's content
-                # Use word boundary check to avoid false positives
                 if (
-                    not existing
-                    and f"{symbol}(" in other_chunk.content
-                    or f"{symbol}." in other_chunk.content
-                    or f" {symbol} " in other_chunk.content
+                    (other_chunk.chunk_id, chunk.chunk_id, "imports") not in seen
+                    and symbol in other_chunk.content
+                    and pattern.search(other_chunk.content)
                 ):
-                    # Don't create relationship to self
-                    if other_chunk.chunk_id != chunk.chunk_id:
-                        relationships.append(
-                            RelationshipInfo(
-                                source_chunk_id=other_chunk.chunk_id,
-                                target_chunk_id=chunk.chunk_id,
-                                relationship_type="references",
-                                metadata={"symbol": symbol},
-                            )
-                        )
+                    add_relationship(
+                        other_chunk.chunk_id, chunk.chunk_id, "references", {"symbol": symbol}
+                    )
 
-    # Deduplicate relationships
-    seen: set[tuple[str, str, str]] = set()
-    unique_relationships: list[RelationshipInfo] = []
-
-    for rel in relationships:
-        key = (rel.source_chunk_id, rel.target_chunk_id, rel.relationship_type)
-        if key not in seen:
-            seen.add(key)
-            unique_relationships.append(rel)
-
-    return unique_relationships
+    return relationships
 
 
 # =============================================================================
@@ -628,66 +867,98 @@ class CachedSentenceTransformerEmbed(cocoindex.op.FunctionSpec):
     database_url: str
 
 
-@cocoindex.op.executor_class(cache=True, behavior_version=1)
+# Texts per forward pass when embedding cache misses, as in indexer.py
+EMBEDDING_BATCH_SIZE = 64
+
+
+@cocoindex.op.executor_class(cache=True, batching=True, behavior_version=2)
 class CachedSentenceTransformerEmbedExecutor:
     """Executor for cached sentence transformer embedding."""
 
     spec: CachedSentenceTransformerEmbed
     _model: Any = None
 
-    def __call__(self, text: str) -> NDArray[np.float32]:
+    def __call__(self, texts: list[str]) -> list[NDArray[np.float32]]:
         """
-        Generate embedding for text, using cache when possible.
+        Generate embeddings for a batch of texts, using cache when possible.
+
+        cocoindex hands the executor batches of rows; cache misses in the
+        batch are embedded together with one encode() call rather than one
+        forward pass per text.
 
         Args:
-            text: The text to embed
+            texts: The texts to embed
 
         Returns:
-            Embedding as numpy array (padded to 1536 dimensions)
+            Embeddings as numpy arrays (padded to 1536 dimensions), in input order
         """
         global _cache_stats
 
-        # Compute content hash
-        content_hash = compute_content_hash(text)
+        results: list[NDArray[np.float32] | None] = [None] * len(texts)
+        content_hashes = [compute_content_hash(text) for text in texts]
 
-        # Try cache lookup
-        cached = lookup_cached_embedding(
+        # One cache query for the whole batch
+        cached_embeddings = lookup_cached_embeddings(
             self.spec.database_url,
-            content_hash,
+            content_hashes,
             self.spec.model
         )
 
-        if cached is not None:
-            _cache_stats.hits += 1
-            return np.array(cached, dtype=np.float32)
-
-        # Cache miss - generate embedding
-        _cache_stats.misses += 1
-
-        # Lazy load model
-        if self._model is None:
-            from sentence_transformers import SentenceTransformer
-            self._model = SentenceTransformer(self.spec.model)
-
-        # Generate embedding
-        embedding = self._model.encode(text, show_progress_bar=False)
-        embedding_list = embedding.tolist()
-        original_dim = len(embedding_list)
-
-        # Pad to 1536 dimensions
-        if len(embedding_list) < 1536:
-            embedding_list = embedding_list + [0.0] * (1536 - len(embedding_list))
+        # content_hash -> indices of the texts with that content still to embed
+        misses: dict[str, list[int]] = {}
+
+        for i, content_hash in enumerate(content_hashes):
+            cached = cached_embeddings.get(content_hash)
+            if cached is not None:
+                _cache_stats.hits += 1
+                results[i] = cached
+            elif content_hash in misses:
+                # Repeated content in the batch is embedded once; embedded one
+                # at a time, the repeat would have been a cache hit
+                _cache_stats.hits += 1
+                misses[content_hash].append(i)
+            else:
+                _cache_stats.misses += 1
+                misses[content_hash] = [i]
+
+        if misses:
+            # Lazy load model
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.spec.model)
+
+            # Generate embeddings; encode() sorts the batch by length
+            # internally and returns rows in input order
+            embeddings = self._model.encode(
+                [texts[indices[0]] for indices in misses.values()],
+                batch_size=EMBEDDING_BATCH_SIZE,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+            )
+            original_dim = embeddings.shape[1]
+
+            # Pad to 1536 dimensions
+            padded = np.zeros((len(misses), max(original_dim, 1536)), dtype=np.float32)
+            padded[:, :original_dim] = embeddings
+
+            for indices, embedding in zip(misses.values(), padded):
+                for i in indices:
+                    results[i] = embedding
+
+            # Cache the embeddings in one batch
+            store_cached_embeddings(
+                self.spec.database_url,
+                [
+                    (content_hash, embedding, original_dim)
+                    for content_hash, embedding in zip(misses, padded)
+                ],
+                self.spec.model
+            )
 
-        # Cache the embedding
-        store_cached_embedding(
-            self.spec.database_url,
-            content_hash,
-            embedding_list,
-            original_dim,
-            self.spec.model
-        )
+        # Record this batch's hits now rather than leaving them for exit
+        flush_cache_touches(self.spec.database_url)
 
-        return np.array(embedding_list, dtype=np.float32)
+        return results
 
 
 # =============================================================================
@@ -877,6 +1148,9 @@ def export_relationships_to_postgres(database_url: str) -> int:
 
     repo_id = generate_repo_id(REPO_URL)
 
+    # The embedding flow has finished by now; apply its buffered cache hits
+    flush_cache_touches(database_url)
+
     print("Extracting relationships...")
 
     conn = psycopg.connect(database_url)
@@ -1074,6 +1348,8 @@ def get_cache_table_stats(database_url: str) -> dict:
     Returns:
         Dictionary with cache table statistics
     """
+    flush_cache_touches(database_url)
+
     try:
         conn = psycopg.connect(database_url)
         with conn.cursor() as cur:
@@ -43,7 +43,7 @@ class ConfigMetadata:
     compiler_options: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConfigChunk:
     """A chunk representing a config file with metadata."""
 
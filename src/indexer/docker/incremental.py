@@ -24,6 +24,7 @@ import os
 import sys
 import hashlib
 import json
+import re
 import subprocess
 import time
 from dataclasses import dataclass, field
@@ -35,7 +36,7 @@ from pgvector.psycopg import register_vector
 from sentence_transformers import SentenceTransformer
 
 # Import from the main indexer
-from ast_chunker import chunk_code_ast, CodeChunk
+from ast_chunker import chunk_code_ast_bytes, CodeChunk
 from call_graph import build_and_store_call_graph
 from import_graph import build_and_store_import_graph
 
@@ -151,6 +152,24 @@ def compute_content_hash(content: str) -> str:
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
+# A byte that is ASCII and not whitespace to str.isspace(), which, unlike
+# bytes.isspace(), also counts the \x1c-\x1f separators
+_ASCII_NON_SPACE_RE = re.compile(rb"[^\t\n\v\f\r\x1c-\x1f \x80-\xff]")
+
+
+def is_blank_content(data: bytes) -> bool:
+    """
+    Check whether file content is empty or whitespace-only once decoded.
+
+    Matches data.decode("utf-8", errors="ignore").strip() being empty, so
+    files holding only Unicode whitespace (NBSP, U+3000, ...) count as blank,
+    but only decodes when no ASCII non-whitespace byte is found first.
+    """
+    if _ASCII_NON_SPACE_RE.search(data):
+        return False
+    return not data.decode("utf-8", errors="ignore").strip()
+
+
 def get_language_from_extension(ext: str) -> Optional[str]:
     """Get the programming language from a file extension."""
     return EXTENSION_TO_LANGUAGE.get(ext.lower())
@@ -309,7 +328,7 @@ def lookup_cached_embeddings(
             UPDATE embedding_cache
             SET last_used_at = NOW(), hit_count = hit_count + 1
             WHERE content_hash = ANY(%s) AND model_name = %s
-            RETURNING content_hash, embedding
+            RETURNING content_hash, embedding::vector
             """,
             (content_hashes, model_name)
         )
@@ -509,20 +528,20 @@ def index_files_incrementally(
     for file_path in files_to_index:
         try:
             rel_path = file_path.relative_to(REPO_PATH)
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
+            data = file_path.read_bytes()
 
-            if not content.strip():
+            if is_blank_content(data):
                 continue
 
             # Update file metadata
             ext = file_path.suffix.lower()
             language = get_language_from_extension(ext)
             update_file_metadata(
-                conn, str(rel_path), repo_id, repo_url, branch, language, len(content)
+                conn, str(rel_path), repo_id, repo_url, branch, language, len(data)
             )
 
-            # Chunk the content
-            chunks = chunk_code_ast(content, str(rel_path))
+            # Chunk the raw bytes; valid UTF-8 reaches the parser without a re-encode
+            chunks = chunk_code_ast_bytes(data, str(rel_path))
             all_chunks.extend(chunks)
 
         except Exception as e:
@@ -33,7 +33,7 @@ from pgvector.psycopg import register_vector
 from sentence_transformers import SentenceTransformer
 
 # Import AST-based chunking
-from ast_chunker import chunk_code_ast, CodeChunk
+from ast_chunker import chunk_code_ast, chunk_files, CodeChunk
 from call_graph import build_and_store_call_graph
 from import_graph import build_and_store_import_graph
 
@@ -99,7 +99,7 @@ def lookup_cached_embeddings(
             UPDATE embedding_cache
             SET last_used_at = NOW(), hit_count = hit_count + 1
             WHERE content_hash = ANY(%s) AND model_name = %s
-            RETURNING content_hash, embedding
+            RETURNING content_hash, embedding::vector
             """,
             (content_hashes, model_name)
         )
@@ -229,11 +229,14 @@ def should_include_file(path: Path) -> bool:
 
 def find_files(repo_path: str) -> Generator[Path, None, None]:
     """Find all source files to index."""
-    root = Path(repo_path)
-
-    for path in root.rglob("*"):
-        if path.is_file() and should_include_file(path):
-            yield path
+    for dirpath, dirnames, filenames in os.walk(repo_path):
+        # Prune excluded directories so node_modules, .git, build output, etc.
+        # are never descended into; their files would all be rejected anyway
+        dirnames[:] = [name for name in dirnames if name not in EXCLUDE_DIRS]
+        for filename in filenames:
+            path = Path(dirpath, filename)
+            if should_include_file(path) and path.is_file():
+                yield path
 
 
 def chunk_code(content: str, filename: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[CodeChunk]:
@@ -327,27 +330,17 @@ def index_repository() -> dict:
     all_chunks: list[CodeChunk] = []
 
     print("Scanning files...")
-    for file_path in find_files(REPO_PATH):
-        try:
-            # Get relative path from repo root
-            rel_path = file_path.relative_to(REPO_PATH)
-
-            # Read file content
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
-
-            if not content.strip():
-                continue
-
-            # Chunk the content
-            chunks = chunk_code(content, str(rel_path))
-            all_chunks.extend(chunks)
-            files_processed += 1
+    # Parsing is CPU-bound, so files are chunked across worker processes
+    for chunks in chunk_files(find_files(REPO_PATH), root=REPO_PATH).values():
+        if not chunks:
+            # Empty or whitespace-only file
+            continue
 
-            if files_processed % 50 == 0:
-                print(f"  Scanned {files_processed} files, {len(all_chunks)} chunks...")
+        all_chunks.extend(chunks)
+        files_processed += 1
 
-        except Exception as e:
-            print(f"  Warning: Could not process {file_path}: {e}", file=sys.stderr)
+        if files_processed % 50 == 0:
+            print(f"  Scanned {files_processed} files, {len(all_chunks)} chunks...")
 
     print(f"Found {len(all_chunks)} chunks from {files_processed} files")
 
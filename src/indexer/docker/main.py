@@ -26,7 +26,13 @@ from pgvector.psycopg import register_vector
 
 from api_auth import install_indexer_api_auth
 from import_graph import ImportGraphBuilder, generate_repo_id as graph_generate_repo_id
-from bm25 import normalize_identifier, build_tsquery, calculate_exact_match_boost
+from bm25 import (
+    normalize_identifier,
+    build_tsquery,
+    EXACT_MATCH_BOOST_SQL,
+    TS_RANK_NORMALIZATION,
+    exact_match_boost_params,
+)
 from hybrid import (
     HybridSearchConfig,
     HybridMatch,
@@ -49,8 +55,11 @@ class Settings(BaseSettings):
 settings = Settings()
 
 
+@functools.lru_cache(maxsize=1024)
 def generate_repo_id(repo_url: str) -> str:
     """Generate a short unique identifier for a repository URL."""
+    # The id is persisted in every table and shared with the indexer modules,
+    # so the hash can't change; requests repeat a handful of URLs, so memoize
     return hashlib.sha256(repo_url.encode()).hexdigest()[:16]
 
 
@@ -479,8 +488,10 @@ async def keyword_search(request: KeywordSearchRequest):
         # Execute keyword search with BM25-style ranking
         with get_connection_pool().connection() as conn:
             with conn.cursor() as cur:
-                # Build the query with ts_rank_cd for BM25-style scoring
-                # Normalization option 1 divides rank by 1 + log(doc length)
+                # Build the query with ts_rank_cd for BM25-style scoring, normalized
+                # for document length and bounded to [0, 1)
+                # The exact match boost is applied in SQL, so Postgres sorts and
+                # limits on the final score
                 query_sql = f"""
                     WITH query AS (
                         SELECT to_tsquery('simple', %s) AS q
@@ -495,49 +506,46 @@ async def keyword_search(request: KeywordSearchRequest):
                         c.symbol_names,
                         c.repo_url,
                         c.branch,
-                        ts_rank_cd(c.content_tsv, query.q, 1) AS bm25_score
-                    FROM chunks c, query
+                        s.bm25_score,
+                        s.exact_match_boost,
+                        s.bm25_score * s.exact_match_boost AS final_score
+                    FROM chunks c
+                    CROSS JOIN query
+                    CROSS JOIN LATERAL (
+                        SELECT
+                            ts_rank_cd(c.content_tsv, query.q, {TS_RANK_NORMALIZATION}) AS bm25_score,
+                            {EXACT_MATCH_BOOST_SQL} AS exact_match_boost
+                    ) s
                     WHERE c.content_tsv @@ query.q
                       {"AND " + " AND ".join(where_conditions[1:]) if len(where_conditions) > 1 else ""}
-                    ORDER BY bm25_score DESC
+                    ORDER BY final_score DESC
                     LIMIT %s
                 """
 
-                params = [normalized_query] + where_params + [request.limit * 2]  # Fetch extra for re-ranking
+                params = (
+                    [normalized_query]
+                    + list(exact_match_boost_params(request.query, request.exact_match_boost))
+                    + where_params
+                    + [request.limit]
+                )
                 cur.execute(query_sql, tuple(params))
 
                 matches = []
                 for row in cur.fetchall():
-                    symbol_names = row[6] or []
-                    bm25_score = float(row[9]) if row[9] else 0.0
-
-                    # Calculate exact match boost
-                    exact_boost = calculate_exact_match_boost(
-                        request.query,
-                        symbol_names,
-                        request.exact_match_boost
-                    )
-
-                    final_score = bm25_score * exact_boost
-
                     matches.append({
                         "file_path": row[1],
                         "content": row[2],
                         "line_start": row[3],
                         "line_end": row[4],
                         "chunk_type": row[5],
-                        "symbol_names": symbol_names,
+                        "symbol_names": row[6] or [],
                         "repo_url": row[7],
                         "branch": row[8],
-                        "bm25_score": bm25_score,
-                        "exact_match_boost": exact_boost,
-                        "final_score": final_score,
+                        "bm25_score": float(row[9]) if row[9] else 0.0,
+                        "exact_match_boost": float(row[10]),
+                        "final_score": float(row[11]) if row[11] else 0.0,
                     })
 
-                # Sort by final score and limit
-                matches.sort(key=lambda x: x["final_score"], reverse=True)
-                matches = matches[:request.limit]
-
                 return KeywordSearchResponse(
                     query=request.query,
                     normalized_query=normalized_query,
@@ -693,7 +701,8 @@ async def hybrid_search(request: HybridSearchRequest):
                             c.symbol_names,
                             c.repo_url,
                             c.branch,
-                            ts_rank_cd(c.content_tsv, query.q, 1) AS bm25_score
+                            ts_rank_cd(c.content_tsv, query.q, {TS_RANK_NORMALIZATION}) AS bm25_score,
+                            {EXACT_MATCH_BOOST_SQL} AS exact_match_boost
                         FROM chunks c, query
                         WHERE c.content_tsv @@ query.q
                           {"AND " + " AND ".join(keyword_where_conditions[1:]) if len(keyword_where_conditions) > 1 else ""}
@@ -701,19 +710,18 @@ async def hybrid_search(request: HybridSearchRequest):
                         LIMIT %s
                     """
 
-                    keyword_params = [normalized_query] + where_params + [request.limit * 2]
+                    keyword_params = (
+                        [normalized_query]
+                        + list(exact_match_boost_params(request.query, request.exact_match_boost))
+                        + where_params
+                        + [request.limit * 2]
+                    )
                     cur.execute(keyword_sql, tuple(keyword_params))
 
                     for row in cur.fetchall():
                         symbol_names = row[6] or []
                         bm25_score = float(row[9]) if row[9] else 0.0
-
-                        # Calculate exact match boost
-                        exact_boost = calculate_exact_match_boost(
-                            request.query,
-                            symbol_names,
-                            request.exact_match_boost
-                        )
+                        exact_boost = float(row[10])
 
                         keyword_results.append({
                             "id": str(row[0]),
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Persistent SQLite cache for results derived from tree-sitter parses.
+
+This module provides:
+- A pickle store keyed by (namespace, content hash, extension), used by the
+  chunker ("chunks") and the call graph builder ("calls")
+- A stat index recording the content hash of a file at a given mtime and
+  size, so unchanged files don't have to be read again
+
+Entries are also keyed by a fingerprint of the installed tree-sitter
+packages, so upgrading a grammar invalidates them. Callers pass the SQLite
+path on every call; an empty path disables the cache. Every failure counts
+as a miss (lookups) or is ignored (stores).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from importlib import metadata
+from typing import Any, Iterable
+
+# Packages whose versions affect parse results
+GRAMMAR_PACKAGES = (
+    "tree-sitter",
+    "tree-sitter-python",
+    "tree-sitter-javascript",
+    "tree-sitter-typescript",
+    "tree-sitter-go",
+    "tree-sitter-rust",
+    "tree-sitter-java",
+    "tree-sitter-c",
+    "tree-sitter-cpp",
+    "tree-sitter-ruby",
+    "tree-sitter-php",
+    "tree-sitter-c-sharp",
+)
+_grammar_version: str | None = None
+
+# Keys per SELECT, well under SQLite's bound-parameter limit
+_LOOKUP_BATCH = 500
+
+# SQLite connections can't be shared between threads, so each thread keeps
+# one per cache path
+_TLS = threading.local()
+
+
+def content_hash(data: bytes) -> str:
+    """Hash content for a cache key."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def get_grammar_version() -> str:
+    """Fingerprint of the installed tree-sitter bindings, used to invalidate cached entries."""
+    global _grammar_version
+    if _grammar_version is None:
+        versions = []
+        for package in GRAMMAR_PACKAGES:
+            try:
+                versions.append(f"{package}={metadata.version(package)}")
+            except metadata.PackageNotFoundError:
+                versions.append(f"{package}=?")
+        _grammar_version = ";".join(versions)
+    return _grammar_version
+
+
+def _get_connection(path: str) -> sqlite3.Connection:
+    """Get this thread's connection to the cache at path, creating the tables on first use."""
+    connections = getattr(_TLS, "connections", None)
+    if connections is None:
+        connections = _TLS.connections = {}
+
+    conn = connections.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                namespace TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                ext TEXT NOT NULL,
+                grammar_version TEXT NOT NULL,
+                value BLOB NOT NULL,
+                PRIMARY KEY (namespace, content_hash, ext, grammar_version)
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                content_hash TEXT NOT NULL
+            )
+            """
+        )
+        conn.commit()
+        connections[path] = conn
+    return conn
+
+
+def close_connections() -> None:
+    """Close this thread's cache connections."""
+    connections = getattr(_TLS, "connections", None)
+    if connections:
+        for conn in connections.values():
+            conn.close()
+        connections.clear()
+
+
+def cache_lookup(
+    path: str, namespace: str, keys: Iterable[tuple[str, str]]
+) -> dict[tuple[str, str], Any]:
+    """
+    Return the cached values for whichever (content hash, extension) keys are present.
+
+    Args:
+        path: SQLite file of the cache; empty disables it
+        namespace: Kind of value stored, including its format version
+        keys: (content hash, extension) pairs
+
+    Returns:
+        Dictionary mapping each key found to its unpickled value
+    """
+    wanted = set(keys)
+    found: dict[tuple[str, str], Any] = {}
+    if not path or not wanted:
+        return found
+    try:
+        conn = _get_connection(path)
+        hashes = sorted({hash_ for hash_, _ in wanted})
+        for start in range(0, len(hashes), _LOOKUP_BATCH):
+            batch = hashes[start:start + _LOOKUP_BATCH]
+            rows = conn.execute(
+                f"SELECT content_hash, ext, value FROM parse_cache "
+                f"WHERE namespace = ? AND grammar_version = ? "
+                f"AND content_hash IN ({', '.join('?' * len(batch))})",
+                (namespace, get_grammar_version(), *batch),
+            )
+            for hash_, ext, value in rows:
+                if (hash_, ext) in wanted:
+                    found[(hash_, ext)] = pickle.loads(value)
+    except (sqlite3.Error, pickle.UnpicklingError, AttributeError, EOFError):
+        return {}
+    return found
+
+
+def cache_store(path: str, namespace: str, entries: dict[tuple[str, str], Any]) -> None:
+    """Store values by (content hash, extension) key in one transaction."""
+    if not path or not entries:
+        return
+    try:
+        conn = _get_connection(path)
+        grammar_version = get_grammar_version()
+        conn.executemany(
+            "INSERT OR REPLACE INTO parse_cache (namespace, content_hash, ext, grammar_version, value) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (namespace, hash_, ext, grammar_version, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+                for (hash_, ext), value in entries.items()
+            ],
+        )
+        conn.commit()
+    except sqlite3.Error:
+        pass
+
+
+def stat_lookup(path: str, file_path: str, st: os.stat_result) -> str | None:
+    """Return the content hash recorded for file_path if its mtime and size are unchanged."""
+    if not path:
+        return None
+    try:
+        row = _get_connection(path).execute(
+            "SELECT content_hash FROM file_hashes WHERE path = ? AND mtime_ns = ? AND size = ?",
+            (file_path, st.st_mtime_ns, st.st_size),
+        ).fetchone()
+        return row[0] if row else None
+    except sqlite3.Error:
+        return None
+
+
+def stat_store(path: str, file_path: str, st: os.stat_result, hash_: str) -> None:
+    """Record the content hash for file_path at its current mtime and size."""
+    if not path:
+        return
+    try:
+        conn = _get_connection(path)
+        conn.execute(
+            "INSERT OR REPLACE INTO file_hashes (path, mtime_ns, size, content_hash) VALUES (?, ?, ?, ?)",
+            (file_path, st.st_mtime_ns, st.st_size, hash_),
+        )
+        conn.commit()
+    except sqlite3.Error:
+        pass
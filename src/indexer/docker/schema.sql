@@ -174,6 +174,71 @@ CREATE TRIGGER chunks_tsv_trigger
 UPDATE chunks SET content_tsv = code_to_tsvector(content)
 WHERE content_tsv IS NULL;
 
+-- ============================================================================
+-- Exact Symbol Match Boost
+-- ============================================================================
+-- Generated columns that let keyword search apply the exact-match boost
+-- (bm25.calculate_exact_match_boost) inside the ranking query, so PostgreSQL
+-- can sort and LIMIT on the boosted score before rows reach Python.
+
+-- Lowercase every element of a text array
+CREATE OR REPLACE FUNCTION lower_text_array(names TEXT[])
+RETURNS TEXT[] AS $$
+    SELECT coalesce(array_agg(lower(symbol)), '{}') FROM unnest(names) AS symbol;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Identifier variations of each symbol name, mirroring bm25.normalize_identifier:
+-- the lowercased name and, if it splits into words, the words plus their
+-- snake_case and joined forms, without empty strings or repeats
+-- (test_schema.py checks the two agree)
+CREATE OR REPLACE FUNCTION code_symbol_variations(names TEXT[])
+RETURNS TEXT[] AS $$
+DECLARE
+    symbol TEXT;
+    split TEXT;
+    parts TEXT[];
+    candidates TEXT[];
+    variation TEXT;
+    result TEXT[] := '{}';
+BEGIN
+    FOREACH symbol IN ARRAY coalesce(names, '{}') LOOP
+        candidates := ARRAY[lower(symbol)];
+
+        -- Word boundaries: getUser, HTTPServer, VP9Codec, utf8Decode
+        split := regexp_replace(symbol, '([a-z])([A-Z])', '\1_\2', 'g');
+        split := regexp_replace(split, '([A-Z])([A-Z][a-z])', '\1_\2', 'g');
+        split := regexp_replace(split, '([A-Za-z])([0-9])', '\1_\2', 'g');
+        split := regexp_replace(split, '([0-9])([A-Za-z])', '\1_\2', 'g');
+        parts := array_remove(regexp_split_to_array(lower(split), '[_[:space:]]+'), '');
+
+        IF parts IS DISTINCT FROM candidates THEN
+            candidates := candidates || parts
+                || array_to_string(parts, '_')
+                || array_to_string(parts, '');
+        END IF;
+
+        -- First occurrences only, like normalize_identifier's dict.fromkeys
+        FOREACH variation IN ARRAY candidates LOOP
+            IF variation <> '' AND NOT variation = ANY(result) THEN
+                result := result || variation;
+            END IF;
+        END LOOP;
+    END LOOP;
+
+    RETURN result;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS lower_symbols TEXT[]
+    GENERATED ALWAYS AS (lower_text_array(symbol_names)) STORED;
+
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS symbol_variations TEXT[]
+    GENERATED ALWAYS AS (code_symbol_variations(symbol_names)) STORED;
+
+-- GIN indexes for the = ANY / && tests in the boost expression
+CREATE INDEX IF NOT EXISTS chunks_lower_symbols_idx ON chunks USING GIN (lower_symbols);
+CREATE INDEX IF NOT EXISTS chunks_symbol_variations_idx ON chunks USING GIN (symbol_variations);
+
 -- ============================================================================
 -- Relationships Table
 -- ============================================================================
@@ -241,11 +306,16 @@ CREATE INDEX IF NOT EXISTS file_imports_repo_branch_idx ON file_imports (repo_id
 -- Caches embeddings by content hash to avoid re-embedding unchanged content.
 -- Uses SHA-256 hash of the content as the cache key, combined with the model name
 -- to ensure embeddings are invalidated when the model changes.
+--
+-- Embeddings are stored as half precision (halfvec, pgvector 0.7+): half the
+-- row size, disk footprint and transfer of VECTOR, well within the tolerance of
+-- cosine similarity. Writers may still bind VECTOR values (cast on assignment);
+-- readers that need VECTOR select embedding::vector.
 
 CREATE TABLE IF NOT EXISTS embedding_cache (
     content_hash TEXT NOT NULL,           -- SHA-256 hash of the content
     model_name TEXT NOT NULL,             -- Embedding model used (e.g., 'sentence-transformers/all-MiniLM-L6-v2')
-    embedding VECTOR(1536) NOT NULL,      -- The cached embedding (padded to 1536 dims)
+    embedding HALFVEC(1536) NOT NULL,     -- The cached embedding (fp16, padded to 1536 dims)
     embedding_dim INTEGER NOT NULL,       -- Original embedding dimension before padding
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     last_used_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
@@ -253,6 +323,19 @@ CREATE TABLE IF NOT EXISTS embedding_cache (
     PRIMARY KEY (content_hash, model_name)
 );
 
+-- Convert caches created before embeddings were stored as halfvec
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'embedding_cache' AND column_name = 'embedding'
+          AND table_schema = current_schema() AND udt_name = 'vector'
+    ) THEN
+        ALTER TABLE embedding_cache
+            ALTER COLUMN embedding TYPE HALFVEC(1536) USING embedding::halfvec(1536);
+    END IF;
+END $$;
+
 -- Index for cleanup queries (find old/unused cache entries)
 CREATE INDEX IF NOT EXISTS embedding_cache_last_used_idx ON embedding_cache (last_used_at);
 
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Shared tree-sitter helpers for the chunker and the call graph builder.
+
+This module provides:
+- Per-thread parser reuse (create_parser, borrow_parser)
+- Single-capture queries over a set of node types (build_capture_query, capture_nodes)
+- Pre-order traversal with a TreeCursor, used when no query is available (walk)
+
+Grammars must be wrapped with Language() before they are passed in; the
+binding packages return raw PyCapsule pointers.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+from typing import Callable, Generator, Iterable, Iterator
+
+from tree_sitter import Language, Parser, Node, Query
+
+try:
+    # tree-sitter 0.25+ runs queries through a separate cursor object
+    from tree_sitter import QueryCursor
+except ImportError:  # pragma: no cover - depends on installed tree-sitter
+    QueryCursor = None
+
+
+# =============================================================================
+# Parsers
+# =============================================================================
+
+
+# Per-thread parser cache keyed by id(Language). A Parser carries no state
+# between parse() calls, so one instance per language per thread is reused
+# across files instead of being rebuilt for every file. Parsers aren't safe to
+# share between threads, hence one cache per thread.
+_TLS = threading.local()
+
+
+def _thread_parsers() -> dict[int, Parser]:
+    """This thread's idle parsers, keyed by id() of their language."""
+    parsers = getattr(_TLS, "parsers", None)
+    if parsers is None:
+        parsers = _TLS.parsers = {}
+    return parsers
+
+
+def create_parser(language: Language) -> Parser:
+    """Get the tree-sitter parser for the given language, reusing one per thread."""
+    parsers = _thread_parsers()
+    parser = parsers.get(id(language))
+    if parser is None:
+        parser = parsers[id(language)] = Parser(language)
+    return parser
+
+
+@contextlib.contextmanager
+def borrow_parser(language: Language) -> Iterator[Parser]:
+    """
+    Borrow this thread's parser for the given language for the duration of a block.
+
+    The parser is taken out of the pool while borrowed, so a nested borrow on
+    the same thread gets a parser of its own. If the block raises, the parser
+    is reset before it goes back, so a parse that failed part-way can't leave
+    state behind for the next file.
+    """
+    parsers = _thread_parsers()
+    parser = parsers.pop(id(language), None)
+    if parser is None:
+        parser = Parser(language)
+    try:
+        yield parser
+    except BaseException:
+        parser.reset()
+        raise
+    finally:
+        parsers[id(language)] = parser
+
+
+# =============================================================================
+# Queries and Traversal
+# =============================================================================
+
+
+def build_capture_query(language: Language, node_types: Iterable[str]) -> Query | None:
+    """
+    Compile one query capturing every node of the given types, as a single alternation.
+
+    The query engine walks the tree in C and hands back only the matching
+    nodes, instead of visiting every node from Python. Only node types the
+    grammar defines as named nodes are included. Returns None if the query
+    can't be built, in which case callers fall back to walk().
+    """
+    try:
+        node_types = sorted(
+            node_type for node_type in set(node_types)
+            if language.id_for_node_kind(node_type, True)
+        )
+    except Exception:
+        return None
+    if not node_types:
+        return None
+
+    source = "[" + " ".join(f"({node_type})" for node_type in node_types) + "] @node"
+    try:
+        return Query(language, source)
+    except TypeError:
+        # tree-sitter < 0.23 builds queries from the language object
+        try:
+            return language.query(source)
+        except Exception:
+            return None
+    except Exception:
+        return None
+
+
+def capture_nodes(query: Query, node: Node) -> list[Node]:
+    """Run a single-capture query over node's subtree, returning nodes outermost-first in document order."""
+    if QueryCursor is not None:
+        captures = QueryCursor(query).captures(node)
+    else:
+        captures = query.captures(node)
+
+    # tree-sitter 0.23+ groups captures by name; 0.22 returns (node, name) pairs
+    if isinstance(captures, dict):
+        nodes = [n for group in captures.values() for n in group]
+    else:
+        nodes = [n for n, _ in captures]
+
+    # Same order as a pre-order walk: ancestors before their descendants
+    nodes.sort(key=lambda n: (n.start_byte, -n.end_byte))
+    return nodes
+
+
+def walk(root: Node, descend: Callable[[Node], bool] | None = None) -> Generator[Node, None, None]:
+    """
+    Yield nodes under root (inclusive) in pre-order using a TreeCursor.
+
+    If `descend` is given, the children of a node are only visited when
+    descend(node) is true. The cursor walks in C, avoiding a Python frame and
+    a node.children list per visited node, and needs no recursion.
+    """
+    cursor = root.walk()
+    while True:
+        node = cursor.node
+        yield node
+        if (descend is None or descend(node)) and cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            # The cursor cannot move above the node it was created from
+            if not cursor.goto_parent():
+                return
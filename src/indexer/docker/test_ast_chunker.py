@@ -6,7 +6,13 @@ Run with: python -m pytest test_ast_chunker.py -v
 Or simply: python test_ast_chunker.py
 """
 
+import os
+import tempfile
 import unittest
+from unittest import mock
+
+import ast_chunker
+import parse_cache
 from ast_chunker import (
     chunk_code_ast,
     chunk_with_fallback,
@@ -254,6 +260,25 @@ class TestFallbackChunking(unittest.TestCase):
             line_count = chunk.end_line - chunk.start_line + 1
             self.assertLessEqual(line_count, 500)
 
+    def test_chunk_code_matches_line_join(self):
+        # Slicing by line offsets must give the same text as joining split lines,
+        # including "\r\n" endings and a trailing newline
+        lines = [f"line {i}\r" if i % 3 else f"line {i}" for i in range(120)] + [""]
+        code = "\n".join(lines)
+        chunks = chunk_with_fallback(code, "test.md", max_lines=50, overlap_lines=5)
+        for chunk in chunks:
+            expected = "\n".join(lines[chunk.start_line - 1:chunk.end_line])
+            self.assertEqual(chunk.code, expected)
+
+    def test_non_ascii_lines_match_line_join(self):
+        # Offsets come from UTF-8 bytes; 2-, 3- and 4-byte characters must not shift them
+        lines = [f"léne {i} €" + "\U0001f600" * (i % 3) for i in range(120)]
+        code = "\n".join(lines)
+        chunks = chunk_with_fallback(code, "test.md", max_lines=50, overlap_lines=5)
+        for chunk in chunks:
+            expected = "\n".join(lines[chunk.start_line - 1:chunk.end_line])
+            self.assertEqual(chunk.code, expected)
+
     def test_unsupported_language_uses_fallback(self):
         code = "Some markdown content\n" * 100
         chunks = chunk_code_ast(code, "README.md")
@@ -351,6 +376,31 @@ class TestRustChunking(unittest.TestCase):
         class_chunks = [c for c in chunks if c.chunk_type == "class"]
         self.assertGreater(len(class_chunks), 0)
 
+    def test_doc_commented_impl_after_struct(self):
+        # The /// docs move the impl's start_line back before the struct's,
+        # so units arrive out of order and must be sorted, not line-chunked
+        code = '''use std::fmt;
+
+pub struct Calculator {
+    value: i32,
+}
+/// Arithmetic on a running value.
+///
+/// Values wrap on overflow.
+/// See also fmt::Display.
+impl Calculator {
+    fn add(&mut self, n: i32) {
+        self.value += n;
+    }
+}
+'''
+        chunks = chunk_code_ast(code, "test.rs")
+        class_chunks = [c for c in chunks if c.chunk_type == "class"]
+        self.assertEqual(len(class_chunks), 2)
+        self.assertIn("/// Arithmetic on a running value.", class_chunks[0].code)
+        starts = [c.start_line for c in chunks]
+        self.assertEqual(starts, sorted(starts))
+
 
 class TestSymbolExtraction(unittest.TestCase):
     """Test symbol extraction from chunks."""
@@ -405,6 +455,29 @@ function createUser(name: string): User {
         self.assertEqual(len(function_chunks), 1)
         self.assertIn("createUser", function_chunks[0].symbol_names)
 
+    def test_gap_symbols_match_per_gap_extraction(self):
+        code = '''class Outer:
+    def method(self):
+        pass
+
+def top():
+    def inner():
+        pass
+    return inner
+
+X = 1
+'''
+        config = get_language_config("test.py")
+        source_bytes = code.encode("utf-8")
+        tree = create_parser(config["language"]).parse(source_bytes)
+        gaps = [(1, 2), (4, 6), (8, 11)]
+
+        expected = [
+            extract_all_symbols_from_chunk(tree.root_node, source_bytes, config, start, end)
+            for start, end in gaps
+        ]
+        self.assertEqual(ast_chunker.extract_gap_symbols(tree.root_node, config, gaps), expected)
+
 
 class TestImportExtraction(unittest.TestCase):
     """Test import statement extraction."""
@@ -681,5 +754,140 @@ export default UserService;
         self.assertIn("UserService", service_chunk.symbol_names)
 
 
+class TestChunkCache(unittest.TestCase):
+    """Test the persistent SQLite chunk cache."""
+
+    def setUp(self):
+        self.tmpdir = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(
+            mock.patch.object(ast_chunker, "AST_CHUNK_CACHE_PATH", os.path.join(self.tmpdir, "chunks.sqlite"))
+        )
+        self.addCleanup(parse_cache.close_connections)
+
+    def test_cache_hit_skips_parsing(self):
+        code = "def cached():\n    return 1\n"
+        first = chunk_code_ast(code, "a.py")
+
+        with mock.patch.object(ast_chunker, "chunk_with_ast", side_effect=AssertionError("parsed again")):
+            second = chunk_code_ast(code, "a.py")
+
+        self.assertEqual(first, second)
+
+    def test_cache_hit_uses_new_filename(self):
+        code = "def moved():\n    return 1\n"
+        chunk_code_ast(code, "old/path.py")
+        chunks = chunk_code_ast(code, "new/path.py")
+
+        self.assertTrue(chunks)
+        self.assertTrue(all(c.filename == "new/path.py" for c in chunks))
+
+    def test_unchanged_file_is_not_read_again(self):
+        path = os.path.join(self.tmpdir, "mod.py")
+        with open(path, "w") as f:
+            f.write("def stable():\n    return 1\n")
+        first = ast_chunker.chunk_file(path, "mod.py")
+
+        with mock.patch.object(ast_chunker.Path, "read_bytes", side_effect=AssertionError("read again")):
+            second = ast_chunker.chunk_file(path, "mod.py")
+
+        self.assertEqual(first, second)
+
+    def test_nested_threshold_is_part_of_key(self):
+        body = "\n".join(f"        x_{i} = {i}" for i in range(20))
+        code = f"class Worker:\n    def run(self):\n{body}\n"
+
+        with mock.patch.object(ast_chunker, "NESTED_FUNCTION_SIZE_THRESHOLD", 50):
+            kept = chunk_code_ast(code, "a.py")
+        with mock.patch.object(ast_chunker, "NESTED_FUNCTION_SIZE_THRESHOLD", 10):
+            split = chunk_code_ast(code, "a.py")
+
+        self.assertEqual([c.chunk_type for c in kept], ["class"])
+        self.assertEqual([c.chunk_type for c in split], ["class", "method"])
+
+
+class TestParseFailureWarning(unittest.TestCase):
+    """Test the warning logged when AST parsing fails."""
+
+    def test_warns_once_per_file(self):
+        code = "def broken():\n    return 1\n"
+        self.addCleanup(ast_chunker._WARN_SEEN.discard, "warn_once.py")
+
+        with mock.patch.object(ast_chunker, "chunk_with_ast", side_effect=RuntimeError("boom")):
+            with self.assertLogs(ast_chunker.logger, level="WARNING") as logs:
+                first = chunk_code_ast(code, "warn_once.py")
+                second = chunk_code_ast(code, "warn_once.py")
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("warn_once.py", logs.output[0])
+        # Both calls still fall back to line-based chunks
+        self.assertEqual(first, second)
+        self.assertEqual(first[0].chunk_type, "other")
+
+
+class TestChunkBytes(unittest.TestCase):
+    """Test chunking raw file bytes."""
+
+    def test_bytes_match_text(self):
+        code = 'def greet():\n    return "h\u00e9llo"\n\nX = 1\n'
+        self.assertEqual(
+            ast_chunker.chunk_code_ast_bytes(code.encode("utf-8"), "test.py"),
+            chunk_code_ast(code, "test.py"),
+        )
+
+    def test_invalid_utf8_is_ignored(self):
+        data = b"def broken():\n    return '\xff'\n"
+        chunks = ast_chunker.chunk_code_ast_bytes(data, "test.py")
+        self.assertEqual(chunks, chunk_code_ast(data.decode("utf-8", errors="ignore"), "test.py"))
+        self.assertEqual(chunks[0].symbol_name, "broken")
+
+    def test_lone_surrogate_falls_back(self):
+        # Text that can't be encoded as UTF-8 is line-chunked, not raised
+        code = "def broken():\n    return '\udcff'\n"
+        self.addCleanup(ast_chunker._WARN_SEEN.discard, "surrogate.py")
+
+        with self.assertLogs(ast_chunker.logger, level="WARNING"):
+            chunks = chunk_code_ast(code, "surrogate.py")
+
+        self.assertEqual(chunks, chunk_with_fallback(code, "surrogate.py"))
+
+
+class TestChunkFiles(unittest.TestCase):
+    """Test batched chunking across worker processes."""
+
+    def test_results_keyed_by_relative_filename(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, text in (("b.py", "def b():\n    return 2\n"), ("a.md", "# Title\n")):
+                with open(os.path.join(tmpdir, name), "w") as f:
+                    f.write(text)
+            paths = [os.path.join(tmpdir, "b.py"), os.path.join(tmpdir, "a.md")]
+
+            results = ast_chunker.chunk_files(paths, root=tmpdir, max_workers=2)
+
+        self.assertEqual(list(results), ["a.md", "b.py"])
+        self.assertEqual(results["b.py"][0].symbol_name, "b")
+        self.assertEqual(results["a.md"][0].code, "# Title\n")
+
+
+class TestSmallFileShortCircuit(unittest.TestCase):
+    """Test that small files without any language keywords skip parsing."""
+
+    def test_small_file_without_keywords_skips_parsing(self):
+        code = "# settings\nDEBUG = True\nRETRIES = 3\n"
+        with mock.patch.object(ast_chunker, "chunk_with_ast", side_effect=AssertionError("parsed")):
+            chunks = chunk_code_ast(code, "settings.py")
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].chunk_type, "module")
+        self.assertEqual(chunks[0].code, code)
+        self.assertEqual(chunks[0].end_line, 4)
+
+    def test_small_file_with_keywords_is_parsed(self):
+        code = "import os\n\nROOT = os.getcwd()\n"
+        chunks = chunk_code_ast(code, "paths.py")
+
+        self.assertEqual(len(chunks), 1)
+        self.assertIn("os", chunks[0].imports)
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
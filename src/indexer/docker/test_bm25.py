@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for the BM25 keyword search helpers.
+
+Run with: python -m pytest test_bm25.py -v
+Or simply: python test_bm25.py
+"""
+
+import unittest
+
+from bm25 import (
+    split_identifier,
+    normalize_identifier,
+    build_tsquery,
+    calculate_exact_match_boost,
+    bm25_score_batch,
+    EXACT_MATCH_BOOST_SQL,
+    exact_match_boost_params,
+    bm25_score_sql,
+)
+
+
+class TestSplitIdentifier(unittest.TestCase):
+    """Test single-pass identifier splitting."""
+
+    def test_camel_case(self):
+        self.assertEqual(split_identifier("getUserName"), ["get", "user", "name"])
+
+    def test_snake_case(self):
+        self.assertEqual(split_identifier("get_user_name"), ["get", "user", "name"])
+
+    def test_acronym_run(self):
+        self.assertEqual(split_identifier("HTTPServer"), ["http", "server"])
+        self.assertEqual(split_identifier("getHTTPResponse"), ["get", "http", "response"])
+
+    def test_digit_transitions(self):
+        self.assertEqual(split_identifier("VP9Codec"), ["vp", "9", "codec"])
+        self.assertEqual(split_identifier("utf8Decode"), ["utf", "8", "decode"])
+
+    def test_leading_and_repeated_underscores(self):
+        self.assertEqual(split_identifier("__init__"), ["init"])
+        self.assertEqual(split_identifier("_private"), ["private"])
+
+    def test_empty(self):
+        self.assertEqual(split_identifier(""), [])
+        self.assertEqual(split_identifier("_"), [])
+
+
+class TestNormalizeIdentifier(unittest.TestCase):
+    """Test camelCase/snake_case variation generation."""
+
+    def test_camel_case_variations(self):
+        self.assertEqual(
+            normalize_identifier("getUserName"),
+            ("getusername", "get", "user", "name", "get_user_name"),
+        )
+
+    def test_snake_case_variations(self):
+        self.assertEqual(
+            normalize_identifier("get_user_name"),
+            ("get_user_name", "get", "user", "name", "getusername"),
+        )
+
+    def test_single_word(self):
+        self.assertEqual(normalize_identifier("parser"), ("parser",))
+
+    def test_private_name(self):
+        self.assertEqual(normalize_identifier("_private"), ("_private", "private"))
+
+    def test_non_identifier_characters_kept(self):
+        self.assertEqual(normalize_identifier("foo.bar"), ("foo.bar",))
+
+    def test_results_are_cached(self):
+        normalize_identifier.cache_clear()
+        first = normalize_identifier("renderWidget")
+        self.assertIs(normalize_identifier("renderWidget"), first)
+        self.assertEqual(normalize_identifier.cache_info().hits, 1)
+
+
+class TestBuildTsquery(unittest.TestCase):
+    """Test tsquery construction."""
+
+    def test_single_word(self):
+        self.assertEqual(build_tsquery("parser"), "parser")
+
+    def test_single_identifier(self):
+        self.assertEqual(build_tsquery(" getUser "), "(getuser | get | user | get_user)")
+
+    def test_surrounding_and_repeated_whitespace(self):
+        self.assertEqual(build_tsquery("  parser \t\n config  "), "parser | config")
+
+    def test_blank_query(self):
+        self.assertEqual(build_tsquery("   "), "   ")
+
+    def test_identifier_variations_grouped(self):
+        self.assertEqual(
+            build_tsquery("getUser config"),
+            "(getuser | get | user | get_user) | config",
+        )
+
+
+class TestExactMatchBoost(unittest.TestCase):
+    """Test symbol-name boosting."""
+
+    def test_no_symbols(self):
+        self.assertEqual(calculate_exact_match_boost("getUser", []), 1.0)
+
+    def test_exact_match(self):
+        self.assertEqual(calculate_exact_match_boost("getUser", ["other", "getuser"]), 3.0)
+
+    def test_variation_match(self):
+        self.assertAlmostEqual(calculate_exact_match_boost("get_user", ["getUser"]), 3.0 * 0.7)
+
+    def test_exact_match_preferred_over_earlier_partial(self):
+        # "get" partially matches the first symbol, but the second is exact
+        self.assertEqual(calculate_exact_match_boost("getUser", ["getName", "getUser"]), 3.0)
+
+    def test_no_match(self):
+        self.assertEqual(calculate_exact_match_boost("parse", ["render"]), 1.0)
+
+
+class TestExactMatchBoostSql(unittest.TestCase):
+    """Test the SQL form of the exact match boost."""
+
+    def test_params_match_placeholders(self):
+        params = exact_match_boost_params("getUser", 2.0)
+        self.assertEqual(EXACT_MATCH_BOOST_SQL.count("%s"), len(params))
+        self.assertEqual(
+            params,
+            ("getuser", 2.0, ["getuser", "get", "user", "get_user"], 2.0),
+        )
+
+
+class TestBm25ScoreSql(unittest.TestCase):
+    """Test the ranking expression."""
+
+    def test_rank_is_length_normalized_and_bounded(self):
+        # 1 = divide by 1 + log(doc length), 32 = rank / (rank + 1)
+        self.assertEqual(bm25_score_sql(["parser"]), "ts_rank_cd(content_tsv, query, 33)")
+
+
+class _RecordingConnection:
+    """Minimal stand-in for a psycopg connection that records executed statements."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def execute(self, sql, params=None, prepare=None):
+        self.calls.append((sql, params, prepare))
+        return self
+
+    def fetchall(self):
+        return self.rows
+
+
+class TestBm25ScoreBatch(unittest.TestCase):
+    """Test batched candidate scoring."""
+
+    def test_single_prepared_round_trip(self):
+        conn = _RecordingConnection([("id-2", 0.5), ("id-1", None)])
+        scores = bm25_score_batch(conn, "getUser", ["id-1", "id-2", "id-3"], limit=10)
+
+        self.assertEqual(scores, [("id-2", 0.5), ("id-1", 0.0)])
+        self.assertEqual(len(conn.calls), 1)
+        sql, params, prepare = conn.calls[0]
+        self.assertIn("ANY(", sql)
+        self.assertEqual(params, (build_tsquery("getUser"), ["id-1", "id-2", "id-3"], 10))
+        self.assertTrue(prepare)
+
+    def test_no_candidates_skips_query(self):
+        conn = _RecordingConnection([])
+        self.assertEqual(bm25_score_batch(conn, "getUser", []), [])
+        self.assertEqual(conn.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
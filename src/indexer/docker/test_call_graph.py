@@ -11,7 +11,12 @@ testing without Docker, only the AST extraction tests will work if
 tree-sitter is installed.
 """
 
+import os
+import tempfile
 import unittest
+from unittest import mock
+
+import parse_cache
 
 # External dependencies that legitimately may be absent on a dev machine
 # without the indexer Docker stack. ImportError on any of these → graceful
@@ -36,7 +41,9 @@ _EXTERNAL_DEPS = {
 }
 
 try:
+    import call_graph
     from call_graph import (
+        extract_calls_batch,
         extract_calls_from_code,
         extract_definitions_from_code,
         is_supported_language,
@@ -1702,5 +1709,68 @@ public class Greeter {
         self.assertIn("farewell", names)
 
 
+@unittest.skipUnless(IMPORTS_AVAILABLE, "Dependencies not available")
+class TestBatchExtraction(unittest.TestCase):
+    """Test batched call extraction across worker processes."""
+
+    def setUp(self):
+        self.items = [
+            (f"def f{i}():\n    helper_{i}()\n", "test.py") if i % 2 else
+            (f"function g{i}() {{ other{i}(); }}", "test.ts")
+            for i in range(80)
+        ]
+
+    def test_matches_single_extraction(self):
+        expected = [extract_calls_from_code(content, filename) for content, filename in self.items]
+        self.assertEqual(extract_calls_batch(self.items, max_workers=2), expected)
+
+    def test_duplicate_content_extracted_once(self):
+        items = [("helper()\n", "a.py"), ("helper()\n", "other/b.py"), ("helper()\n", "c.js")]
+        with mock.patch.object(
+            call_graph, "_extract_calls_worker", wraps=call_graph._extract_calls_worker
+        ) as worker:
+            results = extract_calls_batch(items)
+
+        self.assertEqual(worker.call_count, 2)
+        self.assertEqual(results, [extract_calls_from_code(content, filename) for content, filename in items])
+
+    def test_small_batch_runs_inline(self):
+        items = self.items[:3]
+        expected = [extract_calls_from_code(content, filename) for content, filename in items]
+        self.assertEqual(extract_calls_batch(items), expected)
+
+
+@unittest.skipUnless(IMPORTS_AVAILABLE, "Dependencies not available")
+class TestCallCache(unittest.TestCase):
+    """Test how extract_calls_batch uses the persistent call cache."""
+
+    def setUp(self):
+        tmpdir = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(
+            mock.patch.object(call_graph, "CALL_GRAPH_CACHE_PATH", os.path.join(tmpdir, "calls.sqlite"))
+        )
+        self.addCleanup(parse_cache.close_connections)
+
+    def test_cache_hit_skips_extraction_for_any_path(self):
+        """Calls are keyed by content and extension, so a moved chunk is still a hit."""
+        first = extract_calls_batch([("def f():\n    helper()\n", "a.py"), ("foo(); bar.baz();", "b.ts")])
+
+        with mock.patch.object(call_graph, "_extract_calls_worker", side_effect=AssertionError("parsed again")):
+            second = extract_calls_batch([("def f():\n    helper()\n", "moved/a.py"), ("foo(); bar.baz();", "c.ts")])
+
+        self.assertEqual(first, second)
+
+    def test_only_misses_are_extracted(self):
+        extract_calls_batch([("foo()\n", "a.py")])
+
+        with mock.patch.object(
+            call_graph, "_extract_calls_worker", wraps=call_graph._extract_calls_worker
+        ) as worker:
+            results = extract_calls_batch([("foo()\n", "a.py"), ("foo()\n", "a.js")])
+
+        self.assertEqual(worker.call_count, 1)
+        self.assertEqual(results[1], extract_calls_from_code("foo()\n", "a.js"))
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for relationship extraction in the CocoIndex flow.
+
+Run with: python -m pytest test_cocoindex_flow.py -v
+Or simply: python test_cocoindex_flow.py
+
+Note: cocoindex_flow imports CocoIndex and the Postgres client packages at
+module level, so these tests only run where the indexer's Docker
+dependencies are installed.
+"""
+
+import unittest
+
+# External dependencies that legitimately may be absent on a dev machine
+# without the indexer Docker stack. ImportError on any of these → graceful
+# skip; anything else (e.g. a symbol renamed inside cocoindex_flow) is
+# re-raised so the suite fails loudly, as in test_call_graph.py.
+#
+# Maintenance: this set MUST mirror the third-party top-level imports of
+# cocoindex_flow.py and ast_chunker.py.
+_EXTERNAL_DEPS = {
+    'cocoindex',
+    'numpy',
+    'pgvector',
+    'psycopg',
+    'psycopg_pool',
+    'tree_sitter',
+}
+
+try:
+    from cocoindex_flow import ChunkInfo, extract_relationships
+    IMPORTS_AVAILABLE = True
+except ImportError as e:
+    if e.name not in _EXTERNAL_DEPS:
+        raise
+    IMPORTS_AVAILABLE = False
+    import sys
+    print(f"Warning: External dependency not available: {e}", file=sys.stderr)
+    print("Run tests inside Docker or install dependencies.", file=sys.stderr)
+
+
+def make_chunk(chunk_id, content="", symbol_names=(), imports=(), exports=()):
+    """Build a ChunkInfo with only the fields extract_relationships reads set."""
+    return ChunkInfo(
+        chunk_id=chunk_id,
+        filename=f"{chunk_id}.py",
+        location="",
+        content=content,
+        language="python",
+        chunk_type="function",
+        symbol_names=list(symbol_names),
+        imports=list(imports),
+        exports=list(exports),
+        line_start=1,
+        line_end=1,
+        repo_id="repo",
+        repo_url="",
+        branch="main",
+    )
+
+
+def edges(relationships):
+    """(source, target, type) of each relationship, in order."""
+    return [(r.source_chunk_id, r.target_chunk_id, r.relationship_type) for r in relationships]
+
+
+@unittest.skipUnless(IMPORTS_AVAILABLE, "Dependencies not available")
+class TestExtractRelationships(unittest.TestCase):
+    """Test import and reference edges between chunks."""
+
+    def test_identifier_symbol_reference(self):
+        chunks = [
+            make_chunk("def", "def getUser(): ...", symbol_names=["getUser"]),
+            make_chunk("use", "user = getUser()"),
+        ]
+        relationships = extract_relationships(chunks)
+
+        self.assertEqual(edges(relationships), [("use", "def", "references")])
+        self.assertEqual(relationships[0].metadata, {"symbol": "getUser"})
+
+    def test_non_identifier_symbol_reference(self):
+        chunks = [
+            make_chunk("cfg", '{"name": "app"}', symbol_names=["package.json"]),
+            make_chunk("use", 'read("package.json")'),
+            make_chunk("other", 'read("mypackage.json")'),
+        ]
+        self.assertEqual(edges(extract_relationships(chunks)), [("use", "cfg", "references")])
+
+    def test_substring_of_longer_identifier_is_not_a_reference(self):
+        chunks = [
+            make_chunk("def", "def getUser(): ...", symbol_names=["getUser"]),
+            make_chunk("use", "name = getUserName()\nx = my_getUser"),
+        ]
+        self.assertEqual(extract_relationships(chunks), [])
+
+    def test_non_identifier_symbol_inside_identifier_is_not_a_reference(self):
+        chunks = [
+            make_chunk("cfg", "", symbol_names=["go:1.21"]),
+            make_chunk("use", "ego:1.21x"),
+        ]
+        self.assertEqual(extract_relationships(chunks), [])
+
+    def test_stoplisted_and_short_symbols_are_ignored(self):
+        chunks = [
+            make_chunk("def", "", symbol_names=["__init__", "constructor", "get", "run", "ab"]),
+            make_chunk("use", "self.__init__(); constructor(); get(); run(); ab()"),
+        ]
+        self.assertEqual(extract_relationships(chunks), [])
+
+    def test_short_symbols_kept_when_distinctive(self):
+        chunks = [
+            make_chunk("def", "", symbol_names=["Foo", "a_b"]),
+            make_chunk("use", "Foo(); a_b()"),
+        ]
+        relationships = extract_relationships(chunks)
+
+        self.assertEqual(edges(relationships), [("use", "def", "references")])
+
+    def test_duplicate_edges_are_added_once(self):
+        chunks = [
+            make_chunk("def", "", symbol_names=["getUser", "getUser", "saveUser"]),
+            make_chunk("use", "getUser(); getUser(); saveUser()"),
+        ]
+        relationships = extract_relationships(chunks)
+
+        self.assertEqual(edges(relationships), [("use", "def", "references")])
+        # The first symbol that produced the edge is kept
+        self.assertEqual(relationships[0].metadata, {"symbol": "getUser"})
+
+    def test_symbol_and_export_give_one_imports_edge(self):
+        chunks = [
+            make_chunk("def", "", symbol_names=["getUser"], exports=["getUser"]),
+            make_chunk("use", "", imports=["getUser", "getUser"]),
+        ]
+        relationships = extract_relationships(chunks)
+
+        self.assertEqual(edges(relationships), [("use", "def", "imports")])
+        self.assertEqual(relationships[0].metadata, {"imported_symbol": "getUser"})
+
+    def test_imports_edge_suppresses_reference(self):
+        chunks = [
+            make_chunk("def", "def getUser(): ...", symbol_names=["getUser"]),
+            make_chunk("use", "getUser()", imports=["getUser"]),
+        ]
+        self.assertEqual(edges(extract_relationships(chunks)), [("use", "def", "imports")])
+
+    def test_no_self_edges(self):
+        chunks = [make_chunk("def", "def getUser(): return getUser()", symbol_names=["getUser"], imports=["getUser"])]
+        self.assertEqual(extract_relationships(chunks), [])
+
+    def test_reexports_are_not_symbols(self):
+        chunks = [
+            make_chunk("index", "", exports=["* from ./user"]),
+            make_chunk("use", "", imports=["* from ./user"]),
+        ]
+        self.assertEqual(extract_relationships(chunks), [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental indexer helpers.
+
+Run with: python -m pytest test_incremental.py -v
+Or simply: python test_incremental.py
+
+Note: incremental imports the embedding model and Postgres client packages
+at module level, so these tests only run where the indexer's Docker
+dependencies are installed.
+"""
+
+import os
+import unittest
+from unittest import mock
+
+# External dependencies that legitimately may be absent on a dev machine
+# without the indexer Docker stack; anything else is re-raised, as in
+# test_call_graph.py.
+_EXTERNAL_DEPS = {
+    'numpy',
+    'pgvector',
+    'psycopg',
+    'sentence_transformers',
+    'tree_sitter',
+}
+
+try:
+    # incremental reads its database URL at import time; nothing here
+    # connects, and the variable must not leak into test_schema.py, which
+    # only runs against a real database when it is set
+    database_url = os.environ.get("COCOINDEX_DATABASE_URL", "postgresql://localhost/test")
+    with mock.patch.dict(os.environ, {"COCOINDEX_DATABASE_URL": database_url}):
+        from incremental import is_blank_content
+    IMPORTS_AVAILABLE = True
+except ImportError as e:
+    if e.name not in _EXTERNAL_DEPS:
+        raise
+    IMPORTS_AVAILABLE = False
+    import sys
+    print(f"Warning: External dependency not available: {e}", file=sys.stderr)
+    print("Run tests inside Docker or install dependencies.", file=sys.stderr)
+
+
+@unittest.skipUnless(IMPORTS_AVAILABLE, "Dependencies not available")
+class TestIsBlankContent(unittest.TestCase):
+    """Test that blank files are judged on their decoded text."""
+
+    def test_empty_and_ascii_whitespace(self):
+        self.assertTrue(is_blank_content(b""))
+        self.assertTrue(is_blank_content(b" \t\r\n\x0b\x0c"))
+
+    def test_unicode_whitespace_is_blank(self):
+        self.assertTrue(is_blank_content(" \n　  ".encode("utf-8")))
+        self.assertTrue(is_blank_content(b"\x1c\x1d\x1e\x1f\n"))
+
+    def test_invalid_utf8_is_ignored(self):
+        self.assertTrue(is_blank_content(b"\n\xff\xfe \n"))
+
+    def test_content_is_not_blank(self):
+        self.assertFalse(is_blank_content(b"  x = 1\n"))
+        self.assertFalse(is_blank_content("　café".encode("utf-8")))
+        self.assertFalse(is_blank_content(" é".encode("utf-8")))
+        self.assertFalse(is_blank_content(b"\x00"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent SQLite parse cache.
+
+Run with: python -m pytest test_parse_cache.py -v
+Or simply: python test_parse_cache.py
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import parse_cache
+
+
+class TestParseCache(unittest.TestCase):
+    """Test the pickle store shared by the chunk and call caches."""
+
+    def setUp(self):
+        tmpdir = self.enterContext(tempfile.TemporaryDirectory())
+        self.path = os.path.join(tmpdir, "cache.sqlite")
+        self.addCleanup(parse_cache.close_connections)
+
+    def test_round_trip(self):
+        parse_cache.cache_store(self.path, "calls/1", {("abc", ".py"): ["foo", 1], ("def", ".ts"): []})
+
+        found = parse_cache.cache_lookup(self.path, "calls/1", [("abc", ".py"), ("def", ".ts"), ("xyz", ".py")])
+
+        self.assertEqual(found, {("abc", ".py"): ["foo", 1], ("def", ".ts"): []})
+
+    def test_extension_is_part_of_key(self):
+        parse_cache.cache_store(self.path, "calls/1", {("abc", ".py"): "python"})
+        self.assertEqual(parse_cache.cache_lookup(self.path, "calls/1", [("abc", ".js")]), {})
+
+    def test_namespaces_are_separate(self):
+        parse_cache.cache_store(self.path, "chunks/3", {("abc", ".py"): "chunks"})
+        parse_cache.cache_store(self.path, "calls/1", {("abc", ".py"): "calls"})
+
+        self.assertEqual(parse_cache.cache_lookup(self.path, "chunks/3", [("abc", ".py")]), {("abc", ".py"): "chunks"})
+        self.assertEqual(parse_cache.cache_lookup(self.path, "chunks/4", [("abc", ".py")]), {})
+
+    def test_grammar_upgrade_invalidates(self):
+        parse_cache.cache_store(self.path, "calls/1", {("abc", ".py"): "old"})
+
+        with mock.patch.object(parse_cache, "_grammar_version", "tree-sitter=99"):
+            self.assertEqual(parse_cache.cache_lookup(self.path, "calls/1", [("abc", ".py")]), {})
+
+    def test_lookup_spans_batches(self):
+        entries = {(f"{i:04d}", ".py"): i for i in range(parse_cache._LOOKUP_BATCH + 10)}
+        parse_cache.cache_store(self.path, "calls/1", entries)
+        self.assertEqual(parse_cache.cache_lookup(self.path, "calls/1", entries), entries)
+
+    def test_empty_path_disables_cache(self):
+        parse_cache.cache_store("", "calls/1", {("abc", ".py"): "value"})
+        self.assertEqual(parse_cache.cache_lookup("", "calls/1", [("abc", ".py")]), {})
+        self.assertIsNone(parse_cache.stat_lookup("", "mod.py", os.stat(__file__)))
+
+    def test_stat_index_tracks_mtime_and_size(self):
+        file_path = os.path.join(os.path.dirname(self.path), "mod.py")
+        with open(file_path, "w") as f:
+            f.write("x = 1\n")
+        st = os.stat(file_path)
+        parse_cache.stat_store(self.path, file_path, st, "abc")
+
+        self.assertEqual(parse_cache.stat_lookup(self.path, file_path, st), "abc")
+
+        with open(file_path, "w") as f:
+            f.write("x = 22\n")
+        self.assertIsNone(parse_cache.stat_lookup(self.path, file_path, os.stat(file_path)))
+
+    def test_unreadable_cache_is_a_miss(self):
+        with open(self.path, "w") as f:
+            f.write("not a database")
+        parse_cache.cache_store(self.path, "calls/1", {("abc", ".py"): "value"})
+        self.assertEqual(parse_cache.cache_lookup(self.path, "calls/1", [("abc", ".py")]), {})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
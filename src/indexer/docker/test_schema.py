@@ -18,12 +18,18 @@ The tests pin three behaviors documented in the schema migration:
    `files` row is removed.
 3. The DELETE /index endpoint's deletion strategy (DELETE FROM files +
    DELETE FROM code_embeddings) clears every canonical and legacy table.
+4. `embedding_cache` stores half precision (halfvec) embeddings, and caches
+   created with a VECTOR column are converted in place.
+5. `code_symbol_variations` agrees with bm25.normalize_identifier, and the
+   generated `lower_symbols`/`symbol_variations` columns are filled on insert.
 """
 
 import os
 import unittest
 from pathlib import Path
 
+from bm25 import normalize_identifier
+
 try:
     import psycopg
     PSYCOPG_AVAILABLE = True
@@ -65,6 +71,8 @@ def _drop_test_tables(conn) -> None:
             DROP FUNCTION IF EXISTS update_files_updated_at() CASCADE;
             DROP FUNCTION IF EXISTS update_chunks_tsv() CASCADE;
             DROP FUNCTION IF EXISTS code_to_tsvector(TEXT) CASCADE;
+            DROP FUNCTION IF EXISTS lower_text_array(TEXT[]) CASCADE;
+            DROP FUNCTION IF EXISTS code_symbol_variations(TEXT[]) CASCADE;
             """
         )
     conn.commit()
@@ -329,6 +337,132 @@ class SchemaCompositeKeyTests(unittest.TestCase):
         )
 
 
+@unittest.skipUnless(_has_db(), "Requires COCOINDEX_DATABASE_URL (or DATABASE_URL) and psycopg")
+class EmbeddingCacheSchemaTests(unittest.TestCase):
+    """Verify the half precision embedding cache column and its migration."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.conn = psycopg.connect(DB_URL)
+
+    @classmethod
+    def tearDownClass(cls):
+        _drop_test_tables(cls.conn)
+        cls.conn.close()
+
+    def setUp(self):
+        self.conn.rollback()
+        _drop_test_tables(self.conn)
+
+    def _embedding_type(self) -> str:
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT udt_name FROM information_schema.columns
+                WHERE table_name = 'embedding_cache' AND column_name = 'embedding'
+                """
+            )
+            return cur.fetchone()[0]
+
+    def test_fresh_schema_uses_halfvec(self):
+        _apply_schema(self.conn)
+        self.assertEqual(self._embedding_type(), "halfvec")
+
+    def test_vector_cache_is_converted(self):
+        """A cache created with VECTOR(1536) keeps its rows as halfvec."""
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                CREATE EXTENSION IF NOT EXISTS vector;
+                CREATE TABLE embedding_cache (
+                    content_hash TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    embedding VECTOR(1536) NOT NULL,
+                    embedding_dim INTEGER NOT NULL,
+                    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    last_used_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    hit_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (content_hash, model_name)
+                )
+                """
+            )
+            cur.execute(
+                "INSERT INTO embedding_cache (content_hash, model_name, embedding, embedding_dim) "
+                "VALUES ('abc', 'model', ('[' || array_to_string(array_fill(0.5, ARRAY[1536]), ',') || ']')::vector, 384)"
+            )
+        self.conn.commit()
+
+        _apply_schema(self.conn)
+        self.assertEqual(self._embedding_type(), "halfvec")
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT vector_dims(embedding::vector), embedding_dim FROM embedding_cache")
+            self.assertEqual(cur.fetchone(), (1536, 384))
+
+        # Re-applying leaves the converted column alone
+        _apply_schema(self.conn)
+        self.assertEqual(self._embedding_type(), "halfvec")
+
+
+@unittest.skipUnless(_has_db(), "Requires COCOINDEX_DATABASE_URL (or DATABASE_URL) and psycopg")
+class SymbolVariationsSchemaTests(unittest.TestCase):
+    """Verify the SQL port of normalize_identifier behind the exact-match boost."""
+
+    SYMBOLS = [
+        "getUserName",
+        "get_user_name",
+        "HTTPServer",
+        "getHTTPResponse",
+        "VP9Codec",
+        "utf8Decode",
+        "__init__",
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.conn = psycopg.connect(DB_URL)
+
+    @classmethod
+    def tearDownClass(cls):
+        _drop_test_tables(cls.conn)
+        cls.conn.close()
+
+    def setUp(self):
+        self.conn.rollback()
+        _drop_test_tables(self.conn)
+        _apply_schema(self.conn)
+
+    def test_matches_normalize_identifier(self):
+        with self.conn.cursor() as cur:
+            for symbol in self.SYMBOLS:
+                with self.subTest(symbol=symbol):
+                    cur.execute("SELECT code_symbol_variations(ARRAY[%s])", (symbol,))
+                    self.assertEqual(cur.fetchone()[0], list(normalize_identifier(symbol)))
+
+    def test_generated_columns_filled_on_insert(self):
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO files (file_path, repo_id, repo_url, branch, language) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                ("src/a.ts", "repo", "https://repo", "main", "typescript"),
+            )
+            cur.execute(
+                "INSERT INTO chunks (file_path, content, language, chunk_type, symbol_names, "
+                "line_start, line_end, repo_id, repo_url, branch) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+                "RETURNING lower_symbols, symbol_variations",
+                ("src/a.ts", "// body", "typescript", "function", self.SYMBOLS, 1, 5,
+                 "repo", "https://repo", "main"),
+            )
+            lower_symbols, symbol_variations = cur.fetchone()
+        self.conn.commit()
+
+        self.assertEqual(lower_symbols, [symbol.lower() for symbol in self.SYMBOLS])
+        expected = dict.fromkeys(
+            variation for symbol in self.SYMBOLS for variation in normalize_identifier(symbol)
+        )
+        self.assertEqual(symbol_variations, list(expected))
+
+
 @unittest.skipUnless(_has_db(), "Requires COCOINDEX_DATABASE_URL (or DATABASE_URL) and psycopg")
 class DeleteIndexEndpointTests(unittest.TestCase):
     """Pin the SQL used by main.py's DELETE /index/{repo_url} endpoint."""
@@ -36,6 +36,8 @@ export default defineConfig({
       'call_graph.py',
       'api_auth.py',
       'ast_chunker.py',
+      'syntax_tree.py',
+      'parse_cache.py',
       'bm25.py',
       'hybrid.py',
       'incremental.py',